@@ -0,0 +1,40 @@
+import functools
+from typing import (
+    Iterable,
+    Tuple,
+)
+
+from eth_bloom import BloomFilter
+
+
+# How many values the bloom of each is kept for.  The same addresses and topics, like the
+# one of an ERC20 transfer, come up in the logs of almost every block.
+VALUE_BLOOM_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(VALUE_BLOOM_CACHE_SIZE)
+def get_value_bloom(value: bytes) -> int:
+    """
+    Returns the bloom with only the given value in it, which sets at most three of its
+    bits.  The bloom of a log or a block is all the blooms of its values or'd together.
+    """
+    return int(BloomFilter.from_iterable((value,)))
+
+
+def get_bloom(values: Iterable[bytes]) -> int:
+    bloom = 0
+    for value in values:
+        bloom |= get_value_bloom(value)
+    return bloom
+
+
+def get_bloom_bit_indices(bloom: int) -> Tuple[int, ...]:
+    """
+    Returns the positions of the bits that are set in the bloom, in increasing order.
+    """
+    indices = []
+    while bloom:
+        lowest_bit = bloom & -bloom
+        indices.append(lowest_bit.bit_length() - 1)
+        bloom ^= lowest_bit
+    return tuple(indices)
@@ -19,6 +19,21 @@ class CachedIterable(Generic[TItem], Iterable[TItem]):
     def __iter__(self) -> Iterator[TItem]:
         return itertools.chain(self._cached_results, self._cache_and_yield())
 
+    def __getitem__(self, index: int) -> TItem:
+        """
+        Return the item at the given position, consuming the underlying iterable
+        only as far as needed. Raises IndexError if the iterable is too short.
+        """
+        if index < 0:
+            raise IndexError("CachedIterable does not support negative indices")
+
+        items_needed = index + 1 - len(self._cached_results)
+        if items_needed > 0:
+            for _ in itertools.islice(self._cache_and_yield(), items_needed):
+                pass
+
+        return self._cached_results[index]
+
     def _cache_and_yield(self) -> Iterator[TItem]:
         for item in self._iterator:
             self._cached_results.append(item)
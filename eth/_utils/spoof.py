@@ -25,6 +25,13 @@ SPOOF_ATTRIBUTES_DEFAULTS = {
     's': DEFAULT_SPOOF_S
 }
 
+# Attributes that are derived from the fields of a transaction, and cached by it
+FIELD_DERIVED_ATTRIBUTES = {
+    'hash',
+    'intrinsic_gas',
+    'get_intrinsic_gas',
+}
+
 T = TypeVar('T', bound='SpoofAttributes')
 
 
@@ -49,9 +56,24 @@ class SpoofAttributes:
                 if not hasattr(spoof_target, attr):
                     overrides[attr] = value
 
+        # The target caches values derived from its own fields, so those are read from a
+        # copy with the overridden fields instead.  Everything else, like the sender of a
+        # signed target, still comes from the target itself.
+        field_overrides = {
+            field: value
+            for field, value in overrides.items()
+            if field in spoof_target._meta.field_names
+        }
+        if field_overrides:
+            self.spoofed_fields = spoof_target.copy(**field_overrides)
+        else:
+            self.spoofed_fields = spoof_target
+
     def __getattr__(self, attr: str) -> Any:
         if attr in self.overrides:
             return self.overrides[attr]
+        elif attr in FIELD_DERIVED_ATTRIBUTES:
+            return getattr(self.spoofed_fields, attr)
         else:
             return getattr(self.spoof_target, attr)
 
@@ -1,3 +1,11 @@
+from concurrent.futures import Executor
+from typing import (
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
 import rlp
 
 from eth_keys import keys
@@ -10,6 +18,10 @@ from eth_utils import (
     int_to_big_endian,
     ValidationError,
 )
+from eth_utils.toolz import (
+    concat,
+    partition_all,
+)
 from eth.typing import (
     Address,
     VRS,
@@ -25,6 +37,11 @@ from eth.rlp.transactions import BaseTransaction
 EIP155_CHAIN_ID_OFFSET = 35
 V_OFFSET = 27
 
+# How many senders a worker recovers at a time in recover_senders().  Recovering a sender
+# takes long enough that this amortizes the cost of sending the transactions to a worker
+# process.
+SENDER_RECOVERY_BATCH_SIZE = 16
+
 
 def is_eip_155_signed_transaction(transaction: BaseTransaction) -> bool:
     if transaction.v >= EIP155_CHAIN_ID_OFFSET:
@@ -110,3 +127,61 @@ def extract_transaction_sender(transaction: BaseTransaction) -> Address:
     public_key = signature.recover_public_key_from_msg(message)
     sender = public_key.to_canonical_address()
     return Address(sender)
+
+
+def recover_senders(transactions: Iterable[BaseTransaction], executor: Executor=None) -> None:
+    """
+    Recovers the senders of all of the given transactions up front, and attaches them to
+    the transactions so that ``transaction.sender`` doesn't have to recover them again.
+
+    The transactions are split in batches across ``executor``, like a
+    :class:`~concurrent.futures.ProcessPoolExecutor`, or recovered in this thread if there
+    is none.  Senders which can't be recovered are skipped: whatever is wrong with their
+    transaction gets raised once the sender is actually needed, like it would otherwise be.
+    """
+    transactions_without_sender = tuple(
+        transaction
+        for transaction in transactions
+        if isinstance(transaction, BaseTransaction) and transaction._sender is None
+    )
+    if not transactions_without_sender:
+        return
+
+    if executor is None:
+        senders = recover_sender_batch(transactions_without_sender)  # type: Iterable[Optional[Address]]  # noqa: E501
+    else:
+        batches = partition_all(SENDER_RECOVERY_BATCH_SIZE, transactions_without_sender)
+        senders = concat(executor.map(recover_sender_batch, batches))
+
+    attach_senders(transactions_without_sender, senders)
+
+
+def recover_sender_batch(transactions: Sequence[BaseTransaction]) -> Tuple[Optional[Address], ...]:
+    """
+    Returns the sender of each of the given transactions, or None for those whose sender
+    can't be recovered.  The senders are not attached, since this is meant to run in worker
+    processes: see :func:`attach_senders`.
+    """
+    return tuple(_recover_sender_or_none(transaction) for transaction in transactions)
+
+
+def attach_senders(transactions: Iterable[BaseTransaction],
+                   senders: Iterable[Optional[Address]]) -> None:
+    """
+    Attaches senders returned by :func:`recover_sender_batch` to their transactions.
+    """
+    for transaction, sender in zip(transactions, senders):
+        if sender is not None and isinstance(transaction, BaseTransaction):
+            transaction._sender = sender
+
+
+def _recover_sender_or_none(transaction: BaseTransaction) -> Optional[Address]:
+    if not isinstance(transaction, BaseTransaction):
+        return None
+    elif transaction._sender is not None:
+        return transaction._sender
+
+    try:
+        return transaction.get_sender()
+    except (BadSignature, ValidationError):
+        return None
@@ -4,12 +4,20 @@ from abc import (
     ABC,
     abstractmethod
 )
+import collections
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+)
+import contextlib
 import operator
 import random
 from typing import (  # noqa: F401
     Any,
     Callable,
     cast,
+    Deque,
     Dict,
     Generator,
     Iterable,
@@ -46,6 +54,7 @@ from eth.constants import (
 )
 
 from eth.db.backends.base import BaseAtomicDB
+from eth.db.cache import CacheDB
 from eth.db.chain import (
     BaseChainDB,
     ChainDB,
@@ -60,11 +69,13 @@ from eth.estimators import (
 from eth.exceptions import (
     HeaderNotFound,
     TransactionNotFound,
+    VMError,
     VMNotFound,
 )
 
 from eth.rlp.blocks import (
     BaseBlock,
+    LazyBlock,
 )
 from eth.rlp.headers import (
     BlockHeader,
@@ -81,6 +92,8 @@ from eth.rlp.transactions import (
 from eth.typing import (  # noqa: F401
     AccountState,
     BaseOrSpoofTransaction,
+    BlockImportResult,
+    BlockOrLazyBlock,
     StaticMethod,
 )
 
@@ -96,6 +109,11 @@ from eth._utils.headers import (
 from eth._utils.rlp import (
     validate_imported_block_unchanged,
 )
+from eth._utils.transactions import (
+    attach_senders,
+    recover_sender_batch,
+    recover_senders,
+)
 
 from eth.validation import (
     validate_block_number,
@@ -103,8 +121,10 @@ from eth.validation import (
     validate_word,
     validate_vm_configuration,
 )
+from eth.vm.block_builder import BlockBuilder
 from eth.vm.computation import BaseComputation
-from eth.vm.state import BaseState  # noqa: F401
+from eth.vm.prefetch import StatePrefetcher  # noqa: F401
+from eth.vm.state import BaseState
 
 from eth._warnings import catch_and_ignore_import_warning
 with catch_and_ignore_import_warning():
@@ -126,6 +146,15 @@ if TYPE_CHECKING:
     )
 
 
+# How many of the blocks following the one being executed have their headers validated in the
+# background by Chain.import_blocks()
+DEFAULT_IMPORT_LOOKAHEAD = 8
+
+# How many of the database values that a batch of calls or gas estimations read are kept
+# around for the rest of them
+BATCH_READ_CACHE_SIZE = 16384
+
+
 class BaseChain(Configurable, ABC):
     """
     The base class for all Chain objects
@@ -234,6 +263,14 @@ class BaseChain(Configurable, ABC):
     def get_block_by_header(self, block_header: BlockHeader) -> BaseBlock:
         raise NotImplementedError("Chain classes must implement this method")
 
+    @abstractmethod
+    def get_lazy_block_by_hash(self, block_hash: Hash32) -> LazyBlock:
+        raise NotImplementedError("Chain classes must implement this method")
+
+    @abstractmethod
+    def get_lazy_block_by_header(self, block_header: BlockHeader) -> LazyBlock:
+        raise NotImplementedError("Chain classes must implement this method")
+
     @abstractmethod
     def get_canonical_block_by_number(self, block_number: BlockNumber) -> BaseBlock:
         raise NotImplementedError("Chain classes must implement this method")
@@ -293,11 +330,34 @@ class BaseChain(Configurable, ABC):
             at_header: BlockHeader=None) -> int:
         raise NotImplementedError("Chain classes must implement this method")
 
+    @abstractmethod
+    def get_transaction_results(
+            self,
+            transactions: Iterable[BaseOrSpoofTransaction],
+            at_header: BlockHeader) -> Tuple[Union[bytes, Exception], ...]:
+        raise NotImplementedError("Chain classes must implement this method")
+
+    @abstractmethod
+    def estimate_gas_many(
+            self,
+            transactions: Iterable[BaseOrSpoofTransaction],
+            at_header: BlockHeader=None) -> Tuple[Union[int, Exception], ...]:
+        raise NotImplementedError("Chain classes must implement this method")
+
     @abstractmethod
     def import_block(self,
                      block: BaseBlock,
                      perform_validation: bool=True,
-                     ) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
+                     ) -> BlockImportResult:
+        raise NotImplementedError("Chain classes must implement this method")
+
+    @abstractmethod
+    def import_blocks(self,
+                      blocks: Iterable[BaseBlock],
+                      perform_validation: bool=True,
+                      executor: Executor=None,
+                      lookahead: int=DEFAULT_IMPORT_LOOKAHEAD,
+                      ) -> Tuple[BlockImportResult, ...]:
         raise NotImplementedError("Chain classes must implement this method")
 
     #
@@ -328,23 +388,37 @@ class BaseChain(Configurable, ABC):
             cls,
             root: BlockHeader,
             descendants: Tuple[BlockHeader, ...],
-            seal_check_random_sample_rate: int = 1) -> None:
+            seal_check_random_sample_rate: int = 1,
+            seal_check_stride: int = 1,
+            seal_check_executor: Executor = None) -> None:
         """
         Validate that all of the descendents are valid, given that the root header is valid.
 
         By default, check the seal validity (Proof-of-Work on Ethereum 1.x mainnet) of all headers.
         This can be expensive. Instead, check a random sample of seals using
-        seal_check_random_sample_rate.
+        seal_check_random_sample_rate, or only every Nth seal using seal_check_stride, like
+        for a range of headers from a trusted source.  The seal of the last header is always
+        checked when striding.
+
+        If a seal_check_executor is given, like a
+        :class:`~concurrent.futures.ProcessPoolExecutor`, the seals are checked in its workers
+        after the rest of the headers was validated.
         """
+        if seal_check_random_sample_rate != 1 and seal_check_stride != 1:
+            raise ValidationError("Seals can be sampled at random or by stride, but not both")
 
         all_indices = range(len(descendants))
-        if seal_check_random_sample_rate == 1:
+        if seal_check_stride != 1:
+            indices_to_check_seal = set(all_indices[seal_check_stride - 1::seal_check_stride])
+            indices_to_check_seal.update(all_indices[-1:])
+        elif seal_check_random_sample_rate == 1:
             indices_to_check_seal = set(all_indices)
         else:
             sample_size = len(all_indices) // seal_check_random_sample_rate
             indices_to_check_seal = set(random.sample(all_indices, sample_size))
 
         header_pairs = sliding_window(2, concatv([root], descendants))
+        seals_to_check = collections.OrderedDict()  # type: Dict[Type[BaseVM], List[BlockHeader]]
 
         for index, (parent, child) in enumerate(header_pairs):
             if child.parent_hash != parent.hash:
@@ -353,6 +427,9 @@ class BaseChain(Configurable, ABC):
                         child, child.parent_hash, parent.hash))
             should_check_seal = index in indices_to_check_seal
             vm_class = cls.get_vm_class_for_block_number(child.block_number)
+            if should_check_seal and seal_check_executor is not None:
+                seals_to_check.setdefault(vm_class, []).append(child)
+                should_check_seal = False
             try:
                 vm_class.validate_header(child, parent, check_seal=should_check_seal)
             except ValidationError as exc:
@@ -364,6 +441,9 @@ class BaseChain(Configurable, ABC):
                     )
                 ) from exc
 
+        for vm_class, headers in seals_to_check.items():
+            vm_class.validate_seals(headers, seal_check_executor)
+
 
 class Chain(BaseChain):
     """
@@ -374,6 +454,14 @@ class Chain(BaseChain):
     """
     logger = logging.getLogger("eth.chain.chain.Chain")
     gas_estimator = None  # type: StaticMethod[Callable[[BaseState, BaseOrSpoofTransaction], int]]
+    # Recovers the transaction senders of each imported block in parallel, if set.
+    sender_recovery_executor = None  # type: Executor
+    # Executes the transactions of each imported block speculatively, if set.
+    # See eth.vm.speculation
+    speculative_executor = None  # type: Executor
+    # Loads the state that the transactions of each imported block need ahead of their
+    # execution, if set and not executing them speculatively.
+    state_prefetcher = None  # type: StatePrefetcher
 
     chaindb_class = ChainDB  # type: Type[BaseChainDB]
 
@@ -560,6 +648,23 @@ class Chain(BaseChain):
         vm = self.get_vm(block_header)
         return vm.block
 
+    def get_lazy_block_by_hash(self, block_hash: Hash32) -> LazyBlock:
+        """
+        Returns a handle on the block with the given hash, which only decodes the
+        transactions and uncles of the block when they are accessed.
+        """
+        validate_word(block_hash, title="Block Hash")
+        block_header = self.get_block_header_by_hash(block_hash)
+        return self.get_lazy_block_by_header(block_header)
+
+    def get_lazy_block_by_header(self, block_header: BlockHeader) -> LazyBlock:
+        """
+        Returns a handle on the block with the given header, which only decodes the
+        transactions and uncles of the block when they are accessed.
+        """
+        block_class = self.get_vm_class(block_header).get_block_class()
+        return LazyBlock(block_header, block_class, self.chaindb)
+
     def get_canonical_block_by_number(self, block_number: BlockNumber) -> BaseBlock:
         """
         Returns the block with the given number in the canonical chain.
@@ -678,8 +783,11 @@ class Chain(BaseChain):
         """
         Return the result of running the given transaction.
         This is referred to as a `call()` in web3.
+
+        Nothing is written to the database, so calls can run in other threads while
+        blocks are imported.
         """
-        with self.get_vm(at_header).state_in_temp_block() as state:
+        with self.get_vm(at_header).state_in_temp_block(read_only=True) as state:
             computation = state.costless_execute_transaction(transaction)
 
         computation.raise_if_error()
@@ -695,21 +803,211 @@ class Chain(BaseChain):
         """
         if at_header is None:
             at_header = self.get_canonical_head()
-        with self.get_vm(at_header).state_in_temp_block() as state:
+        with self.get_vm(at_header).state_in_temp_block(read_only=True) as state:
             return self.gas_estimator(state, transaction)
 
+    def get_transaction_results(
+            self,
+            transactions: Iterable[BaseOrSpoofTransaction],
+            at_header: BlockHeader) -> Tuple[Union[bytes, Exception], ...]:
+        """
+        Return the results of running each of the given transactions on their own, like
+        :meth:`get_transaction_result`, or the exception that running it raised.
+
+        All of them run against the same state, which keeps the accounts, code and storage
+        that any of them loaded around for the others.
+        """
+        results = []  # type: List[Union[bytes, Exception]]
+        with self._batch_state(at_header) as state:
+            for transaction in transactions:
+                snapshot = state.snapshot()
+                try:
+                    computation = state.costless_execute_transaction(transaction)
+                    computation.raise_if_error()
+                except (VMError, ValidationError) as exc:
+                    results.append(exc)
+                else:
+                    results.append(computation.output)
+                finally:
+                    state.revert(snapshot)
+        return tuple(results)
+
+    def estimate_gas_many(
+            self,
+            transactions: Iterable[BaseOrSpoofTransaction],
+            at_header: BlockHeader=None) -> Tuple[Union[int, Exception], ...]:
+        """
+        Return an estimation of the gas that each of the given transactions will use on
+        its own, like :meth:`estimate_gas`, or the exception that estimating it raised.
+
+        All of them are estimated against the same state, like with
+        :meth:`get_transaction_results`.
+        """
+        if at_header is None:
+            at_header = self.get_canonical_head()
+
+        results = []  # type: List[Union[int, Exception]]
+        with self._batch_state(at_header) as state:
+            for transaction in transactions:
+                snapshot = state.snapshot()
+                try:
+                    results.append(self.gas_estimator(state, transaction))
+                except (VMError, ValidationError) as exc:
+                    results.append(exc)
+                finally:
+                    state.revert(snapshot)
+        return tuple(results)
+
+    @contextlib.contextmanager
+    def _batch_state(self, at_header: BlockHeader) -> Iterator[BaseState]:
+        with self.get_vm(at_header).state_in_temp_block(read_only=True) as state:
+            # nothing is written to the database, so everything read from it stays good
+            read_cache = CacheDB(state._db, cache_size=BATCH_READ_CACHE_SIZE)
+            with state.account_db.reading_through(read_cache):
+                yield state
+
     def import_block(self,
                      block: BaseBlock,
                      perform_validation: bool=True
-                     ) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
+                     ) -> BlockImportResult:
         """
         Imports a complete block and returns a 3-tuple
 
         - the imported block
         - a tuple of blocks which are now part of the canonical chain.
         - a tuple of blocks which were canonical and now are no longer canonical.
+
+        Apart from the imported block, the blocks in the last two are
+        :class:`~eth.rlp.blocks.LazyBlock` handles, which only decode their transactions
+        and uncles when they are accessed.
+        """
+        imported_block, new_canonical_blocks, old_canonical_blocks, _ = self._import_block(
+            block,
+            perform_validation,
+        )
+        return imported_block, new_canonical_blocks, old_canonical_blocks
+
+    def import_blocks(self,
+                      blocks: Iterable[BaseBlock],
+                      perform_validation: bool=True,
+                      executor: Executor=None,
+                      lookahead: int=DEFAULT_IMPORT_LOOKAHEAD,
+                      ) -> Tuple[BlockImportResult, ...]:
+        """
+        Imports the given blocks in order, and returns the same 3-tuple as
+        :meth:`import_block` for each of them.  Like there, the blocks that became
+        canonical or stopped being canonical are lazy handles.
+
+        While a block is executed, the headers and seals of up to ``lookahead`` of the blocks
+        after it are validated by ``executor``, which also recovers their transaction senders.
+        Each block also carries on with the state left behind by its parent, rather than
+        reading the accounts back from the database.
+
+        A thread pool is used by default.  A :class:`~concurrent.futures.ProcessPoolExecutor`
+        may be given instead, as long as the VM classes of the chain can be pickled.
+
+        Importing stops at the first invalid block, whose error is raised; all of the blocks
+        before it stay imported.
+        """
+        if lookahead < 1:
+            raise ValueError("Must look ahead at least one block, got {0}".format(lookahead))
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=lookahead) as default_executor:
+                return tuple(self._import_blocks(
+                    blocks,
+                    perform_validation,
+                    default_executor,
+                    lookahead,
+                ))
+        else:
+            return tuple(self._import_blocks(blocks, perform_validation, executor, lookahead))
+
+    def _import_blocks(self,
+                       blocks: Iterable[BaseBlock],
+                       perform_validation: bool,
+                       executor: Executor,
+                       lookahead: int,
+                       ) -> Iterator[BlockImportResult]:
+        upcoming = collections.deque()  # type: Deque[Tuple[BaseBlock, Optional[Future[None]], Future[Tuple[Optional[Address], ...]]]]  # noqa: E501
+        remaining_blocks = iter(blocks)
+        last_queued_header = None  # type: BlockHeader
+        parent_state = None  # type: BaseState
+
+        while True:
+            for block in take(lookahead - len(upcoming), remaining_blocks):
+                if perform_validation:
+                    header_validation = self._start_header_validation(
+                        executor,
+                        block.header,
+                        last_queued_header,
+                    )
+                else:
+                    header_validation = None
+                sender_recovery = executor.submit(recover_sender_batch, block.transactions)
+                upcoming.append((block, header_validation, sender_recovery))
+                last_queued_header = block.header
+
+            if not upcoming:
+                break
+
+            block, header_validation, sender_recovery = upcoming.popleft()
+            if header_validation is not None:
+                # re-raises whatever made the header invalid
+                header_validation.result()
+            attach_senders(block.transactions, sender_recovery.result())
+
+            (
+                imported_block,
+                new_canonical_blocks,
+                old_canonical_blocks,
+                parent_state,
+            ) = self._import_block(
+                block,
+                perform_validation,
+                is_header_validated=header_validation is not None,
+                parent_state=parent_state,
+            )
+            yield imported_block, new_canonical_blocks, old_canonical_blocks
+
+    def _start_header_validation(self,
+                                 executor: Executor,
+                                 header: BlockHeader,
+                                 previous_header: BlockHeader) -> Optional['Future[None]']:
+        """
+        Starts validating ``header`` in the background, if its parent is known: either
+        ``previous_header`` or a header that was already imported.
+        """
+        if header.is_genesis:
+            return None
+        elif previous_header is not None and previous_header.hash == header.parent_hash:
+            parent_header = previous_header
+        else:
+            try:
+                parent_header = self.get_block_header_by_hash(header.parent_hash)
+            except HeaderNotFound:
+                return None
+
+        vm_class = self.get_vm_class_for_block_number(BlockNumber(header.block_number))
+        return executor.submit(_validate_header, vm_class, header, parent_header)
+
+    def _import_block(self,
+                      block: BaseBlock,
+                      perform_validation: bool,
+                      is_header_validated: bool=False,
+                      parent_state: BaseState=None,
+                      ) -> Tuple[BaseBlock,
+                                 Tuple[BlockOrLazyBlock, ...],
+                                 Tuple[BlockOrLazyBlock, ...],
+                                 BaseState]:
         """
+        Does the work of :meth:`import_block`, and also returns the state left behind by
+        the imported block.
 
+        :param is_header_validated: whether the header and seal of the block were already
+            validated against its parent
+        :param parent_state: the state left behind by the parent block, if known
+        """
         try:
             parent_header = self.get_block_header_by_hash(block.header.parent_hash)
         except HeaderNotFound:
@@ -723,12 +1021,24 @@ class Chain(BaseChain):
             )
 
         base_header_for_import = self.create_header_from_parent(parent_header)
-        imported_block = self.get_vm(base_header_for_import).import_block(block)
+        vm = self.get_vm(base_header_for_import)
+        if self.sender_recovery_executor is not None:
+            recover_senders(block.transactions, self.sender_recovery_executor)
+        imported_block = vm.import_block(
+            block,
+            parent_state,
+            self.speculative_executor,
+            self.state_prefetcher,
+        )
 
         # Validate the imported block.
         if perform_validation:
             validate_imported_block_unchanged(imported_block, block)
-            self.validate_block(imported_block)
+            if is_header_validated:
+                self.validate_uncles(imported_block)
+                self.validate_gaslimit(imported_block.header)
+            else:
+                self.validate_block(imported_block)
 
         (
             new_canonical_hashes,
@@ -741,18 +1051,21 @@ class Chain(BaseChain):
             encode_hex(imported_block.hash),
         )
 
+        # Most of the time, the imported block is the only new canonical block, so there's
+        # no need to read it back.  The others are only decoded if the caller uses them.
         new_canonical_blocks = tuple(
-            self.get_block_by_hash(header_hash)
+            imported_block if header_hash == imported_block.hash
+            else self.get_lazy_block_by_hash(header_hash)
             for header_hash
             in new_canonical_hashes
-        )
+        )  # type: Tuple[BlockOrLazyBlock, ...]
         old_canonical_blocks = tuple(
-            self.get_block_by_hash(header_hash)
+            self.get_lazy_block_by_hash(header_hash)
             for header_hash
             in old_canonical_hashes
-        )
+        )  # type: Tuple[BlockOrLazyBlock, ...]
 
-        return imported_block, new_canonical_blocks, old_canonical_blocks
+        return imported_block, new_canonical_blocks, old_canonical_blocks, vm.state
 
     #
     # Validation API
@@ -774,8 +1087,8 @@ class Chain(BaseChain):
         if block.is_genesis:
             raise ValidationError("Cannot validate genesis block this way")
         VM_class = self.get_vm_class_for_block_number(BlockNumber(block.number))
-        parent_block = self.get_block_by_hash(block.header.parent_hash)
-        VM_class.validate_header(block.header, parent_block.header, check_seal=True)
+        parent_header = self.get_block_header_by_hash(block.header.parent_hash)
+        VM_class.validate_header(block.header, parent_header, check_seal=True)
         self.validate_uncles(block)
         self.validate_gaslimit(block.header)
 
@@ -827,13 +1140,15 @@ class Chain(BaseChain):
                 " - {0}".format(' - '.join(duplicate_uncles))
             )
 
-        recent_ancestors = tuple(
-            ancestor
-            for ancestor
-            in self.get_ancestors(MAX_UNCLE_DEPTH + 1, header=block.header)
-        )
+        # Only the ancestors' hashes and uncles are needed, so avoid building whole blocks
+        # (and decoding all of their transactions) like get_ancestors() would.
+        ancestor_count = min(block.header.block_number, MAX_UNCLE_DEPTH + 1)
+        recent_ancestors = tuple(take(ancestor_count + 1, iterate(compose(
+            self.get_block_header_by_hash,
+            operator.attrgetter('parent_hash'),
+        ), block.header)))[1:]
         recent_ancestor_hashes = {ancestor.hash for ancestor in recent_ancestors}
-        recent_uncle_hashes = _extract_uncle_hashes(recent_ancestors)
+        recent_uncle_hashes = _extract_uncle_hashes(self.chaindb, recent_ancestors)
 
         for uncle in block.uncles:
             if uncle.hash == block.hash:
@@ -873,10 +1188,21 @@ class Chain(BaseChain):
             uncle_vm_class.validate_uncle(block, uncle, uncle_parent)
 
 
+def _validate_header(vm_class: Type['BaseVM'],
+                     header: BlockHeader,
+                     parent_header: BlockHeader) -> None:
+    """
+    Validates a header and its seal on behalf of :meth:`Chain.import_blocks`.  This is a
+    module-level function so that it can be sent to worker processes.
+    """
+    vm_class.validate_header(header, parent_header, check_seal=True)
+
+
 @to_set
-def _extract_uncle_hashes(blocks: Iterable[BaseBlock]) -> Iterable[Hash32]:
-    for block in blocks:
-        for uncle in block.uncles:
+def _extract_uncle_hashes(chaindb: BaseChainDB,
+                          headers: Iterable[BlockHeader]) -> Iterable[Hash32]:
+    for header in headers:
+        for uncle in chaindb.get_block_uncles(header.uncles_hash):
             yield uncle.hash
 
 
@@ -894,7 +1220,8 @@ class MiningChain(Chain):
         Applies the transaction to the current tip block.
 
         WARNING: Receipt and Transaction trie generation is computationally
-        heavy and incurs significant perferomance overhead.
+        heavy and incurs significant perferomance overhead.  To apply many
+        transactions, use :meth:`build_block` instead.
         """
         vm = self.get_vm(self.header)
         base_block = vm.block
@@ -913,16 +1240,40 @@ class MiningChain(Chain):
 
         return new_block, receipt, computation
 
+    @contextlib.contextmanager
+    def build_block(self) -> Iterator[BlockBuilder]:
+        """
+        Apply transactions to the current tip block with the
+        :class:`~eth.vm.block_builder.BlockBuilder` this gives, which only makes the tries
+        and the state root of the block once the context exits.  The block can then be
+        mined as usual.  If the context exits with an error, the block stays as it was.
+        """
+        builder = BlockBuilder(self.get_vm(self.header))
+        yield builder
+        self.header = builder.finish().header
+
     def import_block(self,
                      block: BaseBlock,
                      perform_validation: bool=True
-                     ) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
+                     ) -> BlockImportResult:
         imported_block, new_canonical_blocks, old_canonical_blocks = super().import_block(
             block, perform_validation)
 
         self.header = self.ensure_header()
         return imported_block, new_canonical_blocks, old_canonical_blocks
 
+    def import_blocks(self,
+                      blocks: Iterable[BaseBlock],
+                      perform_validation: bool=True,
+                      executor: Executor=None,
+                      lookahead: int=DEFAULT_IMPORT_LOOKAHEAD,
+                      ) -> Tuple[BlockImportResult, ...]:
+        try:
+            return super().import_blocks(blocks, perform_validation, executor, lookahead)
+        finally:
+            # the blocks before an invalid one stay imported
+            self.header = self.ensure_header()
+
     def mine_block(self, *args: Any, **kwargs: Any) -> BaseBlock:
         """
         Mines the current block. Proxies to the current Virtual Machine.
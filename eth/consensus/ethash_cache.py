@@ -0,0 +1,188 @@
+"""
+Ethash caches that are kept on disk, so that they are only generated once per epoch,
+instead of once per process and again after every restart.
+"""
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+import logging
+import mmap
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import (  # noqa: F401
+    Dict,
+    Optional,
+    Union,
+)
+
+from pyethash import (
+    EPOCH_LENGTH,
+    REVISION,
+    mkcache_bytes,
+)
+
+
+# The environment variable with the directory of the ethash caches of all processes
+ETHASH_CACHE_DIR_ENV = 'ETHASH_CACHE_DIR'
+
+
+class EthashCacheStore:
+    """
+    Writes the ethash cache of each epoch to a file in ``cache_dir`` once, and maps it
+    read-only into the memory of every process that needs it.  The pages of the file are
+    shared between all of those processes.
+
+    Caches are written to a temporary file first, and then moved into place, so that
+    processes that race to generate the same cache never see a partial one.
+
+    Call :meth:`close` to stop the thread that generates caches in the background.
+    """
+    logger = logging.getLogger('eth.consensus.ethash_cache.EthashCacheStore')
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pregenerator = ThreadPoolExecutor(max_workers=1)
+        self._pregenerating = {}  # type: Dict[int, Future[None]]
+        self._is_closed = False
+
+    def get_path(self, block_number: int) -> Path:
+        """
+        Where the cache for the epoch of the block is stored
+        """
+        epoch = block_number // EPOCH_LENGTH
+        return self.cache_dir / 'cache-R{0}-{1:05d}'.format(REVISION, epoch)
+
+    def load(self, block_number: int) -> mmap.mmap:
+        """
+        Map the cache for the epoch of the block, after generating it if no process did so
+        yet.
+        """
+        epoch = block_number // EPOCH_LENGTH
+        path = self.get_path(block_number)
+        if not path.exists():
+            with self._lock:
+                pending = self._pregenerating.get(epoch)
+            if pending is not None:
+                try:
+                    pending.result()
+                except Exception:
+                    # it was logged, and the cache is generated again below
+                    pass
+            if not path.exists():
+                self._generate(block_number, path)
+
+        with path.open('rb') as cache_file:
+            return mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def pregenerate(self, block_number: int) -> Optional['Future[None]']:
+        """
+        Generate the cache for the epoch of the block in a background thread, unless it
+        is already stored, another process is generating it, or the store was closed.
+
+        :return: the future of the generation, or None if there is nothing to do
+        """
+        epoch = block_number // EPOCH_LENGTH
+        path = self.get_path(block_number)
+        with self._lock:
+            if self._is_closed or epoch in self._pregenerating or path.exists():
+                return None
+
+            marker = path.with_name(path.name + '.pending')
+            try:
+                # only one process pregenerates each cache
+                os.close(os.open(str(marker), os.O_CREAT | os.O_EXCL))
+            except FileExistsError:
+                return None
+
+            future = self._pregenerator.submit(self._pregenerate, block_number, path, marker)
+            self._pregenerating[epoch] = future
+
+        future.add_done_callback(lambda _: self._forget_pregeneration(epoch))
+        return future
+
+    def close(self, wait: bool=True) -> None:
+        """
+        Stop generating caches in the background, after the ones that were started.  The
+        caches that are stored can still be loaded.
+
+        :param wait: whether to wait for the caches that are being generated
+        """
+        with self._lock:
+            self._is_closed = True
+        self._pregenerator.shutdown(wait=wait)
+
+    def _forget_pregeneration(self, epoch: int) -> None:
+        with self._lock:
+            self._pregenerating.pop(epoch, None)
+
+    def _pregenerate(self, block_number: int, path: Path, marker: Path) -> None:
+        try:
+            self._generate(block_number, path)
+        except Exception:
+            self.logger.exception("Failed to pregenerate the ethash cache at %s", path)
+            raise
+        finally:
+            marker.unlink()
+
+    def _generate(self, block_number: int, path: Path) -> None:
+        self.logger.debug("Generating the ethash cache for block #%d", block_number)
+        cache = mkcache_bytes(block_number)
+
+        fd, temp_path = tempfile.mkstemp(dir=str(self.cache_dir), prefix=path.name + '.')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(cache)
+            os.replace(temp_path, str(path))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+# The directory set with set_cache_dir(), which overrides the environment once it was set
+_cache_dir = None  # type: Optional[Path]
+_is_cache_dir_set = False
+
+_cache_store = None  # type: EthashCacheStore
+_cache_store_lock = threading.Lock()
+
+
+def get_cache_store() -> Optional[EthashCacheStore]:
+    """
+    The store of the directory set with :func:`set_cache_dir`, or by default of the one in
+    the ``ETHASH_CACHE_DIR`` environment variable, or None if there is none.
+    """
+    global _cache_store
+
+    if _is_cache_dir_set:
+        cache_dir = _cache_dir
+    else:
+        env_cache_dir = os.environ.get(ETHASH_CACHE_DIR_ENV)
+        cache_dir = Path(env_cache_dir) if env_cache_dir else None
+
+    with _cache_store_lock:
+        if _cache_store is not None and _cache_store.cache_dir != cache_dir:
+            # the caches that are being generated are still stored, in the old directory
+            _cache_store.close(wait=False)
+            _cache_store = None
+        if cache_dir is not None and _cache_store is None:
+            _cache_store = EthashCacheStore(cache_dir)
+        return _cache_store
+
+
+def set_cache_dir(cache_dir: Union[Path, str, None]) -> None:
+    """
+    Store ethash caches in ``cache_dir``, or only keep them in memory if it is None, instead
+    of using the ``ETHASH_CACHE_DIR`` environment variable.  Only processes that are forked
+    afterwards, like the workers of a process pool on Linux, share this setting.  Set the
+    environment variable for the ones that are started in other ways.
+    """
+    global _cache_dir, _is_cache_dir_set
+
+    _cache_dir = None if cache_dir is None else Path(cache_dir)
+    _is_cache_dir_set = True
+    get_cache_store()
@@ -1,7 +1,16 @@
 from collections import OrderedDict
+from concurrent.futures import (
+    Executor,
+)
+import mmap
+import threading
 from typing import (  # noqa: F401
+    Dict,
+    Iterable,
     List,
-    Tuple
+    Tuple,
+    TYPE_CHECKING,
+    Union,
 )
 
 from eth_typing import (
@@ -14,6 +23,11 @@ from eth_utils import (
     encode_hex,
 )
 
+from eth_utils.toolz import (
+    groupby,
+    partition_all,
+)
+
 from eth_hash.auto import keccak
 
 from pyethash import (
@@ -23,30 +37,71 @@ from pyethash import (
 )
 
 
+from eth.consensus.ethash_cache import (
+    get_cache_store,
+)
 from eth.validation import (
     validate_length,
     validate_lte,
 )
 
+if TYPE_CHECKING:
+    from eth.rlp.headers import (  # noqa: F401
+        BlockHeader,
+    )
+
+
+Cache = Union[bytes, mmap.mmap]
+
 
 # Type annotation here is to ensure we don't accidentally use strings instead of bytes.
 cache_seeds = [b'\x00' * 32]  # type: List[bytes]
-cache_by_seed = OrderedDict()  # type: OrderedDict[bytes, bytearray]
+cache_by_seed = OrderedDict()  # type: OrderedDict[bytes, Cache]
 CACHE_MAX_ITEMS = 10
 
-
-def get_cache(block_number: int) -> bytes:
-    while len(cache_seeds) <= block_number // EPOCH_LENGTH:
-        cache_seeds.append(keccak(cache_seeds[-1]))
-    seed = cache_seeds[block_number // EPOCH_LENGTH]
-    if seed in cache_by_seed:
-        c = cache_by_seed.pop(seed)  # pop and append at end
-        cache_by_seed[seed] = c
-        return c
-    c = mkcache_bytes(block_number)
-    cache_by_seed[seed] = c
-    if len(cache_by_seed) > CACHE_MAX_ITEMS:
-        cache_by_seed.popitem(last=False)  # remove last recently accessed
+# Guards the seeds and caches above, since headers may be checked from several threads
+_cache_lock = threading.Lock()
+# A lock for each cache being generated, so that a cache is only generated once
+_generation_locks = {}  # type: Dict[bytes, threading.Lock]
+
+
+def get_cache(block_number: int) -> Cache:
+    """
+    Get the ethash cache for the epoch of the block.  If a directory for caches was set
+    with :func:`~eth.consensus.ethash_cache.set_cache_dir`, the cache is mapped from there,
+    and the cache of the next epoch is generated there in the background.
+
+    It is safe to call from several threads.  Threads that need the same missing cache
+    wait for the one that generates it.
+    """
+    with _cache_lock:
+        while len(cache_seeds) <= block_number // EPOCH_LENGTH:
+            cache_seeds.append(keccak(cache_seeds[-1]))
+        seed = cache_seeds[block_number // EPOCH_LENGTH]
+        if seed in cache_by_seed:
+            cache_by_seed.move_to_end(seed)
+            return cache_by_seed[seed]
+        generation_lock = _generation_locks.setdefault(seed, threading.Lock())
+
+    with generation_lock:
+        with _cache_lock:
+            if seed in cache_by_seed:
+                # generated by another thread while this one was waiting
+                cache_by_seed.move_to_end(seed)
+                return cache_by_seed[seed]
+
+        cache_store = get_cache_store()
+        if cache_store is None:
+            c = mkcache_bytes(block_number)
+        else:
+            c = cache_store.load(block_number)
+            cache_store.pregenerate(block_number + EPOCH_LENGTH)
+
+        with _cache_lock:
+            cache_by_seed[seed] = c
+            if len(cache_by_seed) > CACHE_MAX_ITEMS:
+                cache_by_seed.popitem(last=False)  # remove last recently accessed
+            _generation_locks.pop(seed, None)
     return c
 
 
@@ -68,6 +123,57 @@ def check_pow(block_number: int,
     validate_lte(result, 2**256 // difficulty, title="POW Difficulty")
 
 
+# How many headers of the same epoch a worker of check_pow_many() checks at a time
+POW_BATCH_SIZE = 64
+
+Seal = Tuple[int, Hash32, Hash32, bytes, int]
+
+
+def check_pow_many(headers: Iterable['BlockHeader'], executor: Executor=None) -> None:
+    """
+    Check the proof of work of all of the headers, raising a ValidationError for an invalid
+    one.
+
+    The headers are grouped by epoch and split in batches across ``executor``, like a
+    :class:`~concurrent.futures.ProcessPoolExecutor`, or checked in this thread if there is
+    none.  Each worker keeps the caches it built around, so it only builds the cache of an
+    epoch once.
+    """
+    seals = tuple(
+        (header.block_number, header.mining_hash, header.mix_hash, header.nonce, header.difficulty)
+        for header in headers
+    )  # type: Tuple[Seal, ...]
+    seals_by_epoch = groupby(lambda seal: seal[0] // EPOCH_LENGTH, seals)
+    batches = tuple(
+        batch
+        for epoch in sorted(seals_by_epoch)
+        for batch in partition_all(POW_BATCH_SIZE, seals_by_epoch[epoch])
+    )
+
+    if executor is None:
+        for batch in batches:
+            _check_pow_batch(batch)
+        return
+
+    futures = [executor.submit(_check_pow_batch, batch) for batch in batches]
+    try:
+        for future in futures:
+            future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _check_pow_batch(seals: Iterable[Seal]) -> None:
+    for block_number, mining_hash, mix_hash, nonce, difficulty in seals:
+        try:
+            check_pow(block_number, mining_hash, mix_hash, nonce, difficulty)
+        except ValidationError as exc:
+            raise ValidationError(
+                "Invalid proof of work on block #{0}: {1}".format(block_number, exc)
+            ) from exc
+
+
 MAX_TEST_MINE_ATTEMPTS = 1000
 
 
@@ -0,0 +1,81 @@
+from typing import (  # noqa: F401
+    FrozenSet,
+    NamedTuple,
+    Set,
+    Tuple,
+)
+
+from eth_typing import (
+    Address,
+    Hash32,
+)
+
+
+class AccessSummary(NamedTuple('AccessSummary', [
+    ('accounts_read', FrozenSet[Address]),
+    ('accounts_written', FrozenSet[Address]),
+    ('storage_read', FrozenSet[Tuple[Address, int]]),
+    ('storage_written', FrozenSet[Tuple[Address, int]]),
+    ('code_read', FrozenSet[Hash32]),
+    ('code_written', FrozenSet[Hash32]),
+])):
+    """
+    Everything that was accessed in an :class:`~eth.db.account.AccountDB` while it was
+    recording.
+
+    Whatever was written was also read.  Writes that were discarded again only count
+    as reads, since they were needed to get as far as they did.
+    """
+    pass
+
+
+class AccessRecord:
+    """
+    The accounts, storage slots and code that were accessed since a checkpoint of an
+    :class:`~eth.db.account.AccountDB`.
+    """
+    __slots__ = [
+        'accounts_read',
+        'accounts_written',
+        'storage_read',
+        'storage_written',
+        'code_read',
+        'code_written',
+    ]
+
+    def __init__(self) -> None:
+        self.accounts_read = set()  # type: Set[Address]
+        self.accounts_written = set()  # type: Set[Address]
+        self.storage_read = set()  # type: Set[Tuple[Address, int]]
+        self.storage_written = set()  # type: Set[Tuple[Address, int]]
+        self.code_read = set()  # type: Set[Hash32]
+        self.code_written = set()  # type: Set[Hash32]
+
+    def merge(self, committed: 'AccessRecord') -> None:
+        """
+        Add everything that was accessed after a checkpoint that was committed.
+        """
+        self.accounts_read.update(committed.accounts_read)
+        self.accounts_written.update(committed.accounts_written)
+        self.storage_read.update(committed.storage_read)
+        self.storage_written.update(committed.storage_written)
+        self.code_read.update(committed.code_read)
+        self.code_written.update(committed.code_written)
+
+    def merge_reads(self, discarded: 'AccessRecord') -> None:
+        """
+        Add everything that was accessed after a checkpoint that was discarded, as reads.
+        """
+        self.accounts_read.update(discarded.accounts_read)
+        self.storage_read.update(discarded.storage_read)
+        self.code_read.update(discarded.code_read)
+
+    def summarize(self) -> AccessSummary:
+        return AccessSummary(
+            frozenset(self.accounts_read),
+            frozenset(self.accounts_written),
+            frozenset(self.storage_read),
+            frozenset(self.storage_written),
+            frozenset(self.code_read),
+            frozenset(self.code_written),
+        )
@@ -2,10 +2,21 @@ from abc import (
     ABC,
     abstractmethod
 )
-from uuid import UUID
+import contextlib
+from uuid import UUID, uuid4
 import logging
 from lru import LRU
-from typing import cast, Set, Tuple  # noqa: F401
+from typing import (  # noqa: F401
+    Any,
+    cast,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from eth_typing import (
     Address,
@@ -22,12 +33,17 @@ from eth_hash.auto import keccak
 from eth_utils import (
     encode_hex,
     int_to_big_endian,
+    ValidationError,
 )
 
 from eth.constants import (
     BLANK_ROOT_HASH,
     EMPTY_SHA3,
 )
+from eth.db.access import (
+    AccessRecord,
+    AccessSummary,
+)
 from eth.db.backends.base import (
     BaseDB,
 )
@@ -38,10 +54,13 @@ from eth.db.cache import (
     CacheDB,
 )
 from eth.db.journal import (
+    Journal,
     JournalDB,
 )
 from eth.rlp.accounts import (
-    Account,
+    AccountRecord,
+    decode_account,
+    encode_account,
 )
 from eth.validation import (
     validate_is_bytes,
@@ -152,6 +171,31 @@ class BaseAccountDB(ABC):
     def commit(self, changeset: Tuple[UUID, UUID]) -> None:
         raise NotImplementedError("Must be implemented by subclass")
 
+    #
+    # Access recording API
+    #
+    @abstractmethod
+    def start_recording_accesses(self) -> None:
+        """
+        Start recording the accounts, storage slots and code that are read and written.
+        """
+        raise NotImplementedError("Must be implemented by subclass")
+
+    @abstractmethod
+    def stop_recording_accesses(self) -> AccessSummary:
+        """
+        Stop recording, and return everything that was accessed since recording started.
+        """
+        raise NotImplementedError("Must be implemented by subclass")
+
+    @abstractmethod
+    def reading_through(self, db: BaseDB) -> ContextManager[None]:
+        """
+        Read everything that isn't pending in this account database through ``db``,
+        which must wrap the database it was created with, until the context exits.
+        """
+        raise NotImplementedError("Must be implemented by subclass")
+
     @abstractmethod
     def make_state_root(self) -> Hash32:
         """
@@ -170,7 +214,67 @@ class BaseAccountDB(ABC):
         raise NotImplementedError("Must be implemented by subclass")
 
 
-class AccountDB(BaseAccountDB):
+class _AccessRecordingAccountDB(BaseAccountDB):
+    """
+    Keeps track of what an account database accessed while it is recording accesses, across
+    its checkpoints.  Subclasses add to ``_accesses`` as they are accessed, and open and
+    close the checkpoints as changesets are recorded, discarded and committed.
+    """
+    # What was accessed since the latest checkpoint, but only while recording accesses
+    _accesses = None  # type: AccessRecord
+    # What was accessed before each of the checkpoints, with the changesets they started
+    _access_checkpoints = None  # type: List[Tuple[Tuple[UUID, UUID], AccessRecord]]
+
+    def start_recording_accesses(self) -> None:
+        if self._accesses is not None:
+            raise ValidationError("Already recording accesses")
+        self._accesses = AccessRecord()
+        self._access_checkpoints = []
+
+    def stop_recording_accesses(self) -> AccessSummary:
+        if self._accesses is None:
+            raise ValidationError("Not recording accesses")
+        # checkpoints that are still open would be committed, if anything
+        accesses = self._accesses
+        for _, previous_accesses in reversed(self._access_checkpoints):
+            previous_accesses.merge(accesses)
+            accesses = previous_accesses
+
+        self._accesses = None
+        self._access_checkpoints = None
+        return accesses.summarize()
+
+    def _open_access_checkpoint(self, changeset: Tuple[UUID, UUID]) -> None:
+        if self._accesses is not None:
+            self._access_checkpoints.append((changeset, self._accesses))
+            self._accesses = AccessRecord()
+
+    def _close_access_checkpoints(self, changeset: Tuple[UUID, UUID], is_discarded: bool) -> None:
+        """
+        Merge what was accessed since the checkpoint of ``changeset``, including after any
+        later checkpoints, into what was accessed before it.
+        """
+        accesses = self._accesses
+        while self._access_checkpoints:
+            checkpoint_changeset, previous_accesses = self._access_checkpoints.pop()
+            if is_discarded:
+                previous_accesses.merge_reads(accesses)
+            else:
+                previous_accesses.merge(accesses)
+            accesses = previous_accesses
+            if checkpoint_changeset == changeset:
+                break
+        else:
+            # The checkpoint was taken before recording started, so nothing that was
+            # written since recording started is left.
+            if is_discarded:
+                reads = AccessRecord()
+                reads.merge_reads(accesses)
+                accesses = reads
+        self._accesses = accesses
+
+
+class AccountDB(_AccessRecordingAccountDB):
 
     logger = cast(ExtendedDebugLogger, logging.getLogger('eth.db.account.AccountDB'))
 
@@ -205,9 +309,10 @@ class AccountDB(BaseAccountDB):
         the key in _journaltrie, because the cache is only invalidated
         after a state root change.
 
-        _journaltrie is a journaling of the accounts (an address->rlp mapping,
+        _journaltrie is a journaling of the accounts (an address->AccountRecord mapping,
         rather than the nodes stored by the trie). This enables
-        a squashing of all account changes before pushing them into the trie.
+        a squashing of all account changes before pushing them into the trie,
+        and each changed account is only encoded once, when it is.
 
         .. NOTE:: There is an opportunity to do something similar for storage
 
@@ -219,7 +324,7 @@ class AccountDB(BaseAccountDB):
         self._journaldb = JournalDB(self._batchdb)
         self._trie = HashTrie(HexaryTrie(self._batchtrie, state_root, prune=True))
         self._trie_cache = CacheDB(self._trie)
-        self._journaltrie = JournalDB(self._trie_cache)
+        self._journaltrie = _AccountJournal(_AccountRecordDB(self._trie_cache))
         self._account_cache = LRU(2048)
 
     @property
@@ -228,8 +333,11 @@ class AccountDB(BaseAccountDB):
 
     @state_root.setter
     def state_root(self, value: Hash32) -> None:
-        self._trie_cache.reset_cache()
-        self._trie.root_hash = value
+        if value != self._trie.root_hash:
+            # the cached accounts are still good for the same root, like after a revert
+            # to a snapshot that was taken since the last state root was made
+            self._trie_cache.reset_cache()
+            self._trie.root_hash = value
 
     def has_root(self, state_root: bytes) -> bool:
         return state_root in self._batchtrie
@@ -241,6 +349,11 @@ class AccountDB(BaseAccountDB):
         validate_canonical_address(address, title="Storage Address")
         validate_uint256(slot, title="Storage Slot")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.storage_read.add((address, slot))
+
         account = self._get_account(address, from_journal)
         storage = HashTrie(HexaryTrie(self._journaldb, account.storage_root))
 
@@ -257,6 +370,13 @@ class AccountDB(BaseAccountDB):
         validate_uint256(slot, title="Storage Slot")
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+            accesses.storage_read.add((address, slot))
+            accesses.storage_written.add((address, slot))
+
         account = self._get_account(address)
         storage = HashTrie(HexaryTrie(self._journaldb, account.storage_root))
 
@@ -273,6 +393,11 @@ class AccountDB(BaseAccountDB):
     def delete_storage(self, address: Address) -> None:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         account = self._get_account(address)
         self._set_account(address, account.copy(storage_root=BLANK_ROOT_HASH))
 
@@ -282,6 +407,10 @@ class AccountDB(BaseAccountDB):
     def get_balance(self, address: Address) -> int:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
         account = self._get_account(address)
         return account.balance
 
@@ -289,6 +418,11 @@ class AccountDB(BaseAccountDB):
         validate_canonical_address(address, title="Storage Address")
         validate_uint256(balance, title="Account Balance")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         account = self._get_account(address)
         self._set_account(address, account.copy(balance=balance))
 
@@ -298,6 +432,10 @@ class AccountDB(BaseAccountDB):
     def get_nonce(self, address: Address) -> int:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
         account = self._get_account(address)
         return account.nonce
 
@@ -305,6 +443,11 @@ class AccountDB(BaseAccountDB):
         validate_canonical_address(address, title="Storage Address")
         validate_uint256(nonce, title="Nonce")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         account = self._get_account(address)
         self._set_account(address, account.copy(nonce=nonce))
 
@@ -318,8 +461,14 @@ class AccountDB(BaseAccountDB):
     def get_code(self, address: Address) -> bytes:
         validate_canonical_address(address, title="Storage Address")
 
+        code_hash = self.get_code_hash(address)
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.code_read.add(code_hash)
+
         try:
-            return self._journaldb[self.get_code_hash(address)]
+            return self._journaldb[code_hash]
         except KeyError:
             return b""
 
@@ -330,18 +479,35 @@ class AccountDB(BaseAccountDB):
         account = self._get_account(address)
 
         code_hash = keccak(code)
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+            accesses.code_read.add(Hash32(code_hash))
+            accesses.code_written.add(Hash32(code_hash))
+
         self._journaldb[code_hash] = code
-        self._set_account(address, account.copy(code_hash=code_hash))
+        self._set_account(address, account.copy(code_hash=Hash32(code_hash)))
 
     def get_code_hash(self, address: Address) -> Hash32:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
         account = self._get_account(address)
         return account.code_hash
 
     def delete_code(self, address: Address) -> None:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         account = self._get_account(address)
         self._set_account(address, account.copy(code_hash=EMPTY_SHA3))
 
@@ -353,17 +519,33 @@ class AccountDB(BaseAccountDB):
 
     def delete_account(self, address: Address) -> None:
         validate_canonical_address(address, title="Storage Address")
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         if address in self._account_cache:
             del self._account_cache[address]
         del self._journaltrie[address]
 
     def account_exists(self, address: Address) -> bool:
         validate_canonical_address(address, title="Storage Address")
-        return self._journaltrie.get(address, b'') != b''
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
+        return self._journaltrie.get(address) is not None
 
     def touch_account(self, address: Address) -> None:
         validate_canonical_address(address, title="Storage Address")
 
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
         account = self._get_account(address)
         self._set_account(address, account)
 
@@ -373,39 +555,59 @@ class AccountDB(BaseAccountDB):
     #
     # Internal
     #
-    def _get_account(self, address: Address, from_journal: bool=True) -> Account:
-        if from_journal and address in self._account_cache:
-            return self._account_cache[address]
-        rlp_account = (self._journaltrie if from_journal else self._trie_cache).get(address, b'')
-        if rlp_account:
-            account = rlp.decode(rlp_account, sedes=Account)
-        else:
-            account = Account()
+    def _get_account(self, address: Address, from_journal: bool=True) -> AccountRecord:
         if from_journal:
+            if address in self._account_cache:
+                return self._account_cache[address]
+            account = self._journaltrie.get(address)
+            if account is None:
+                account = AccountRecord()
             self._account_cache[address] = account
-        return account
+            return account
+        else:
+            rlp_account = self._trie_cache.get(address, b'')
+            if rlp_account:
+                return decode_account(rlp_account)
+            else:
+                return AccountRecord()
 
-    def _set_account(self, address: Address, account: Account) -> None:
+    def _set_account(self, address: Address, account: AccountRecord) -> None:
         self._account_cache[address] = account
-        rlp_account = rlp.encode(account, sedes=Account)
-        self._journaltrie[address] = rlp_account
+        self._journaltrie[address] = account
 
     #
     # Record and discard API
     #
     def record(self) -> Tuple[UUID, UUID]:
-        return (self._journaldb.record(), self._journaltrie.record())
+        changeset = (self._journaldb.record(), self._journaltrie.record())
+        self._open_access_checkpoint(changeset)
+        return changeset
 
     def discard(self, changeset: Tuple[UUID, UUID]) -> None:
         db_changeset, trie_changeset = changeset
         self._journaldb.discard(db_changeset)
         self._journaltrie.discard(trie_changeset)
         self._account_cache.clear()
+        if self._accesses is not None:
+            self._close_access_checkpoints(changeset, is_discarded=True)
 
     def commit(self, changeset: Tuple[UUID, UUID]) -> None:
         db_changeset, trie_changeset = changeset
         self._journaldb.commit(db_changeset)
         self._journaltrie.commit(trie_changeset)
+        if self._accesses is not None:
+            self._close_access_checkpoints(changeset, is_discarded=False)
+
+    @contextlib.contextmanager
+    def reading_through(self, db: BaseDB) -> Iterator[None]:
+        wrapped_db = self._batchdb.wrapped_db
+        self._batchdb.wrapped_db = db
+        self._batchtrie.wrapped_db = db
+        try:
+            yield
+        finally:
+            self._batchdb.wrapped_db = wrapped_db
+            self._batchtrie.wrapped_db = wrapped_db
 
     def make_state_root(self) -> Hash32:
         self.logger.debug2("Generating AccountDB trie")
@@ -437,3 +639,384 @@ class AccountDB(BaseAccountDB):
                         encode_hex(account.storage_root),
                         encode_hex(account.code_hash),
                     )
+
+
+class _AccountRecordDB(BaseDB):
+    """
+    A view of a database of encoded accounts, like the account trie, which reads and
+    writes account records.
+    """
+    def __init__(self, db: BaseDB) -> None:
+        self._db = db
+
+    def __getitem__(self, address: bytes) -> AccountRecord:  # type: ignore # Breaks LSP
+        rlp_account = self._db[address]
+        if rlp_account:
+            return decode_account(rlp_account)
+        else:
+            # the trie returns an empty value for missing accounts
+            raise KeyError(address)
+
+    def __setitem__(self,  # type: ignore # Breaks LSP
+                    address: bytes,
+                    account: AccountRecord) -> None:
+        self._db[address] = encode_account(account)
+
+    def _exists(self, address: bytes) -> bool:
+        return address in self._db
+
+    def __delitem__(self, address: bytes) -> None:
+        del self._db[address]
+
+
+class _AccountJournal:
+    """
+    Journals the account records of an :class:`_AccountRecordDB`, the way
+    :class:`~eth.db.journal.JournalDB` journals the values of a database of bytes.
+    """
+    def __init__(self, account_record_db: _AccountRecordDB) -> None:
+        # The journal never looks at the values, so it keeps the records as they are.
+        self._journal_db = JournalDB(account_record_db)
+
+    @property
+    def journal(self) -> Journal:
+        return self._journal_db.journal
+
+    def get(self, address: bytes) -> Optional[AccountRecord]:
+        try:
+            return cast(AccountRecord, self._journal_db[address])
+        except KeyError:
+            return None
+
+    def __setitem__(self, address: bytes, account: AccountRecord) -> None:
+        self._journal_db[address] = cast(bytes, account)
+
+    def __delitem__(self, address: bytes) -> None:
+        del self._journal_db[address]
+
+    def record(self) -> UUID:
+        return self._journal_db.record()
+
+    def discard(self, changeset_id: UUID) -> None:
+        self._journal_db.discard(changeset_id)
+
+    def commit(self, changeset_id: UUID) -> None:
+        self._journal_db.commit(changeset_id)
+
+    def persist(self) -> None:
+        self._journal_db.persist()
+
+
+# Marks a key that was missing from an overlay before it was written
+_MISSING = object()
+
+
+class ReadOnlyAccountDB(_AccessRecordingAccountDB):
+    """
+    Executes against the state at a fixed ``state_root``, without ever writing to ``db``.
+
+    Changes go into an in-memory overlay, which is simply thrown away with the account
+    database: there are no batches, no journals of trie changes and no state roots to
+    make.  Nothing it reads from ``db`` changes while another writer adds states, so any
+    number of them can execute calls in parallel with a block import.
+
+    Many threads can read through the same instance at once, as long as none of them
+    writes to it.
+    """
+
+    def __init__(self, db: BaseDB, state_root: Hash32=BLANK_ROOT_HASH) -> None:
+        self._db = db
+        self._state_root = state_root
+        # the accounts at the state root, or None if they don't exist
+        self._base_accounts = {}  # type: Dict[Address, Optional[AccountRecord]]
+
+        # the overlay, where deleted accounts are None
+        self._accounts = {}  # type: Dict[Address, Optional[AccountRecord]]
+        self._storage = {}  # type: Dict[Address, Dict[int, int]]
+        self._wiped = {}  # type: Dict[Address, bool]
+        self._code = {}  # type: Dict[Hash32, bytes]
+
+        # what the overlay held before each write since the first open checkpoint
+        self._journal = []  # type: List[Tuple[Dict[Any, Any], Any, Any]]
+        self._checkpoints = []  # type: List[Tuple[UUID, int]]
+
+    @property
+    def state_root(self) -> Hash32:
+        return self._state_root
+
+    @state_root.setter
+    def state_root(self, value: Hash32) -> None:
+        if value != self._state_root:
+            raise ValidationError(
+                "Cannot move a read-only account database from state root {0} to {1}".format(
+                    encode_hex(self._state_root),
+                    encode_hex(value),
+                )
+            )
+
+    def has_root(self, state_root: bytes) -> bool:
+        return state_root in self._db
+
+    #
+    # Storage
+    #
+    def get_storage(self, address: Address, slot: int, from_journal: bool=True) -> int:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(slot, title="Storage Slot")
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.storage_read.add((address, slot))
+
+        if from_journal:
+            slots = self._storage.get(address)
+            if slots is not None and slot in slots:
+                return slots[slot]
+            elif address in self._wiped:
+                return 0
+
+        account = self._get_base_account(address)
+        if account is None:
+            return 0
+        storage = HashTrie(HexaryTrie(self._db, account.storage_root))
+        encoded_value = storage.get(pad32(int_to_big_endian(slot)), b'')
+        if encoded_value:
+            return rlp.decode(encoded_value, sedes=rlp.sedes.big_endian_int)
+        else:
+            return 0
+
+    def set_storage(self, address: Address, slot: int, value: int) -> None:
+        validate_uint256(value, title="Storage Value")
+        validate_uint256(slot, title="Storage Slot")
+        validate_canonical_address(address, title="Storage Address")
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.storage_read.add((address, slot))
+            accesses.storage_written.add((address, slot))
+
+        slots = self._storage.get(address)
+        if slots is None:
+            slots = {}
+            self._write(self._storage, address, slots)
+        self._write(slots, slot, value)
+        self._set_account(address, self._get_account(address))
+
+    def delete_storage(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        self._write(self._storage, address, {})
+        self._write(self._wiped, address, True)
+        self._set_account(address, self._get_account(address).copy(storage_root=BLANK_ROOT_HASH))
+
+    #
+    # Balance
+    #
+    def get_balance(self, address: Address) -> int:
+        validate_canonical_address(address, title="Storage Address")
+        return self._get_account(address).balance
+
+    def set_balance(self, address: Address, balance: int) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(balance, title="Account Balance")
+
+        self._set_account(address, self._get_account(address).copy(balance=balance))
+
+    #
+    # Nonce
+    #
+    def get_nonce(self, address: Address) -> int:
+        validate_canonical_address(address, title="Storage Address")
+        return self._get_account(address).nonce
+
+    def set_nonce(self, address: Address, nonce: int) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(nonce, title="Nonce")
+
+        self._set_account(address, self._get_account(address).copy(nonce=nonce))
+
+    def increment_nonce(self, address: Address) -> None:
+        current_nonce = self.get_nonce(address)
+        self.set_nonce(address, current_nonce + 1)
+
+    #
+    # Code
+    #
+    def get_code(self, address: Address) -> bytes:
+        code_hash = self.get_code_hash(address)
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.code_read.add(code_hash)
+
+        if code_hash in self._code:
+            return self._code[code_hash]
+
+        try:
+            return self._db[code_hash]
+        except KeyError:
+            return b""
+
+    def set_code(self, address: Address, code: bytes) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_is_bytes(code, title="Code")
+
+        code_hash = Hash32(keccak(code))
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.code_read.add(code_hash)
+            accesses.code_written.add(code_hash)
+
+        self._write(self._code, code_hash, code)
+        self._set_account(address, self._get_account(address).copy(code_hash=code_hash))
+
+    def get_code_hash(self, address: Address) -> Hash32:
+        validate_canonical_address(address, title="Storage Address")
+        return self._get_account(address).code_hash
+
+    def delete_code(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        self._set_account(address, self._get_account(address).copy(code_hash=EMPTY_SHA3))
+
+    #
+    # Account Methods
+    #
+    def account_has_code_or_nonce(self, address: Address) -> bool:
+        return self.get_nonce(address) != 0 or self.get_code_hash(address) != EMPTY_SHA3
+
+    def delete_account(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
+        self._write(self._accounts, address, None)
+        self._write(self._storage, address, {})
+        self._write(self._wiped, address, True)
+
+    def account_exists(self, address: Address) -> bool:
+        validate_canonical_address(address, title="Storage Address")
+
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
+        if address in self._accounts:
+            return self._accounts[address] is not None
+        else:
+            return self._get_base_account(address) is not None
+
+    def touch_account(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        self._set_account(address, self._get_account(address))
+
+    def account_is_empty(self, address: Address) -> bool:
+        return not self.account_has_code_or_nonce(address) and self.get_balance(address) == 0
+
+    #
+    # Internal
+    #
+    def _get_base_account(self, address: Address) -> Optional[AccountRecord]:
+        try:
+            return self._base_accounts[address]
+        except KeyError:
+            pass
+
+        trie = HashTrie(HexaryTrie(self._db, self._state_root))
+        rlp_account = trie.get(address, b'')
+        if rlp_account:
+            account = decode_account(rlp_account)
+        else:
+            account = None
+        self._base_accounts[address] = account
+        return account
+
+    def _get_account(self, address: Address) -> AccountRecord:
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+
+        if address in self._accounts:
+            account = self._accounts[address]
+        else:
+            account = self._get_base_account(address)
+
+        if account is None:
+            return AccountRecord()
+        else:
+            return account
+
+    def _set_account(self, address: Address, account: AccountRecord) -> None:
+        accesses = self._accesses
+        if accesses is not None:
+            accesses.accounts_read.add(address)
+            accesses.accounts_written.add(address)
+
+        self._write(self._accounts, address, account)
+
+    def _write(self, overlay: Dict[Any, Any], key: Any, value: Any) -> None:
+        if self._checkpoints:
+            self._journal.append((overlay, key, overlay.get(key, _MISSING)))
+        overlay[key] = value
+
+    #
+    # Record and discard API
+    #
+    def record(self) -> Tuple[UUID, UUID]:
+        checkpoint = uuid4()
+        self._checkpoints.append((checkpoint, len(self._journal)))
+        changeset = (checkpoint, checkpoint)
+        self._open_access_checkpoint(changeset)
+        return changeset
+
+    def discard(self, changeset: Tuple[UUID, UUID]) -> None:
+        journal_length = self._close_checkpoint(changeset)
+        while len(self._journal) > journal_length:
+            overlay, key, previous_value = self._journal.pop()
+            if previous_value is _MISSING:
+                del overlay[key]
+            else:
+                overlay[key] = previous_value
+        if self._accesses is not None:
+            self._close_access_checkpoints(changeset, is_discarded=True)
+
+    def commit(self, changeset: Tuple[UUID, UUID]) -> None:
+        self._close_checkpoint(changeset)
+        if not self._checkpoints:
+            # nothing could be discarded anymore
+            self._journal.clear()
+        if self._accesses is not None:
+            self._close_access_checkpoints(changeset, is_discarded=False)
+
+    def _close_checkpoint(self, changeset: Tuple[UUID, UUID]) -> int:
+        """
+        Close the checkpoint of ``changeset``, and all the ones that were taken after it.
+
+        :return: the length of the journal when the checkpoint was taken
+        """
+        checkpoint, _ = changeset
+        for index in reversed(range(len(self._checkpoints))):
+            if self._checkpoints[index][0] == checkpoint:
+                _, journal_length = self._checkpoints[index]
+                del self._checkpoints[index:]
+                return journal_length
+        raise ValidationError("Changeset not found in journal: {0}".format(changeset))
+
+    @contextlib.contextmanager
+    def reading_through(self, db: BaseDB) -> Iterator[None]:
+        wrapped_db = self._db
+        self._db = db
+        try:
+            yield
+        finally:
+            self._db = wrapped_db
+
+    def make_state_root(self) -> Hash32:
+        raise ValidationError("Cannot make the state root of a read-only account database")
+
+    def persist(self) -> None:
+        raise ValidationError("Cannot persist a read-only account database")
@@ -0,0 +1,179 @@
+"""
+An index of the blooms of the canonical headers by bloom bit, rather than by block.  The
+canonical chain is split into sections of blocks, and for each section and each of the
+2048 bits of a bloom there is a vector with one bit per block of the section, which is set
+if the bloom of that block has that bit set.
+
+Finding the blocks whose bloom may contain a value then only takes the vectors of the three
+bits of that value in each section, instead of every header.
+
+Only the blocks from :func:`get_first_indexed_block_number` on are in the index.  The ones
+before it became canonical while the index wasn't kept, like in a database from an earlier
+version.
+"""
+from typing import (  # noqa: F401
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from eth_typing import (
+    BlockNumber,
+)
+import rlp
+
+from eth._utils.bloom import (
+    get_bloom_bit_indices,
+    get_value_bloom,
+)
+from eth.db.backends.base import (
+    BaseDB,
+)
+from eth.db.schema import SchemaV1
+from eth.rlp.headers import (
+    BlockHeader,
+)
+
+
+# How many blocks are in each section of the index
+BLOOM_BITS_SECTION_SIZE = 4096
+
+
+def update_bloom_bits(db: BaseDB,
+                      new_canonical_headers: Sequence[BlockHeader],
+                      old_canonical_headers: Sequence[BlockHeader]) -> None:
+    """
+    Updates the index for a change of the canonical chain.  The bits of the old canonical
+    headers are cleared before the ones of the new canonical headers are set, since they may
+    be at the same block numbers.
+
+    The first time the index is updated, it starts at the first of the new canonical headers.
+    """
+    # the bits to clear and the bits to set, of each vector that changes
+    changes = {}  # type: Dict[Tuple[int, int], Tuple[int, int]]
+
+    for header in old_canonical_headers:
+        section, offset = divmod(header.block_number, BLOOM_BITS_SECTION_SIZE)
+        for bloom_bit in get_bloom_bit_indices(header.bloom):
+            to_clear, to_set = changes.get((bloom_bit, section), (0, 0))
+            changes[bloom_bit, section] = (to_clear | 1 << offset, to_set)
+
+    for header in new_canonical_headers:
+        section, offset = divmod(header.block_number, BLOOM_BITS_SECTION_SIZE)
+        for bloom_bit in get_bloom_bit_indices(header.bloom):
+            to_clear, to_set = changes.get((bloom_bit, section), (0, 0))
+            changes[bloom_bit, section] = (to_clear, to_set | 1 << offset)
+
+    for (bloom_bit, section), (to_clear, to_set) in changes.items():
+        vector = _get_bloom_bits(db, bloom_bit, section)
+        new_vector = (vector & ~to_clear) | to_set
+        if new_vector != vector:
+            _set_bloom_bits(db, bloom_bit, section, new_vector)
+
+    if new_canonical_headers and get_first_indexed_block_number(db) is None:
+        db.set(
+            SchemaV1.make_bloom_bits_start_lookup_key(),
+            rlp.encode(new_canonical_headers[0].block_number, sedes=rlp.sedes.big_endian_int),
+        )
+
+
+def get_first_indexed_block_number(db: BaseDB) -> Optional[BlockNumber]:
+    """
+    Returns the number of the block from which on all canonical blocks are in the index, or
+    None if the index was never updated.
+    """
+    try:
+        encoded_block_number = db[SchemaV1.make_bloom_bits_start_lookup_key()]
+    except KeyError:
+        return None
+    else:
+        return BlockNumber(rlp.decode(encoded_block_number, sedes=rlp.sedes.big_endian_int))
+
+
+def forget_bloom_bits_start(db: BaseDB) -> None:
+    """
+    Marks the index as incomplete, when blocks become canonical without updating it.  It
+    starts again with the next update.
+    """
+    db.delete(SchemaV1.make_bloom_bits_start_lookup_key())
+
+
+def get_matching_block_numbers(db: BaseDB,
+                               from_block: BlockNumber,
+                               to_block: BlockNumber,
+                               conditions: Sequence[Sequence[bytes]]) -> Iterable[BlockNumber]:
+    """
+    Returns the numbers of the blocks from ``from_block`` up to and including ``to_block``
+    whose blooms match all of the ``conditions``, in increasing order.  A bloom matches a
+    condition if it may contain any of the values of that condition.  Blocks before
+    :func:`get_first_indexed_block_number` may be missing.
+
+    Like the blooms themselves, this can return blocks that don't contain any of the
+    values, but never misses a block that does.
+    """
+    if from_block > to_block:
+        return
+
+    condition_bit_indices = tuple(
+        tuple(get_bloom_bit_indices(get_value_bloom(value)) for value in condition)
+        for condition in conditions
+    )
+
+    first_section = from_block // BLOOM_BITS_SECTION_SIZE
+    last_section = to_block // BLOOM_BITS_SECTION_SIZE
+    for section in range(first_section, last_section + 1):
+        section_start = section * BLOOM_BITS_SECTION_SIZE
+        first_offset = max(from_block - section_start, 0)
+        last_offset = min(to_block - section_start, BLOOM_BITS_SECTION_SIZE - 1)
+        matches = (1 << (last_offset + 1)) - (1 << first_offset)
+
+        vectors = {}  # type: Dict[int, int]
+        for condition in condition_bit_indices:
+            condition_matches = 0
+            for bit_indices in condition:
+                value_matches = matches
+                for bloom_bit in bit_indices:
+                    if bloom_bit not in vectors:
+                        vectors[bloom_bit] = _get_bloom_bits(db, bloom_bit, section)
+                    value_matches &= vectors[bloom_bit]
+                condition_matches |= value_matches
+            matches = condition_matches
+            if not matches:
+                break
+
+        for offset in get_bloom_bit_indices(matches):
+            yield BlockNumber(section_start + offset)
+
+
+def bloom_matches(bloom: int, conditions: Sequence[Sequence[bytes]]) -> bool:
+    """
+    Whether the bloom may contain one of the values of each of the ``conditions``.
+    """
+    for condition in conditions:
+        for value in condition:
+            value_bloom = get_value_bloom(value)
+            if bloom & value_bloom == value_bloom:
+                break
+        else:
+            return False
+    return True
+
+
+def _get_bloom_bits(db: BaseDB, bloom_bit: int, section: int) -> int:
+    try:
+        encoded_vector = db[SchemaV1.make_bloom_bits_lookup_key(bloom_bit, section)]
+    except KeyError:
+        return 0
+    else:
+        return int.from_bytes(encoded_vector, 'little')
+
+
+def _set_bloom_bits(db: BaseDB, bloom_bit: int, section: int, vector: int) -> None:
+    key = SchemaV1.make_bloom_bits_lookup_key(bloom_bit, section)
+    if vector:
+        # the bit of the first block of the section is the lowest bit of the first byte
+        db.set(key, vector.to_bytes((vector.bit_length() + 7) // 8, 'little'))
+    else:
+        db.delete(key)
@@ -1,12 +1,26 @@
+import threading
+from typing import (
+    Any,
+    Hashable,
+    NamedTuple,
+)
+
 from lru import LRU
 
 from eth.db.backends.base import BaseDB
 
 
+# How many separately locked parts the caches are split into, so that threads which look up
+# different keys rarely wait for each other
+DEFAULT_CACHE_STRIPES = 16
+
+
 class CacheDB(BaseDB):
     """
     Set and get decoded RLP objects, where the underlying db stores
     encoded objects.
+
+    Lookups are safe from many threads at once, as long as the underlying db is.
     """
     def __init__(self, db: BaseDB, cache_size: int=2048) -> None:
         self._db = db
@@ -14,18 +28,124 @@ class CacheDB(BaseDB):
         self.reset_cache()
 
     def reset_cache(self) -> None:
-        self._cached_values = LRU(self._cache_size)
+        self._cached_values = ObjectCache(self._cache_size)
 
     def __getitem__(self, key: bytes) -> bytes:
-        if key not in self._cached_values:
-            self._cached_values[key] = self._db[key]
-        return self._cached_values[key]
+        value = self._cached_values.get(key, _MISSING)
+        if value is _MISSING:
+            # another thread may evict it again right away, so it's returned from here
+            value = self._db[key]
+            self._cached_values[key] = value
+        return value
 
     def __setitem__(self, key: bytes, value: bytes) -> None:
         self._cached_values[key] = value
         self._db[key] = value
 
     def __delitem__(self, key: bytes) -> None:
-        if key in self._cached_values:
-            del self._cached_values[key]
+        self._cached_values.pop(key)
         del self._db[key]
+
+
+class CacheInfo(NamedTuple('CacheInfo', [
+    ('hits', int),
+    ('misses', int),
+    ('maxsize', int),
+    ('currsize', int),
+])):
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        else:
+            return self.hits / lookups
+
+
+class _CacheStripe:
+    __slots__ = ['lock', 'values', 'hits', 'misses']
+
+    def __init__(self, cache_size: int) -> None:
+        self.lock = threading.Lock()
+        self.values = LRU(cache_size)  # type: LRU[Hashable, Any]
+        self.hits = 0
+        self.misses = 0
+
+
+class ObjectCache:
+    """
+    A bounded LRU mapping from keys to already-decoded objects, which keeps count
+    of its hits and misses.
+
+    Only use this for values which can never change for a given key, like objects
+    that are looked up by their own hash.
+
+    It is safe to use from many threads at once.  The keys are spread over ``stripes``
+    separately locked LRU mappings, which each hold their share of ``cache_size``, so
+    the least recently used key of its stripe is evicted rather than of the whole cache.
+    """
+    def __init__(self, cache_size: int, stripes: int=DEFAULT_CACHE_STRIPES) -> None:
+        self._cache_size = cache_size
+        self._num_stripes = max(1, min(stripes, cache_size))
+        self.clear()
+
+    @property
+    def size(self) -> int:
+        return self._cache_size
+
+    def clear(self) -> None:
+        stripe_size, remainder = divmod(self._cache_size, self._num_stripes)
+        self._stripes = tuple(
+            _CacheStripe(stripe_size + 1 if index < remainder else stripe_size)
+            for index in range(self._num_stripes)
+        )
+
+    def _get_stripe(self, key: Hashable) -> _CacheStripe:
+        stripes = self._stripes
+        return stripes[hash(key) % len(stripes)]
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            try:
+                value = stripe.values[key]
+            except KeyError:
+                stripe.misses += 1
+                return default
+            else:
+                stripe.hits += 1
+                return value
+
+    def pop(self, key: Hashable, default: Any=None) -> Any:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            return stripe.values.pop(key, default)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            stripe.values[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        stripe = self._get_stripe(key)
+        with stripe.lock:
+            return key in stripe.values
+
+    def __len__(self) -> int:
+        return sum(len(stripe.values) for stripe in self._stripes)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return the lookup statistics, in the style of :func:`functools.lru_cache`
+        """
+        stripes = self._stripes
+        return CacheInfo(
+            sum(stripe.hits for stripe in stripes),
+            sum(stripe.misses for stripe in stripes),
+            self._cache_size,
+            sum(len(stripe.values) for stripe in stripes),
+        )
+
+
+# Marks a key that is missing from a cache
+_MISSING = object()
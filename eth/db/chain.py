@@ -1,4 +1,3 @@
-import functools
 import itertools
 
 from abc import (
@@ -8,12 +7,16 @@ from typing import (
     Dict,
     Iterable,
     List,
+    NamedTuple,
+    Optional,
+    Sequence,
     Tuple,
     Type,
     TYPE_CHECKING,
 )
 
 from eth_typing import (
+    Address,
     BlockNumber,
     Hash32
 )
@@ -31,18 +34,44 @@ from eth.exceptions import (
     ReceiptNotFound,
     TransactionNotFound,
 )
-from eth.db.header import BaseHeaderDB, HeaderDB
+from eth.db.bloom_bits import (
+    bloom_matches,
+    forget_bloom_bits_start,
+    get_first_indexed_block_number,
+    get_matching_block_numbers,
+    update_bloom_bits,
+)
+from eth.db.header import (
+    AsyncHeaderDB,
+    BaseHeaderDB,
+    DEFAULT_CANONICAL_HASH_RING_SIZE,
+    DEFAULT_HEADER_CACHE_SIZE,
+    HeaderDB,
+)
 from eth.db.backends.base import (
     BaseAtomicDB,
     BaseDB,
 )
+from eth.db.cache import (
+    ObjectCache,
+)
 from eth.db.schema import SchemaV1
+from eth.rlp.codecs import (
+    fast_decode,
+    fast_encode,
+)
 from eth.rlp.headers import (
     BlockHeader,
 )
+from eth.rlp.logs import (
+    Log,
+)
 from eth.rlp.receipts import (
     Receipt
 )
+from eth.rlp.sedes import (
+    uint32,
+)
 from eth.validation import (
     validate_word,
 )
@@ -65,6 +94,10 @@ if TYPE_CHECKING:
     )
 
 
+# How many blocks' worth of decoded transactions are kept around
+BLOCK_TRANSACTIONS_CACHE_SIZE = 32
+
+
 class TransactionKey(rlp.Serializable):
     fields = [
         ('block_number', rlp.sedes.big_endian_int),
@@ -72,6 +105,21 @@ class TransactionKey(rlp.Serializable):
     ]
 
 
+class BlockLog(NamedTuple('BlockLog', [
+    ('block_number', BlockNumber),
+    ('block_hash', Hash32),
+    ('transaction_index', int),
+    ('transaction_hash', Hash32),
+    ('log_index', int),
+    ('log', Log),
+])):
+    """
+    A log of a canonical block, and where in the chain it was emitted.  The ``log_index``
+    counts all of the logs of the block, not only the ones of its transaction.
+    """
+    pass
+
+
 class BaseChainDB(BaseHeaderDB):
     db = None  # type: BaseAtomicDB
 
@@ -86,6 +134,10 @@ class BaseChainDB(BaseHeaderDB):
     def get_block_uncles(self, uncles_hash: Hash32) -> List[BlockHeader]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def get_block_uncle_data(self, uncles_hash: Hash32) -> bytes:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Block API
     #
@@ -114,6 +166,16 @@ class BaseChainDB(BaseHeaderDB):
                         index_key: int, transaction: 'BaseTransaction') -> Hash32:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def persist_transaction_list(self,
+                                 transaction_root: Hash32,
+                                 transactions: Sequence['BaseTransaction']) -> None:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
+    @abstractmethod
+    def persist_receipt_list(self, receipt_root: Hash32, receipts: Sequence[Receipt]) -> None:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     @abstractmethod
     def get_block_transactions(
             self,
@@ -121,6 +183,10 @@ class BaseChainDB(BaseHeaderDB):
             transaction_class: Type['BaseTransaction']) -> Iterable['BaseTransaction']:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def get_block_transaction_data(self, block_header: BlockHeader) -> Tuple[bytes, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     @abstractmethod
     def get_block_transaction_hashes(self, block_header: BlockHeader) -> Iterable[Hash32]:
         raise NotImplementedError("ChainDB classes must implement this method")
@@ -149,6 +215,17 @@ class BaseChainDB(BaseHeaderDB):
     def get_transaction_index(self, transaction_hash: Hash32) -> Tuple[BlockNumber, int]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    #
+    # Log API
+    #
+    @abstractmethod
+    def get_logs(self,
+                 from_block: BlockNumber,
+                 to_block: BlockNumber,
+                 addresses: Sequence[Address]=None,
+                 topics: Sequence[Optional[Sequence[int]]]=None) -> Tuple[BlockLog, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Raw Database API
     #
@@ -166,8 +243,29 @@ class BaseChainDB(BaseHeaderDB):
 
 
 class ChainDB(HeaderDB, BaseChainDB):
-    def __init__(self, db: BaseAtomicDB) -> None:
-        self.db = db
+    def __init__(self,
+                 db: BaseAtomicDB,
+                 header_cache_size: int=DEFAULT_HEADER_CACHE_SIZE,
+                 canonical_hash_ring_size: int=DEFAULT_CANONICAL_HASH_RING_SIZE,
+                 ancestor_index: bool=True,
+                 flat_block_bodies: bool=False,
+                 bloom_bits_index: bool=True) -> None:
+        """
+        :param flat_block_bodies: whether to also store the transactions and receipts of each
+            block as a single RLP list, so that reading them all back is a single database
+            lookup instead of a walk through their trie.  The tries are stored either way,
+            and are still needed for proofs.
+        :param bloom_bits_index: whether to keep an index of the blooms of the canonical
+            headers by bloom bit, see :mod:`eth.db.bloom_bits`, which :meth:`get_logs` uses to
+            find the blocks that may have matching logs.  Without it, :meth:`get_logs` checks
+            the bloom of every header in the range.  It also checks the blooms of the headers
+            that became canonical while there was no index, for instance in an earlier
+            version, or while the index was turned off.
+        """
+        super().__init__(db, header_cache_size, canonical_hash_ring_size, ancestor_index)
+        self._stores_flat_block_bodies = flat_block_bodies
+        self._has_bloom_bits_index = bloom_bits_index
+        self._block_transactions_cache = ObjectCache(BLOCK_TRANSACTIONS_CACHE_SIZE)
 
     #
     # Header API
@@ -179,49 +277,69 @@ class ChainDB(HeaderDB, BaseChainDB):
         validate_word(uncles_hash, title="Uncles Hash")
         if uncles_hash == EMPTY_UNCLE_HASH:
             return []
+        encoded_uncles = self.get_block_uncle_data(uncles_hash)
+        return rlp.decode(encoded_uncles, sedes=rlp.sedes.CountableList(BlockHeader))
+
+    def get_block_uncle_data(self, uncles_hash: Hash32) -> bytes:
+        """
+        Returns the RLP encoded list of uncle headers specified by the given uncles_hash,
+        without decoding it.
+        """
+        validate_word(uncles_hash, title="Uncles Hash")
+        if uncles_hash == EMPTY_UNCLE_HASH:
+            return rlp.encode([])
         try:
-            encoded_uncles = self.db[uncles_hash]
+            return self.db[uncles_hash]
         except KeyError:
             raise HeaderNotFound(
                 "No uncles found for hash {0}".format(uncles_hash)
             )
-        else:
-            return rlp.decode(encoded_uncles, sedes=rlp.sedes.CountableList(BlockHeader))
 
-    @classmethod
-    def _set_as_canonical_chain_head(cls,
+    def _set_as_canonical_chain_head(self,
                                      db: BaseDB,
                                      block_hash: Hash32,
                                      ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
         try:
-            header = cls._get_block_header_by_hash(db, block_hash)
+            header = self._get_cached_block_header_by_hash(db, block_hash)
         except HeaderNotFound:
             raise ValueError("Cannot use unknown block hash as canonical head: {}".format(
                 header.hash))
 
-        new_canonical_headers = tuple(reversed(cls._find_new_ancestors(db, header)))
+        new_canonical_headers = tuple(reversed(self._find_new_ancestors(db, header)))
         old_canonical_headers = []
 
         # remove transaction lookups for blocks that are no longer canonical
         for h in new_canonical_headers:
             try:
-                old_hash = cls._get_canonical_block_hash(db, h.block_number)
+                old_hash = self._get_canonical_block_hash(db, h.block_number)
             except HeaderNotFound:
                 # no old block, and no more possible
                 break
             else:
-                old_header = cls._get_block_header_by_hash(db, old_hash)
+                old_header = self._get_cached_block_header_by_hash(db, old_hash)
                 old_canonical_headers.append(old_header)
-                for transaction_hash in cls._get_block_transaction_hashes(db, old_header):
-                    cls._remove_transaction_from_canonical_chain(db, transaction_hash)
+                for transaction_hash in self._get_block_transaction_hashes(db, old_header):
+                    self._remove_transaction_from_canonical_chain(db, transaction_hash)
 
         for h in new_canonical_headers:
-            cls._add_block_number_to_hash_lookup(db, h)
+            self._add_block_number_to_hash_lookup(db, h)
 
         db.set(SchemaV1.make_canonical_head_hash_lookup_key(), header.hash)
 
         return new_canonical_headers, tuple(old_canonical_headers)
 
+    def _persist_header_chain(
+            self,
+            db: BaseDB,
+            headers: Iterable[BlockHeader]
+    ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
+        new_canonical_headers, old_canonical_headers = super()._persist_header_chain(db, headers)
+        if self._has_bloom_bits_index:
+            update_bloom_bits(db, new_canonical_headers, old_canonical_headers)
+        elif new_canonical_headers:
+            forget_bloom_bits_start(db)
+        return new_canonical_headers, old_canonical_headers
+
     #
     # Block API
     #
@@ -234,15 +352,24 @@ class ChainDB(HeaderDB, BaseChainDB):
         Assumes all block transactions have been persisted already.
         """
         with self.db.atomic_batch() as db:
-            return self._persist_block(db, block)
+            new_canonical_hashes, old_canonical_hashes = self._persist_block(db, block)
+
+        self._cache_block_headers((block.header,))
+        if new_canonical_hashes == (block.hash,):
+            self._record_canonical_headers((block.header,))
+        else:
+            self._record_canonical_headers(tuple(
+                self.get_block_header_by_hash(block_hash)
+                for block_hash in new_canonical_hashes
+            ))
+        return new_canonical_hashes, old_canonical_hashes
 
-    @classmethod
     def _persist_block(
-            cls,
+            self,
             db: 'BaseDB',
             block: 'BaseBlock') -> Tuple[Tuple[Hash32, ...], Tuple[Hash32, ...]]:
         header_chain = (block.header, )
-        new_canonical_headers, old_canonical_headers = cls._persist_header_chain(db, header_chain)
+        new_canonical_headers, old_canonical_headers = self._persist_header_chain(db, header_chain)
 
         for header in new_canonical_headers:
             if header.hash == block.hash:
@@ -251,13 +378,13 @@ class ChainDB(HeaderDB, BaseChainDB):
                 # is specially important during a fast sync.
                 tx_hashes = [tx.hash for tx in block.transactions]
             else:
-                tx_hashes = cls._get_block_transaction_hashes(db, header)
+                tx_hashes = self._get_block_transaction_hashes(db, header)
 
             for index, transaction_hash in enumerate(tx_hashes):
-                cls._add_transaction_to_canonical_chain(db, transaction_hash, header, index)
+                self._add_transaction_to_canonical_chain(db, transaction_hash, header, index)
 
         if block.uncles:
-            uncles_hash = cls._persist_uncles(db, block.uncles)
+            uncles_hash = self._persist_uncles(db, block.uncles)
         else:
             uncles_hash = EMPTY_UNCLE_HASH
         if uncles_hash != block.header.uncles_hash:
@@ -296,7 +423,7 @@ class ChainDB(HeaderDB, BaseChainDB):
         Returns the updated `receipts_root` for updated block header.
         """
         receipt_db = HexaryTrie(db=self.db, root_hash=block_header.receipt_root)
-        receipt_db[index_key] = rlp.encode(receipt)
+        receipt_db[index_key] = fast_encode(receipt)
         return receipt_db.root_hash
 
     def add_transaction(self,
@@ -309,9 +436,41 @@ class ChainDB(HeaderDB, BaseChainDB):
         Returns the updated `transactions_root` for updated block header.
         """
         transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
-        transaction_db[index_key] = rlp.encode(transaction)
+        transaction_db[index_key] = fast_encode(transaction)
         return transaction_db.root_hash
 
+    def persist_transaction_list(self,
+                                 transaction_root: Hash32,
+                                 transactions: Sequence['BaseTransaction']) -> None:
+        """
+        Stores all of the transactions with the given root as one list, if this ChainDB keeps
+        flat block bodies.  The nodes of the transaction trie are not persisted by this.
+        """
+        if self._stores_flat_block_bodies:
+            self._persist_flat_item_data(
+                self.db,
+                SchemaV1.make_transaction_root_to_transactions_lookup_key(transaction_root),
+                transactions,
+            )
+
+    def persist_receipt_list(self, receipt_root: Hash32, receipts: Sequence[Receipt]) -> None:
+        """
+        Stores all of the receipts with the given root as one list, if this ChainDB keeps
+        flat block bodies.  The nodes of the receipt trie are not persisted by this.
+        """
+        if self._stores_flat_block_bodies:
+            self._persist_flat_item_data(
+                self.db,
+                SchemaV1.make_receipt_root_to_receipts_lookup_key(receipt_root),
+                receipts,
+            )
+
+    @staticmethod
+    def _persist_flat_item_data(db: BaseDB,
+                                lookup_key: bytes,
+                                items: Sequence[rlp.Serializable]) -> None:
+        db.set(lookup_key, rlp.encode(tuple(fast_encode(item) for item in items)))
+
     def get_block_transactions(
             self,
             header: BlockHeader,
@@ -322,6 +481,13 @@ class ChainDB(HeaderDB, BaseChainDB):
         """
         return self._get_block_transactions(header.transaction_root, transaction_class)
 
+    def get_block_transaction_data(self, block_header: BlockHeader) -> Tuple[bytes, ...]:
+        """
+        Returns the encoded transactions of the block specified by the given block header,
+        without decoding them.
+        """
+        return tuple(self._get_block_transaction_data(self.db, block_header.transaction_root))
+
     def get_block_transaction_hashes(self, block_header: BlockHeader) -> Iterable[Hash32]:
         """
         Returns an iterable of the transaction hashes from the block specified
@@ -350,14 +516,8 @@ class ChainDB(HeaderDB, BaseChainDB):
         Returns an iterable of receipts for the block specified by the given
         block header.
         """
-        receipt_db = HexaryTrie(db=self.db, root_hash=header.receipt_root)
-        for receipt_idx in itertools.count():
-            receipt_key = rlp.encode(receipt_idx)
-            if receipt_key in receipt_db:
-                receipt_data = receipt_db[receipt_key]
-                yield rlp.decode(receipt_data, sedes=receipt_class)
-            else:
-                break
+        for receipt_data in self._get_block_receipt_data(self.db, header.receipt_root):
+            yield fast_decode(receipt_data, receipt_class)
 
     def get_transaction_by_index(
             self,
@@ -374,11 +534,16 @@ class ChainDB(HeaderDB, BaseChainDB):
             block_header = self.get_canonical_block_header_by_number(block_number)
         except HeaderNotFound:
             raise TransactionNotFound("Block {} is not in the canonical chain".format(block_number))
-        transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
-        encoded_index = rlp.encode(transaction_index)
-        if encoded_index in transaction_db:
-            encoded_transaction = transaction_db[encoded_index]
-            return rlp.decode(encoded_transaction, sedes=transaction_class)
+        encoded_transaction = self._get_item_data_by_index(
+            self.db,
+            SchemaV1.make_transaction_root_to_transactions_lookup_key(
+                block_header.transaction_root
+            ),
+            block_header.transaction_root,
+            transaction_index,
+        )
+        if encoded_transaction is not None:
+            return fast_decode(encoded_transaction, transaction_class)
         else:
             raise TransactionNotFound(
                 "No transaction is at index {} of block {}".format(transaction_index, block_number))
@@ -414,39 +579,115 @@ class ChainDB(HeaderDB, BaseChainDB):
         except HeaderNotFound:
             raise ReceiptNotFound("Block {} is not in the canonical chain".format(block_number))
 
-        receipt_db = HexaryTrie(db=self.db, root_hash=block_header.receipt_root)
-        receipt_key = rlp.encode(receipt_index)
-        if receipt_key in receipt_db:
-            receipt_data = receipt_db[receipt_key]
-            return rlp.decode(receipt_data, sedes=Receipt)
+        receipt_data = self._get_item_data_by_index(
+            self.db,
+            SchemaV1.make_receipt_root_to_receipts_lookup_key(block_header.receipt_root),
+            block_header.receipt_root,
+            receipt_index,
+        )
+        if receipt_data is not None:
+            return fast_decode(receipt_data, Receipt)
         else:
             raise ReceiptNotFound(
                 "Receipt with index {} not found in block".format(receipt_index))
 
-    @staticmethod
-    def _get_block_transaction_data(db: BaseDB, transaction_root: Hash32) -> Iterable[Hash32]:
+    @classmethod
+    def _get_block_transaction_data(cls, db: BaseDB, transaction_root: Hash32) -> Iterable[bytes]:
         """
         Returns iterable of the encoded transactions for the given block header
         """
-        transaction_db = HexaryTrie(db, root_hash=transaction_root)
-        for transaction_idx in itertools.count():
-            transaction_key = rlp.encode(transaction_idx)
-            if transaction_key in transaction_db:
-                yield transaction_db[transaction_key]
+        return cls._get_block_item_data(
+            db,
+            SchemaV1.make_transaction_root_to_transactions_lookup_key(transaction_root),
+            transaction_root,
+        )
+
+    @classmethod
+    def _get_block_receipt_data(cls, db: BaseDB, receipt_root: Hash32) -> Iterable[bytes]:
+        """
+        Returns iterable of the encoded receipts for the given block header
+        """
+        return cls._get_block_item_data(
+            db,
+            SchemaV1.make_receipt_root_to_receipts_lookup_key(receipt_root),
+            receipt_root,
+        )
+
+    @classmethod
+    def _get_block_item_data(cls,
+                             db: BaseDB,
+                             flat_lookup_key: bytes,
+                             trie_root: Hash32) -> Iterable[bytes]:
+        """
+        Returns the encoded items of a transaction or receipt trie, from the flat list if
+        one was stored.
+        """
+        all_item_data = cls._get_flat_item_data(db, flat_lookup_key)
+        if all_item_data is not None:
+            return all_item_data
+        else:
+            return cls._get_trie_item_data(db, trie_root)
+
+    @classmethod
+    def _get_item_data_by_index(cls,
+                                db: BaseDB,
+                                flat_lookup_key: bytes,
+                                trie_root: Hash32,
+                                index: int) -> bytes:
+        """
+        Returns the encoded item at the given index of a transaction or receipt trie, or None
+        if there is no such item.
+        """
+        all_item_data = cls._get_flat_item_data(db, flat_lookup_key)
+        if all_item_data is not None:
+            if 0 <= index < len(all_item_data):
+                return all_item_data[index]
+            else:
+                return None
+
+        item_db = HexaryTrie(db, root_hash=trie_root)
+        item_key = rlp.encode(index)
+        if item_key in item_db:
+            return item_db[item_key]
+        else:
+            return None
+
+    @staticmethod
+    def _get_flat_item_data(db: BaseDB, flat_lookup_key: bytes) -> Tuple[bytes, ...]:
+        try:
+            encoded_items = db[flat_lookup_key]
+        except KeyError:
+            return None
+        else:
+            return tuple(rlp.decode(encoded_items, sedes=rlp.sedes.CountableList(rlp.sedes.binary)))
+
+    @staticmethod
+    def _get_trie_item_data(db: BaseDB, trie_root: Hash32) -> Iterable[bytes]:
+        item_db = HexaryTrie(db, root_hash=trie_root)
+        for item_idx in itertools.count():
+            item_key = rlp.encode(item_idx)
+            if item_key in item_db:
+                yield item_db[item_key]
             else:
                 break
 
-    @functools.lru_cache(maxsize=32)
-    @to_list
     def _get_block_transactions(
             self,
             transaction_root: Hash32,
-            transaction_class: Type['BaseTransaction']) -> Iterable['BaseTransaction']:
+            transaction_class: Type['BaseTransaction']) -> List['BaseTransaction']:
         """
-        Memoizable version of `get_block_transactions`
+        Memoized version of `get_block_transactions`
         """
-        for encoded_transaction in self._get_block_transaction_data(self.db, transaction_root):
-            yield rlp.decode(encoded_transaction, sedes=transaction_class)
+        key = (transaction_root, transaction_class)
+        transactions = self._block_transactions_cache.get(key)
+        if transactions is None:
+            transactions = [
+                fast_decode(encoded_transaction, transaction_class)
+                for encoded_transaction
+                in self._get_block_transaction_data(self.db, transaction_root)
+            ]
+            self._block_transactions_cache[key] = transactions
+        return transactions
 
     @staticmethod
     def _remove_transaction_from_canonical_chain(db: BaseDB, transaction_hash: Hash32) -> None:
@@ -474,6 +715,83 @@ class ChainDB(HeaderDB, BaseChainDB):
             rlp.encode(transaction_key),
         )
 
+    #
+    # Log API
+    #
+    @to_tuple
+    def get_logs(self,
+                 from_block: BlockNumber,
+                 to_block: BlockNumber,
+                 addresses: Sequence[Address]=None,
+                 topics: Sequence[Optional[Sequence[int]]]=None) -> Iterable[BlockLog]:
+        """
+        Returns the logs of the canonical blocks from ``from_block`` up to and including
+        ``to_block``, in the order they were emitted.
+
+        :param addresses: the addresses that may have emitted the logs, or None for any
+        :param topics: the topics that each position may have, with None for any.  Logs with
+            fewer topics than there are positions don't match.
+
+        Only the receipts of the blocks whose bloom may contain the addresses and topics are
+        decoded.
+        """
+        address_filter = tuple(addresses or ())
+        topic_filter = tuple(tuple(position or ()) for position in topics or ())
+
+        # the values of which the bloom of a block must contain at least one
+        conditions = []  # type: List[Tuple[bytes, ...]]
+        if address_filter:
+            conditions.append(address_filter)
+        for position in topic_filter:
+            if position:
+                conditions.append(tuple(uint32.serialize(topic) for topic in position))
+
+        head_number = self.get_canonical_head().block_number
+        to_block = BlockNumber(min(to_block, head_number))
+        if self._has_bloom_bits_index:
+            first_indexed = get_first_indexed_block_number(self.db)
+        else:
+            first_indexed = None
+        if first_indexed is None:
+            # nothing is in the index, so the bloom of every header is checked
+            first_indexed = BlockNumber(to_block + 1)
+
+        block_numbers = itertools.chain(
+            (BlockNumber(number) for number in range(from_block, min(first_indexed, to_block + 1))),
+            get_matching_block_numbers(
+                self.db,
+                BlockNumber(max(from_block, first_indexed)),
+                to_block,
+                conditions,
+            ),
+        )
+
+        for block_number in block_numbers:
+            header = self.get_canonical_block_header_by_number(block_number)
+            if bloom_matches(header.bloom, conditions):
+                yield from self._get_block_logs(header, address_filter, topic_filter)
+
+    def _get_block_logs(self,
+                        header: BlockHeader,
+                        addresses: Tuple[Address, ...],
+                        topics: Tuple[Tuple[int, ...], ...]) -> Iterable[BlockLog]:
+        transaction_hashes = None  # type: List[Hash32]
+        log_index = 0
+        for transaction_index, receipt in enumerate(self.get_receipts(header, Receipt)):
+            for log in receipt.logs:
+                if _log_matches(log, addresses, topics):
+                    if transaction_hashes is None:
+                        transaction_hashes = self._get_block_transaction_hashes(self.db, header)
+                    yield BlockLog(
+                        header.block_number,
+                        header.hash,
+                        transaction_index,
+                        transaction_hashes[transaction_index],
+                        log_index,
+                        log,
+                    )
+                log_index += 1
+
     #
     # Raw Database API
     #
@@ -496,3 +814,120 @@ class ChainDB(HeaderDB, BaseChainDB):
         with self.db.atomic_batch() as db:
             for key, value in trie_data_dict.items():
                 db[key] = value
+
+
+class AsyncChainDB(AsyncHeaderDB, ChainDB):
+    """
+    A :class:`ChainDB` with coroutine versions of its methods for block bodies, receipts
+    and transactions, which share the thread pool, lookup coalescing and write queue of
+    :class:`~eth.db.header.AsyncHeaderDB`.
+    """
+    #
+    # Header API
+    #
+    async def coro_get_block_uncles(self, uncles_hash: Hash32) -> List[BlockHeader]:
+        return await self._run_lookup(self.get_block_uncles, uncles_hash)
+
+    async def coro_persist_block(
+            self,
+            block: 'BaseBlock') -> Tuple[Tuple[Hash32, ...], Tuple[Hash32, ...]]:
+        return await self._run_write(self.persist_block, block)
+
+    async def coro_persist_uncles(self, uncles: Tuple[BlockHeader]) -> Hash32:
+        return await self._run_write(self.persist_uncles, uncles)
+
+    #
+    # Transaction API
+    #
+    async def coro_persist_transaction_list(
+            self,
+            transaction_root: Hash32,
+            transactions: Sequence['BaseTransaction']) -> None:
+        await self._run_write(self.persist_transaction_list, transaction_root, transactions)
+
+    async def coro_persist_receipt_list(self,
+                                        receipt_root: Hash32,
+                                        receipts: Sequence[Receipt]) -> None:
+        await self._run_write(self.persist_receipt_list, receipt_root, receipts)
+
+    async def coro_get_block_transactions(
+            self,
+            header: BlockHeader,
+            transaction_class: Type['BaseTransaction']) -> Iterable['BaseTransaction']:
+        return await self._run_lookup(self.get_block_transactions, header, transaction_class)
+
+    async def coro_get_block_transaction_hashes(
+            self,
+            block_header: BlockHeader) -> Iterable[Hash32]:
+        return await self._run_lookup(self.get_block_transaction_hashes, block_header)
+
+    async def coro_get_receipts(self,
+                                header: BlockHeader,
+                                receipt_class: Type[Receipt]) -> Iterable[Receipt]:
+        return await self._run_lookup(self.get_receipts, header, receipt_class)
+
+    async def coro_get_transaction_by_index(
+            self,
+            block_number: BlockNumber,
+            transaction_index: int,
+            transaction_class: Type['BaseTransaction']) -> 'BaseTransaction':
+        return await self._run_lookup(
+            self.get_transaction_by_index,
+            block_number,
+            transaction_index,
+            transaction_class,
+        )
+
+    async def coro_get_transaction_index(
+            self,
+            transaction_hash: Hash32) -> Tuple[BlockNumber, int]:
+        return await self._run_lookup(self.get_transaction_index, transaction_hash)
+
+    async def coro_get_receipt_by_index(self,
+                                        block_number: BlockNumber,
+                                        receipt_index: int) -> Receipt:
+        return await self._run_lookup(self.get_receipt_by_index, block_number, receipt_index)
+
+    #
+    # Log API
+    #
+    async def coro_get_logs(self,
+                            from_block: BlockNumber,
+                            to_block: BlockNumber,
+                            addresses: Sequence[Address]=None,
+                            topics: Sequence[Optional[Sequence[int]]]=None) -> Tuple[BlockLog, ...]:
+        return await self._run_lookup(
+            self.get_logs,
+            from_block,
+            to_block,
+            # the arguments of lookups need to be hashable
+            tuple(addresses or ()),
+            tuple(tuple(position or ()) for position in topics or ()),
+        )
+
+    #
+    # Raw Database API
+    #
+    async def coro_exists(self, key: bytes) -> bool:
+        return await self._run_lookup(self.exists, key)
+
+    async def coro_get(self, key: bytes) -> bytes:
+        return await self._run_lookup(self.get, key)
+
+    async def coro_persist_trie_data_dict(self, trie_data_dict: Dict[Hash32, bytes]) -> None:
+        await self._run_write(self.persist_trie_data_dict, trie_data_dict)
+
+
+def _log_matches(log: Log,
+                 addresses: Tuple[Address, ...],
+                 topics: Tuple[Tuple[int, ...], ...]) -> bool:
+    if addresses and log.address not in addresses:
+        return False
+    elif len(log.topics) < len(topics):
+        return False
+    else:
+        return all(
+            not position or topic in position
+            for position, topic
+            in zip(topics, log.topics)
+        )
@@ -1,12 +1,31 @@
 from abc import ABC, abstractmethod
+import asyncio
+import collections
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
 import functools
-from typing import Iterable, Tuple
+import itertools
+import threading
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import rlp
 
 from eth_utils.toolz import (
-    concat,
-    first,
     sliding_window,
 )
 
@@ -23,6 +42,7 @@ from eth_typing import (
 
 from eth.constants import (
     GENESIS_PARENT_HASH,
+    MAX_PREV_HEADER_DEPTH,
 )
 from eth.exceptions import (
     CanonicalHeadNotFound,
@@ -33,7 +53,15 @@ from eth.db.backends.base import (
     BaseAtomicDB,
     BaseDB,
 )
+from eth.db.cache import (
+    CacheInfo,
+    ObjectCache,
+)
 from eth.db.schema import SchemaV1
+from eth.rlp.codecs import (
+    fast_decode,
+    fast_encode,
+)
 from eth.rlp.headers import BlockHeader
 from eth.validation import (
     validate_block_number,
@@ -62,6 +90,12 @@ class BaseHeaderDB(ABC):
     def get_canonical_head(self) -> BlockHeader:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def get_recent_canonical_hashes(self,
+                                    block_hash: Hash32,
+                                    max_count: int) -> Tuple[Hash32, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Header API
     #
@@ -69,6 +103,10 @@ class BaseHeaderDB(ABC):
     def get_block_header_by_hash(self, block_hash: Hash32) -> BlockHeader:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    def get_ancestor_hash(self, block_hash: Hash32, ancestor_number: BlockNumber) -> Hash32:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     @abstractmethod
     def get_score(self, block_hash: Hash32) -> int:
         raise NotImplementedError("ChainDB classes must implement this method")
@@ -90,7 +128,152 @@ class BaseHeaderDB(ABC):
         raise NotImplementedError("ChainDB classes must implement this method")
 
 
+# When performing a chain sync (either fast or regular modes), we'll very often need to look
+# up recent block headers to validate the chain, to build the list of previous block hashes
+# for each VM and to find the fork point when the canonical head changes. Decoding their RLP
+# representation is relatively expensive, so we keep recently used headers around, keyed
+# by their hash. We *should* only be looking up recent blocks, so the cache is kept small.
+DEFAULT_HEADER_CACHE_SIZE = 2048
+
+# Enough to serve the previous hashes of blocks built on top of any of the latest canonical
+# blocks, with room to spare for building on blocks slightly behind the head.
+DEFAULT_CANONICAL_HASH_RING_SIZE = MAX_PREV_HEADER_DEPTH * 4
+
+# The number of threads that run the lookups and writes of an async database by default
+DEFAULT_ASYNC_DB_WORKERS = 4
+
+TReturn = TypeVar('TReturn')
+
+
+class CanonicalHashRing:
+    """
+    The hashes of the most recent blocks of the canonical chain, in block number order.
+
+    The hashes held are always a contiguous run of the canonical chain ending at the
+    canonical head, so the ancestors of any block in the ring are also in the ring.
+
+    It is safe to use from many threads at once.
+    """
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._hashes = collections.deque()  # type: Deque[Hash32]
+        self._block_numbers = {}  # type: Dict[Hash32, BlockNumber]
+        self._lowest_block_number = None  # type: BlockNumber
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, block_hash: Hash32) -> bool:
+        return block_hash in self._block_numbers
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def set_canonical_headers(self, headers: Sequence[BlockHeader]) -> None:
+        """
+        Record the given headers as the new tip of the canonical chain.
+
+        ``headers`` must be a contiguous chain in ascending block number order.
+        """
+        if headers:
+            self.set_canonical_hashes(
+                headers[0].block_number,
+                tuple(header.hash for header in headers),
+                parent_hash=headers[0].parent_hash,
+            )
+
+    def set_canonical_hashes(self,
+                             first_block_number: BlockNumber,
+                             block_hashes: Sequence[Hash32],
+                             parent_hash: Hash32=None) -> None:
+        """
+        Record the given hashes as the new tip of the canonical chain.
+
+        ``block_hashes`` must be a contiguous chain in ascending block number order, starting
+        at ``first_block_number``.  If ``parent_hash`` is the hash recorded just below that
+        height, anything recorded at or above it is discarded, which both applies reorgs and
+        forgets blocks beyond a shorter new head.  Otherwise the ring starts over.
+        """
+        if not block_hashes:
+            return
+
+        with self._lock:
+            if parent_hash is not None and self._extends_to(first_block_number, parent_hash):
+                head_number = self._lowest_block_number + len(self._hashes) - 1
+                for _ in range(head_number - first_block_number + 1):
+                    del self._block_numbers[self._hashes.pop()]
+            else:
+                self._clear()
+                self._lowest_block_number = first_block_number
+
+            for block_number, block_hash in enumerate(block_hashes, first_block_number):
+                self._hashes.append(block_hash)
+                self._block_numbers[block_hash] = BlockNumber(block_number)
+
+            while len(self._hashes) > self._size:
+                del self._block_numbers[self._hashes.popleft()]
+                self._lowest_block_number = BlockNumber(self._lowest_block_number + 1)
+
+    def _extends_to(self, block_number: BlockNumber, parent_hash: Hash32) -> bool:
+        try:
+            parent_number = self._block_numbers[parent_hash]
+        except KeyError:
+            return False
+        else:
+            return parent_number == block_number - 1
+
+    def get_ancestor_hashes(self, block_hash: Hash32, max_count: int) -> Tuple[Hash32, ...]:
+        """
+        Return ``block_hash`` followed by the hashes of its ancestors, newest first, up to
+        ``max_count`` hashes in total or until genesis.
+
+        Returns an empty tuple if ``block_hash`` is not in the ring, or if the ring doesn't
+        reach far enough back to return all of the requested hashes.
+        """
+        with self._lock:
+            try:
+                block_number = self._block_numbers[block_hash]
+            except KeyError:
+                return tuple()
+
+            count = min(max_count, block_number + 1)
+            if block_number - count + 1 < self._lowest_block_number:
+                return tuple()
+
+            newest_offset = len(self._hashes) - 1 - (block_number - self._lowest_block_number)
+            return tuple(
+                itertools.islice(reversed(self._hashes), newest_offset, newest_offset + count)
+            )
+
+
 class HeaderDB(BaseHeaderDB):
+    def __init__(self,
+                 db: BaseAtomicDB,
+                 header_cache_size: int=DEFAULT_HEADER_CACHE_SIZE,
+                 canonical_hash_ring_size: int=DEFAULT_CANONICAL_HASH_RING_SIZE,
+                 ancestor_index: bool=True) -> None:
+        """
+        :param ancestor_index: whether to write a skip pointer for every persisted header, which
+            lets ancestors and fork points be found in a logarithmic number of lookups rather
+            than by walking the headers one by one.  Headers persisted without one, for
+            instance by an earlier version, are simply walked over.
+        """
+        self.db = db
+        self._header_cache = ObjectCache(header_cache_size)
+        self._canonical_hashes = CanonicalHashRing(canonical_hash_ring_size)
+        # keeps the ring from being seeded with an older head than was just recorded
+        self._canonical_hashes_lock = threading.RLock()
+        self._has_ancestor_index = ancestor_index
+
     #
     # Canonical Chain API
     #
@@ -126,14 +309,13 @@ class HeaderDB(BaseHeaderDB):
         """
         return self._get_canonical_block_header_by_number(self.db, block_number)
 
-    @classmethod
     def _get_canonical_block_header_by_number(
-            cls,
+            self,
             db: BaseDB,
             block_number: BlockNumber) -> BlockHeader:
         validate_block_number(block_number)
-        canonical_block_hash = cls._get_canonical_block_hash(db, block_number)
-        return cls._get_block_header_by_hash(db, canonical_block_hash)
+        canonical_block_hash = self._get_canonical_block_hash(db, block_number)
+        return self._get_cached_block_header_by_hash(db, canonical_block_hash)
 
     def get_canonical_head(self) -> BlockHeader:
         """
@@ -141,19 +323,96 @@ class HeaderDB(BaseHeaderDB):
         """
         return self._get_canonical_head(self.db)
 
-    @classmethod
-    def _get_canonical_head(cls, db: BaseDB) -> BlockHeader:
+    def _get_canonical_head(self, db: BaseDB) -> BlockHeader:
         try:
             canonical_head_hash = db[SchemaV1.make_canonical_head_hash_lookup_key()]
         except KeyError:
             raise CanonicalHeadNotFound("No canonical head set for this chain")
-        return cls._get_block_header_by_hash(db, Hash32(canonical_head_hash))
+        return self._get_cached_block_header_by_hash(db, Hash32(canonical_head_hash))
+
+    def get_recent_canonical_hashes(self,
+                                    block_hash: Hash32,
+                                    max_count: int) -> Tuple[Hash32, ...]:
+        """
+        Returns the given canonical block hash followed by the hashes of its ancestors,
+        newest first, up to ``max_count`` hashes in total or until genesis.
+
+        This is served from memory without touching the database: if ``block_hash`` is not
+        one of the recent canonical blocks known to this instance, an empty tuple is
+        returned and the caller must fall back to walking the headers.
+        """
+        if not len(self._canonical_hashes):
+            with self._canonical_hashes_lock:
+                if not len(self._canonical_hashes):
+                    try:
+                        canonical_head = self.get_canonical_head()
+                    except CanonicalHeadNotFound:
+                        return tuple()
+                    else:
+                        self._load_canonical_hashes(canonical_head.block_number)
+
+        return self._canonical_hashes.get_ancestor_hashes(block_hash, max_count)
+
+    def _record_canonical_headers(self, new_canonical_headers: Sequence[BlockHeader]) -> None:
+        if not new_canonical_headers:
+            return
+
+        first_header = new_canonical_headers[0]
+        with self._canonical_hashes_lock:
+            is_attached = first_header.parent_hash in self._canonical_hashes
+            if not is_attached and not first_header.is_genesis:
+                self._load_canonical_hashes(BlockNumber(first_header.block_number - 1))
+
+            self._canonical_hashes.set_canonical_headers(new_canonical_headers)
+
+    def _load_canonical_hashes(self, head_number: BlockNumber) -> None:
+        """
+        Seed the recent canonical hashes from the canonical block number index, ending
+        at ``head_number``.  This only reads the index, so no headers are decoded.
+        """
+        hashes = []
+        lowest_block_number = max(0, head_number - self._canonical_hashes.size + 1)
+        for block_number in range(head_number, lowest_block_number - 1, -1):
+            try:
+                hashes.append(self._get_canonical_block_hash(self.db, BlockNumber(block_number)))
+            except HeaderNotFound:
+                break
+
+        self._canonical_hashes.set_canonical_hashes(
+            BlockNumber(head_number - len(hashes) + 1),
+            tuple(reversed(hashes)),
+        )
 
     #
     # Header API
     #
     def get_block_header_by_hash(self, block_hash: Hash32) -> BlockHeader:
-        return self._get_block_header_by_hash(self.db, block_hash)
+        return self._get_cached_block_header_by_hash(self.db, block_hash)
+
+    def get_header_cache_info(self) -> CacheInfo:
+        """
+        Returns the hit and miss statistics of the decoded header cache.
+        """
+        return self._header_cache.cache_info()
+
+    def _get_cached_block_header_by_hash(self, db: BaseDB, block_hash: Hash32) -> BlockHeader:
+        """
+        Returns the requested block header, from the decoded header cache if possible.
+
+        Headers are only added to the cache once they are known to be committed to the
+        underlying database, so reads made through an uncommitted write batch never
+        populate the cache.
+        """
+        header = self._header_cache.get(block_hash)
+        if header is None:
+            header = self._get_block_header_by_hash(db, block_hash)
+            if db is self.db:
+                self._header_cache[block_hash] = header
+        return header
+
+    def _cache_block_headers(self, headers: Iterable[BlockHeader]) -> None:
+        for header in headers:
+            self._header_cache[header.hash] = header
 
     @staticmethod
     def _get_block_header_by_hash(db: BaseDB, block_hash: Hash32) -> BlockHeader:
@@ -170,6 +429,101 @@ class HeaderDB(BaseHeaderDB):
                 encode_hex(block_hash)))
         return _decode_block_header(header_rlp)
 
+    def get_ancestor_hash(self, block_hash: Hash32, ancestor_number: BlockNumber) -> Hash32:
+        """
+        Returns the hash of the ancestor at ``ancestor_number`` of the given block, which
+        doesn't need to be on the canonical chain.
+
+        Raises HeaderNotFound if the block, or one of the ancestors in between, is not in
+        the database.
+        """
+        validate_block_number(ancestor_number)
+        header = self._get_cached_block_header_by_hash(self.db, block_hash)
+        if ancestor_number > header.block_number:
+            raise ValidationError(
+                "Block #{0} cannot have an ancestor at #{1}".format(
+                    header.block_number,
+                    ancestor_number,
+                )
+            )
+        return self._get_ancestor_hash(self.db, block_hash, header.block_number, ancestor_number)
+
+    def _get_ancestor_hash(self,
+                           db: BaseDB,
+                           block_hash: Hash32,
+                           block_number: BlockNumber,
+                           ancestor_number: BlockNumber) -> Hash32:
+        """
+        Walks back from ``block_hash`` to its ancestor at ``ancestor_number``, taking the skip
+        pointers whenever they don't overshoot, and the parent hashes otherwise.
+
+        The choice of skip heights (see :func:`_get_skip_block_number`) guarantees this takes
+        O(log n) steps when every header has its skip pointer.
+        """
+        walk_hash, walk_number = block_hash, block_number
+        while walk_number > ancestor_number:
+            skip_number = _get_skip_block_number(walk_number)
+            previous_skip_number = _get_skip_block_number(BlockNumber(walk_number - 1))
+            should_skip = skip_number == ancestor_number or (
+                skip_number > ancestor_number and not (
+                    previous_skip_number < skip_number - 2 and
+                    previous_skip_number >= ancestor_number
+                )
+            )
+            skip_hash = self._get_skip_hash(db, walk_hash) if should_skip else None
+
+            if skip_hash is not None:
+                walk_hash, walk_number = skip_hash, skip_number
+            else:
+                walk_hash = self._get_cached_block_header_by_hash(db, walk_hash).parent_hash
+                walk_number = BlockNumber(walk_number - 1)
+
+        return walk_hash
+
+    @staticmethod
+    def _get_skip_hash(db: BaseDB, block_hash: Hash32) -> Hash32:
+        """
+        Returns the hash of the ancestor at the skip height of the given block, or None if
+        the block was persisted without a skip pointer.
+        """
+        try:
+            return Hash32(db[SchemaV1.make_block_hash_to_skip_hash_lookup_key(block_hash)])
+        except KeyError:
+            return None
+
+    def _add_skip_hash_lookups(self, db: BaseDB, header_chain: Tuple[BlockHeader, ...]) -> None:
+        """
+        Sets the skip pointer of every header in the given contiguous chain.  Skip targets
+        within the chain are looked up in memory, the others are found through the skip
+        pointers already in the database.
+        """
+        first_header = header_chain[0]
+        hashes_by_number = {header.block_number: header.hash for header in header_chain}
+
+        for header in header_chain:
+            if header.block_number < 2:
+                # the skip target would be the parent, so there's nothing to gain
+                continue
+
+            skip_number = _get_skip_block_number(header.block_number)
+            if skip_number in hashes_by_number:
+                skip_hash = hashes_by_number[skip_number]
+            else:
+                try:
+                    skip_hash = self._get_ancestor_hash(
+                        db,
+                        first_header.parent_hash,
+                        BlockNumber(first_header.block_number - 1),
+                        skip_number,
+                    )
+                except HeaderNotFound:
+                    # The chain doesn't reach back that far, which only happens when it
+                    # doesn't start at block 0.
+                    continue
+                hashes_by_number[skip_number] = skip_hash
+
+            db.set(SchemaV1.make_block_hash_to_skip_hash_lookup_key(header.hash), skip_hash)
+
     def get_score(self, block_hash: Hash32) -> int:
         return self._get_score(self.db, block_hash)
 
@@ -202,8 +556,14 @@ class HeaderDB(BaseHeaderDB):
         Return two iterable of headers, the first containing the new canonical headers,
         the second containing the old canonical headers
         """
+        headers = tuple(headers)
         with self.db.atomic_batch() as db:
-            return self._persist_header_chain(db, headers)
+            new_canonical_headers, old_canonical_headers = self._persist_header_chain(db, headers)
+
+        # in a bulk import, only the most recent headers could stay in the cache anyway
+        self._cache_block_headers(headers[-self._header_cache.size:])
+        self._record_canonical_headers(new_canonical_headers)
+        return new_canonical_headers, old_canonical_headers
 
     @classmethod
     def _set_hash_scores_to_db(
@@ -221,39 +581,17 @@ class HeaderDB(BaseHeaderDB):
 
         return new_score
 
-    @classmethod
     def _persist_header_chain(
-            cls,
+            self,
             db: BaseDB,
             headers: Iterable[BlockHeader]
     ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
-        headers_iterator = iter(headers)
-
-        try:
-            first_header = first(headers_iterator)
-        except StopIteration:
+        header_chain = tuple(headers)
+        if not header_chain:
             return tuple(), tuple()
 
-        is_genesis = first_header.parent_hash == GENESIS_PARENT_HASH
-        if not is_genesis and not cls._header_exists(db, first_header.parent_hash):
-            raise ParentNotFound(
-                "Cannot persist block header ({}) with unknown parent ({})".format(
-                    encode_hex(first_header.hash), encode_hex(first_header.parent_hash)))
-
-        if is_genesis:
-            score = 0
-        else:
-            score = cls._get_score(db, first_header.parent_hash)
-
-        curr_chain_head = first_header
-        db.set(
-            curr_chain_head.hash,
-            rlp.encode(curr_chain_head),
-        )
-        score = cls._set_hash_scores_to_db(db, curr_chain_head, score)
-
-        orig_headers_seq = concat([(first_header,), headers_iterator])
-        for parent, child in sliding_window(2, orig_headers_seq):
+        # Check the whole batch in memory before writing anything
+        for parent, child in sliding_window(2, header_chain):
             if parent.hash != child.parent_hash:
                 raise ValidationError(
                     "Non-contiguous chain. Expected {} to have {} as parent but was {}".format(
@@ -263,27 +601,76 @@ class HeaderDB(BaseHeaderDB):
                     )
                 )
 
-            curr_chain_head = child
+        first_header = header_chain[0]
+        is_genesis = first_header.parent_hash == GENESIS_PARENT_HASH
+        if not is_genesis and not self._header_exists(db, first_header.parent_hash):
+            raise ParentNotFound(
+                "Cannot persist block header ({}) with unknown parent ({})".format(
+                    encode_hex(first_header.hash), encode_hex(first_header.parent_hash)))
+
+        if is_genesis:
+            score = 0
+        else:
+            score = self._get_score(db, first_header.parent_hash)
+
+        for header in header_chain:
             db.set(
-                curr_chain_head.hash,
-                rlp.encode(curr_chain_head),
+                header.hash,
+                fast_encode(header),
             )
+            score = self._set_hash_scores_to_db(db, header, score)
 
-            score = cls._set_hash_scores_to_db(db, curr_chain_head, score)
+        if self._has_ancestor_index:
+            self._add_skip_hash_lookups(db, header_chain)
 
+        curr_chain_head = header_chain[-1]
         try:
-            previous_canonical_head = cls._get_canonical_head(db).hash
-            head_score = cls._get_score(db, previous_canonical_head)
-        except CanonicalHeadNotFound:
-            return cls._set_as_canonical_chain_head(db, curr_chain_head.hash)
+            previous_canonical_head = Hash32(db[SchemaV1.make_canonical_head_hash_lookup_key()])
+        except KeyError:
+            return self._set_as_canonical_chain_head(db, curr_chain_head.hash)
+
+        head_score = self._get_score(db, previous_canonical_head)
+        if score <= head_score:
+            return tuple(), tuple()
+        elif self._is_extending_canonical_head(db, first_header, previous_canonical_head):
+            return self._extend_canonical_chain(db, header_chain)
+        else:
+            return self._set_as_canonical_chain_head(db, curr_chain_head.hash)
+
+    @staticmethod
+    def _is_extending_canonical_head(db: BaseDB,
+                                     first_header: BlockHeader,
+                                     canonical_head_hash: Hash32) -> bool:
+        """
+        Whether the chain starting with ``first_header`` builds directly on top of the
+        canonical head, with no leftover canonical entries above the head that would
+        need to be replaced.
+        """
+        if first_header.parent_hash != canonical_head_hash:
+            return False
+        number_to_hash_key = SchemaV1.make_block_number_to_hash_lookup_key(
+            first_header.block_number
+        )
+        return not db.exists(number_to_hash_key)
+
+    def _extend_canonical_chain(
+            self,
+            db: BaseDB,
+            header_chain: Tuple[BlockHeader, ...]
+    ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
+        """
+        Make ``header_chain`` canonical when it builds directly on the canonical head. None of
+        the previous canonical headers are replaced, so there's no need to search the
+        database for a common ancestor.
+        """
+        for header in header_chain:
+            self._add_block_number_to_hash_lookup(db, header)
 
-        if score > head_score:
-            return cls._set_as_canonical_chain_head(db, curr_chain_head.hash)
+        db.set(SchemaV1.make_canonical_head_hash_lookup_key(), header_chain[-1].hash)
 
-        return tuple(), tuple()
+        return header_chain, tuple()
 
-    @classmethod
-    def _set_as_canonical_chain_head(cls, db: BaseDB, block_hash: Hash32
+    def _set_as_canonical_chain_head(self, db: BaseDB, block_hash: Hash32
                                      ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
         """
         Sets the canonical chain HEAD to the block header as specified by the
@@ -293,35 +680,34 @@ class HeaderDB(BaseHeaderDB):
             are no longer in the canonical chain
         """
         try:
-            header = cls._get_block_header_by_hash(db, block_hash)
+            header = self._get_cached_block_header_by_hash(db, block_hash)
         except HeaderNotFound:
             raise ValueError(
                 "Cannot use unknown block hash as canonical head: {}".format(block_hash)
             )
 
-        new_canonical_headers = tuple(reversed(cls._find_new_ancestors(db, header)))
+        new_canonical_headers = tuple(reversed(self._find_new_ancestors(db, header)))
         old_canonical_headers = []
 
         for h in new_canonical_headers:
             try:
-                old_canonical_hash = cls._get_canonical_block_hash(db, h.block_number)
+                old_canonical_hash = self._get_canonical_block_hash(db, h.block_number)
             except HeaderNotFound:
                 # no old_canonical block, and no more possible
                 break
             else:
-                old_canonical_header = cls._get_block_header_by_hash(db, old_canonical_hash)
+                old_canonical_header = self._get_cached_block_header_by_hash(db, old_canonical_hash)
                 old_canonical_headers.append(old_canonical_header)
 
         for h in new_canonical_headers:
-            cls._add_block_number_to_hash_lookup(db, h)
+            self._add_block_number_to_hash_lookup(db, h)
 
         db.set(SchemaV1.make_canonical_head_hash_lookup_key(), header.hash)
 
         return new_canonical_headers, tuple(old_canonical_headers)
 
-    @classmethod
     @to_tuple
-    def _find_new_ancestors(cls, db: BaseDB, header: BlockHeader) -> Iterable[BlockHeader]:
+    def _find_new_ancestors(self, db: BaseDB, header: BlockHeader) -> Iterable[BlockHeader]:
         """
         Returns the chain leading up from the given header until (but not including)
         the first ancestor it has in common with our canonical chain.
@@ -333,17 +719,23 @@ class HeaderDB(BaseHeaderDB):
                \
                 E - F
         """
-        h = header
-        while True:
+        fork_number = None
+        if self._has_ancestor_index:
             try:
-                orig = cls._get_canonical_block_header_by_number(db, h.block_number)
+                fork_number = self._find_fork_block_number(db, header)
             except HeaderNotFound:
-                # This just means the block is not on the canonical chain.
+                # The chain doesn't start at block 0, so fall back to walking it
                 pass
-            else:
-                if orig.hash == h.hash:
+
+        h = header
+        while True:
+            if fork_number is not None:
+                if h.block_number <= fork_number:
                     # Found the common ancestor, stop.
                     break
+            elif self._is_canonical_block_hash(db, h.block_number, h.hash):
+                # Found the common ancestor, stop.
+                break
 
             # Found a new ancestor
             yield h
@@ -351,7 +743,65 @@ class HeaderDB(BaseHeaderDB):
             if h.parent_hash == GENESIS_PARENT_HASH:
                 break
             else:
-                h = cls._get_block_header_by_hash(db, h.parent_hash)
+                h = self._get_cached_block_header_by_hash(db, h.parent_hash)
+
+    def _find_fork_block_number(self, db: BaseDB, header: BlockHeader) -> int:
+        """
+        Returns the block number of the latest ancestor of ``header`` which is on the
+        canonical chain, or -1 if there is none.
+
+        Whether an ancestor is canonical only changes once, at the fork point, so this
+        gallops back from the top and then bisects, looking each candidate ancestor up
+        through the skip pointers.  Every lookup starts from the lowest ancestor already
+        known to be off the canonical chain.
+        """
+        try:
+            head_hash = Hash32(db[SchemaV1.make_canonical_head_hash_lookup_key()])
+        except KeyError:
+            return -1
+        head_number = self._get_cached_block_header_by_hash(db, head_hash).block_number
+
+        # Canonical entries above the head may be leftovers of a longer chain, so don't look
+        # at them.
+        top_number = min(header.block_number, head_number)
+
+        origin_hash, origin_number = header.hash, header.block_number
+        non_canonical_number = top_number + 1
+        distance = 1
+        while True:
+            probe_number = BlockNumber(max(non_canonical_number - distance, 0))
+            probe_hash = self._get_ancestor_hash(db, origin_hash, origin_number, probe_number)
+            if self._is_canonical_block_hash(db, probe_number, probe_hash):
+                canonical_number = probe_number
+                break
+            elif probe_number == 0:
+                return -1
+            else:
+                non_canonical_number = probe_number
+                origin_hash, origin_number = probe_hash, probe_number
+                distance *= 2
+
+        while non_canonical_number - canonical_number > 1:
+            middle_number = BlockNumber((canonical_number + non_canonical_number) // 2)
+            middle_hash = self._get_ancestor_hash(db, origin_hash, origin_number, middle_number)
+            if self._is_canonical_block_hash(db, middle_number, middle_hash):
+                canonical_number = middle_number
+            else:
+                non_canonical_number = middle_number
+                origin_hash, origin_number = middle_hash, middle_number
+
+        return canonical_number
+
+    @classmethod
+    def _is_canonical_block_hash(cls,
+                                 db: BaseDB,
+                                 block_number: BlockNumber,
+                                 block_hash: Hash32) -> bool:
+        try:
+            return cls._get_canonical_block_hash(db, block_number) == block_hash
+        except HeaderNotFound:
+            # This just means the block is not on the canonical chain.
+            return False
 
     @staticmethod
     def _add_block_number_to_hash_lookup(db: BaseDB, header: BlockHeader) -> None:
@@ -368,38 +818,161 @@ class HeaderDB(BaseHeaderDB):
         )
 
 
+class _PendingWrite(NamedTuple('_PendingWrite', [
+    ('method', Callable[..., Any]),
+    ('args', Tuple[Any, ...]),
+    ('result', 'asyncio.Future[Any]'),
+])):
+    pass
+
+
 class AsyncHeaderDB(HeaderDB):
+    """
+    A :class:`HeaderDB` with coroutine versions of its methods, which run the blocking
+    lookups and writes in a bounded thread pool, rather than on the event loop.
+
+    Concurrent lookups of the same thing share a single trip to the database.  Writes are
+    applied one after the other, in the order they were requested, and the ones that queue
+    up while another write is running are all applied by the same job in the pool.
+    """
+    def __init__(self,
+                 db: BaseAtomicDB,
+                 *args: Any,
+                 executor: Executor=None,
+                 **kwargs: Any) -> None:
+        """
+        :param executor: the pool to run lookups and writes in; a thread pool with
+            ``DEFAULT_ASYNC_DB_WORKERS`` threads is started when it's first needed by default
+        """
+        super().__init__(db, *args, **kwargs)
+        self._executor = executor
+        self._lookups = {}  # type: Dict[Hashable, asyncio.Future[Any]]
+        self._pending_writes = []  # type: List[_PendingWrite]
+        self._writer = None  # type: asyncio.Future[None]
+
     async def coro_get_score(self, block_hash: Hash32) -> int:
-        raise NotImplementedError()
+        return await self._run_lookup(self.get_score, block_hash)
 
     async def coro_get_block_header_by_hash(self, block_hash: Hash32) -> BlockHeader:
-        raise NotImplementedError()
+        return await self._run_lookup(self.get_block_header_by_hash, block_hash)
 
     async def coro_get_canonical_head(self) -> BlockHeader:
-        raise NotImplementedError()
+        return await self._run_lookup(self.get_canonical_head)
 
     async def coro_get_canonical_block_header_by_number(
             self, block_number: BlockNumber) -> BlockHeader:
-        raise NotImplementedError()
+        return await self._run_lookup(self.get_canonical_block_header_by_number, block_number)
 
     async def coro_header_exists(self, block_hash: Hash32) -> bool:
-        raise NotImplementedError()
+        return await self._run_lookup(self.header_exists, block_hash)
 
     async def coro_get_canonical_block_hash(self, block_number: BlockNumber) -> Hash32:
-        raise NotImplementedError()
+        return await self._run_lookup(self.get_canonical_block_hash, block_number)
 
-    async def coro_persist_header(self, header: BlockHeader) -> Tuple[BlockHeader, ...]:
-        raise NotImplementedError()
+    async def coro_persist_header(
+            self,
+            header: BlockHeader) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
+        return await self._run_write(self.persist_header, header)
 
-    async def coro_persist_header_chain(self,
-                                        headers: Iterable[BlockHeader]) -> Tuple[BlockHeader, ...]:
-        raise NotImplementedError()
+    async def coro_persist_header_chain(
+            self,
+            headers: Iterable[BlockHeader]
+    ) -> Tuple[Tuple[BlockHeader, ...], Tuple[BlockHeader, ...]]:
+        return await self._run_write(self.persist_header_chain, tuple(headers))
+
+    #
+    # Execution
+    #
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=DEFAULT_ASYNC_DB_WORKERS)
+        return self._executor
+
+    async def _run_lookup(self, method: Callable[..., TReturn], *args: Any) -> TReturn:
+        """
+        Run ``method`` in the pool, unless the same lookup is already running there, in
+        which case its result is shared.  The ``args`` must be hashable, since they are
+        part of the key of the lookup.
+        """
+        loop = asyncio.get_event_loop()
+        key = (loop, method.__name__) + args
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            lookup = loop.run_in_executor(self._get_executor(), method, *args)
+            self._lookups[key] = lookup
+            lookup.add_done_callback(functools.partial(self._forget_lookup, key))
+
+        # a caller that is cancelled must not cancel the lookup for the other ones
+        return await asyncio.shield(lookup)
+
+    def _forget_lookup(self, key: Hashable, lookup: 'asyncio.Future[Any]') -> None:
+        if self._lookups.get(key) is lookup:
+            del self._lookups[key]
+
+    async def _run_write(self, method: Callable[..., TReturn], *args: Any) -> TReturn:
+        """
+        Queue ``method`` to run in the pool after all the writes that were queued before.
+        Once queued, it is applied even if the caller is cancelled.
+        """
+        loop = asyncio.get_event_loop()
+        result = loop.create_future()
+        self._pending_writes.append(_PendingWrite(method, args, result))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._apply_pending_writes())
+        return await result
+
+    async def _apply_pending_writes(self) -> None:
+        loop = asyncio.get_event_loop()
+        while self._pending_writes:
+            writes, self._pending_writes = self._pending_writes, []
+            outcomes = await loop.run_in_executor(
+                self._get_executor(),
+                self._apply_writes,
+                writes,
+            )
+
+            # lookups that are still running might not see what was just written
+            self._lookups.clear()
+
+            for write, (value, error) in zip(writes, outcomes):
+                if write.result.cancelled():
+                    continue
+                elif error is not None:
+                    write.result.set_exception(error)
+                else:
+                    write.result.set_result(value)
+
+    @staticmethod
+    def _apply_writes(
+            writes: Sequence[_PendingWrite]) -> List[Tuple[Any, Optional[Exception]]]:
+        outcomes = []  # type: List[Tuple[Any, Optional[Exception]]]
+        for write in writes:
+            try:
+                outcomes.append((write.method(*write.args), None))
+            except Exception as exc:
+                outcomes.append((None, exc))
+        return outcomes
 
 
-# When performing a chain sync (either fast or regular modes), we'll very often need to look
-# up recent block headers to validate the chain, and decoding their RLP representation is
-# relatively expensive so we cache that here, but use a small cache because we *should* only
-# be looking up recent blocks.
-@functools.lru_cache(128)
 def _decode_block_header(header_rlp: bytes) -> BlockHeader:
-    return rlp.decode(header_rlp, sedes=BlockHeader)
+    return fast_decode(header_rlp, BlockHeader)
+
+
+def _invert_lowest_one(value: int) -> int:
+    return value & (value - 1)
+
+
+def _get_skip_block_number(block_number: BlockNumber) -> BlockNumber:
+    """
+    Returns the block number that the skip pointer of a block at ``block_number`` targets.
+
+    Clearing the lowest set bit(s) makes the skip distances a mix of powers of two, arranged
+    like the skip list used for block indices in Bitcoin Core, so that any ancestor can be
+    reached in O(log n) steps while only storing a single pointer per block.
+    """
+    if block_number < 2:
+        return BlockNumber(0)
+    elif block_number & 1:
+        return BlockNumber(_invert_lowest_one(_invert_lowest_one(block_number - 1)) + 1)
+    else:
+        return BlockNumber(_invert_lowest_one(block_number))
@@ -111,11 +111,9 @@ class Journal(BaseDB):
         changeset_data = self.pop_changeset(changeset_id)
         if not self.is_empty():
             # we only have to merge the changes into the latest changeset if
-            # there is one.
-            self.latest = merge(
-                self.latest,
-                changeset_data,
-            )
+            # there is one.  Updating it in place keeps committing a small changeset
+            # cheap, no matter how large the latest one grew.
+            self.latest.update(changeset_data)
         return changeset_data
 
     #
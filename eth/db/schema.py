@@ -22,11 +22,36 @@ class BaseSchema(ABC):
     def make_block_hash_to_score_lookup_key(block_hash: Hash32) -> bytes:
         raise NotImplementedError('Must be implemented by subclasses')
 
+    @staticmethod
+    @abstractmethod
+    def make_block_hash_to_skip_hash_lookup_key(block_hash: Hash32) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
+    @staticmethod
+    @abstractmethod
+    def make_transaction_root_to_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
+    @staticmethod
+    @abstractmethod
+    def make_receipt_root_to_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
     @staticmethod
     @abstractmethod
     def make_transaction_hash_to_block_lookup_key(transaction_hash: Hash32) -> bytes:
         raise NotImplementedError('Must be implemented by subclasses')
 
+    @staticmethod
+    @abstractmethod
+    def make_bloom_bits_lookup_key(bloom_bit: int, section: int) -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
+    @staticmethod
+    @abstractmethod
+    def make_bloom_bits_start_lookup_key() -> bytes:
+        raise NotImplementedError('Must be implemented by subclasses')
+
 
 class SchemaV1(BaseSchema):
     @staticmethod
@@ -42,6 +67,26 @@ class SchemaV1(BaseSchema):
     def make_block_hash_to_score_lookup_key(block_hash: Hash32) -> bytes:
         return b'block-hash-to-score:%s' % block_hash
 
+    @staticmethod
+    def make_block_hash_to_skip_hash_lookup_key(block_hash: Hash32) -> bytes:
+        return b'block-hash-to-skip-hash:%s' % block_hash
+
+    @staticmethod
+    def make_transaction_root_to_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        return b'transaction-root-to-transactions:%s' % transaction_root
+
+    @staticmethod
+    def make_receipt_root_to_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        return b'receipt-root-to-receipts:%s' % receipt_root
+
     @staticmethod
     def make_transaction_hash_to_block_lookup_key(transaction_hash: Hash32) -> bytes:
         return b'transaction-hash-to-block:%s' % transaction_hash
+
+    @staticmethod
+    def make_bloom_bits_lookup_key(bloom_bit: int, section: int) -> bytes:
+        return b'bloom-bits:%d:%d' % (bloom_bit, section)
+
+    @staticmethod
+    def make_bloom_bits_start_lookup_key() -> bytes:
+        return b'bloom-bits-start'
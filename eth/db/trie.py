@@ -1,9 +1,22 @@
-import functools
-from typing import Dict, Tuple, Union
+import itertools
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from eth_hash.auto import keccak
 import rlp
-from trie import (
-    HexaryTrie,
+from trie.constants import (
+    BLANK_NODE,
+)
+from trie.utils.nodes import (
+    compute_extension_key,
+    compute_leaf_key,
 )
 
 from eth_typing import Hash32
@@ -11,27 +24,119 @@ from eth_typing import Hash32
 from eth.constants import (
     BLANK_ROOT_HASH,
 )
+from eth.rlp.codecs import fast_encode
 from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransaction
 
 TransactionsOrReceipts = Union[Tuple[Receipt, ...], Tuple[BaseTransaction, ...]]
 TrieRootAndData = Tuple[Hash32, Dict[Hash32, bytes]]
 
+Nibbles = Tuple[int, ...]
+# A node, or the hash of a node, as it is referenced by its parent
+NodeReference = Union[bytes, List[Any]]
+
 
 def make_trie_root_and_nodes(items: TransactionsOrReceipts) -> TrieRootAndData:
-    return _make_trie_root_and_nodes(tuple(rlp.encode(item) for item in items))
-
-
-# This cache is expected to be useful when importing blocks as we call this once when importing
-# and again when validating the imported block. But it should also help for post-Byzantium blocks
-# as it's common for them to have duplicate receipt_roots. Given that, it probably makes sense to
-# use a relatively small cache size here.
-@functools.lru_cache(128)
-def _make_trie_root_and_nodes(items: Tuple[bytes, ...]) -> TrieRootAndData:
-    kv_store = {}  # type: Dict[Hash32, bytes]
-    trie = HexaryTrie(kv_store, BLANK_ROOT_HASH)
-    with trie.squash_changes() as memory_trie:
-        for index, item in enumerate(items):
-            index_key = rlp.encode(index, sedes=rlp.sedes.big_endian_int)
-            memory_trie[index_key] = item
-    return trie.root_hash, kv_store
+    return make_ordered_trie_root_and_nodes(tuple(fast_encode(item) for item in items))
+
+
+def make_ordered_trie_root_and_nodes(items: Sequence[bytes]) -> TrieRootAndData:
+    """
+    Returns the root and the nodes of the trie with each of the ``items`` at the RLP
+    encoding of its index, like a :class:`~trie.HexaryTrie` with the items inserted one by
+    one.
+
+    The order of those keys is known in advance, so the trie is built in a single pass
+    over them, and each node is encoded once, when the last key that goes through it has
+    been added.  The branches that later keys may still go through are kept on a stack.
+    """
+    if not items:
+        return BLANK_ROOT_HASH, {}
+
+    nodes = {}  # type: Dict[Hash32, bytes]
+
+    def reference(node: List[Any]) -> NodeReference:
+        encoded = rlp.encode(node)
+        if len(encoded) < 32:
+            # small nodes are embedded in their parent
+            return node
+        node_hash = Hash32(keccak(encoded))
+        nodes[node_hash] = encoded
+        return node_hash
+
+    # the depth of each branch that is still open, and its children
+    stack = []  # type: List[Tuple[int, List[NodeReference]]]
+    root = None  # type: List[Any]
+
+    keys_and_items = [
+        (_index_nibbles(index), items[index])
+        for index in _ordered_indices(len(items))
+    ]
+    # the length of the common prefix with the previous key
+    left = -1
+
+    for position, (key, item) in enumerate(keys_and_items):
+        # the length of the common prefix with the next key
+        if position + 1 < len(keys_and_items):
+            right = _common_prefix_length(key, keys_and_items[position + 1][0])
+        else:
+            right = -1
+
+        depth = max(left, right)
+        if depth < 0:
+            # the only item, so the root is its leaf
+            root = [compute_leaf_key(key), item]
+        else:
+            if not stack or stack[-1][0] < depth:
+                stack.append((depth, [BLANK_NODE] * 16))
+            stack[-1][1][key[depth]] = reference([compute_leaf_key(key[depth + 1:]), item])
+
+        # close the branches that none of the later keys go through
+        while stack and stack[-1][0] > right:
+            branch_depth, children = stack.pop()
+            node = children + [BLANK_NODE]
+
+            parent_depth = max(stack[-1][0] if stack else -1, right)
+            if parent_depth >= 0 and (not stack or stack[-1][0] < parent_depth):
+                stack.append((parent_depth, [BLANK_NODE] * 16))
+
+            if branch_depth > parent_depth + 1:
+                node = [compute_extension_key(key[parent_depth + 1:branch_depth]), reference(node)]
+
+            if parent_depth < 0:
+                root = node
+            else:
+                stack[-1][1][key[parent_depth]] = reference(node)
+
+        left = right
+
+    # the root is stored even if it is small
+    encoded_root = rlp.encode(root)
+    root_hash = Hash32(keccak(encoded_root))
+    nodes[root_hash] = encoded_root
+    return root_hash, nodes
+
+
+def _ordered_indices(count: int) -> Iterable[int]:
+    """
+    The indices up to ``count`` in the order of their RLP encodings: 0x01 to 0x7f, then 0x80
+    for index 0, and then the longer encodings, which sort by length and then by value.
+    """
+    yield from range(1, min(count, 128))
+    if count:
+        yield 0
+    yield from range(128, count)
+
+
+def _index_nibbles(index: int) -> Nibbles:
+    key = rlp.encode(index, sedes=rlp.sedes.big_endian_int)
+    return tuple(itertools.chain.from_iterable((byte >> 4, byte & 0x0f) for byte in key))
+
+
+def _common_prefix_length(left_key: Nibbles, right_key: Nibbles) -> int:
+    length = 0
+    for left_nibble, right_nibble in zip(left_key, right_key):
+        if left_nibble != right_nibble:
+            break
+        length += 1
+    return length
@@ -1,12 +1,27 @@
-from typing import Optional
+from typing import (  # noqa: F401
+    cast,
+    Dict,
+    Optional,
+    Type,
+)
 
 from eth_utils.toolz import curry
 
+from eth.constants import GAS_CALLSTIPEND
 from eth.exceptions import VMError
 
 from eth.rlp.transactions import BaseTransaction
+from eth.vm import opcode_values
+from eth.vm.computation import BaseComputation
+from eth.vm.logic.call import (
+    CallEIP150,
+    max_child_gas_eip150,
+)
+from eth.vm.logic.system import CreateEIP150
+from eth.vm.message import Message
 from eth.vm.spoof import SpoofTransaction
 from eth.vm.state import BaseState
+from eth.vm.transaction_context import BaseTransactionContext
 
 
 def _get_computation_error(state: BaseState, transaction: SpoofTransaction) -> Optional[VMError]:
@@ -65,8 +80,14 @@ def binary_gas_search(state: BaseState, transaction: BaseTransaction, tolerance:
     if error is not None:
         raise error
 
-    minimum_viable = state.gas_limit
-    maximum_out_of_gas = transaction.intrinsic_gas
+    return _bisect_gas(state, transaction, state.gas_limit, transaction.intrinsic_gas, tolerance)
+
+
+def _bisect_gas(state: BaseState,
+                transaction: BaseTransaction,
+                minimum_viable: int,
+                maximum_out_of_gas: int,
+                tolerance: int) -> int:
     while minimum_viable - maximum_out_of_gas > tolerance:
         midpoint = (minimum_viable + maximum_out_of_gas) // 2
         test_transaction = SpoofTransaction(transaction, gas=midpoint)
@@ -78,6 +99,165 @@ def binary_gas_search(state: BaseState, transaction: BaseTransaction, tolerance:
     return minimum_viable
 
 
+class GasTracingComputation(BaseComputation):
+    """
+    Tracks how much less gas a computation could have been given, and still have done
+    what it did.  This is its slack: the least gas it ever had left, except that the
+    gas forwarded to each child is only needed to the extent that the child needed it.
+
+    With EIP-150, a call or create forwards at most all but one 64th of the gas that is
+    left, so forwarding ``n`` gas takes a little more than ``n`` gas to be left.
+    """
+    # Set on the subclasses of the actual computation classes
+    call_forwards_all_but_one_64th = None  # type: bool
+    create_forwards_all_but_one_64th = None  # type: bool
+
+    def __init__(self,
+                 state: BaseState,
+                 message: Message,
+                 transaction_context: BaseTransactionContext) -> None:
+        super().__init__(state, message, transaction_context)
+        self.gas_slack = self.msg.gas
+        self._gas_slack_before_consuming = self.gas_slack
+
+    def consume_gas(self, amount: int, reason: str) -> None:
+        self._gas_slack_before_consuming = self.gas_slack
+        super().consume_gas(amount, reason)
+        self.gas_slack = min(self.gas_slack, self._gas_meter.gas_remaining)
+
+    def apply_child_computation(self, child_msg: Message) -> BaseComputation:
+        # The gas for the child was just consumed, and is accounted for below instead
+        self.gas_slack = self._gas_slack_before_consuming
+        gas_remaining = self._gas_meter.gas_remaining
+
+        child_computation = super().apply_child_computation(child_msg)
+
+        if child_msg.is_create:
+            stipend = 0
+            forwards_all_but_one_64th = self.create_forwards_all_but_one_64th
+        else:
+            stipend = GAS_CALLSTIPEND if child_msg.should_transfer_value and child_msg.value else 0
+            forwards_all_but_one_64th = self.call_forwards_all_but_one_64th
+        forwarded = child_msg.gas - stipend
+
+        if child_computation.is_error:
+            # it fails with less gas too
+            child_gas_needed = 0
+        else:
+            child_gas_needed = max(
+                0,
+                child_msg.gas - cast(GasTracingComputation, child_computation).gas_slack - stipend,
+            )
+
+        if forwards_all_but_one_64th:
+            slack = gas_remaining + forwarded - _get_gas_to_forward(child_gas_needed)
+        elif child_msg.is_create:
+            # all of the gas that is left is forwarded
+            slack = gas_remaining + forwarded - child_gas_needed
+        else:
+            # exactly the requested gas is forwarded
+            slack = gas_remaining
+        self.gas_slack = min(self.gas_slack, slack)
+
+        return child_computation
+
+
+def _get_gas_to_forward(gas: int) -> int:
+    """
+    The least gas that needs to be left to forward ``gas`` under EIP-150
+    """
+    gas_left = gas + gas // 63
+    while max_child_gas_eip150(gas_left) < gas:
+        gas_left += 1
+    while gas_left > 0 and max_child_gas_eip150(gas_left - 1) >= gas:
+        gas_left -= 1
+    return gas_left
+
+
+# The tracing subclass of each computation class, made the first time it is needed
+_tracing_computation_classes = {}  # type: Dict[Type[BaseComputation], Type[GasTracingComputation]]  # noqa: E501
+
+
+def _get_tracing_computation_class(
+        computation_class: Type[BaseComputation]) -> Type[GasTracingComputation]:
+    try:
+        return _tracing_computation_classes[computation_class]
+    except KeyError:
+        pass
+
+    opcodes = computation_class.opcodes
+    tracing_computation_class = cast(Type[GasTracingComputation], type(
+        'GasTracing' + computation_class.__name__,
+        (GasTracingComputation, computation_class),
+        dict(
+            call_forwards_all_but_one_64th=isinstance(opcodes[opcode_values.CALL], CallEIP150),
+            create_forwards_all_but_one_64th=isinstance(
+                opcodes[opcode_values.CREATE],
+                CreateEIP150,
+            ),
+        ),
+    ))
+    _tracing_computation_classes[computation_class] = tracing_computation_class
+    return tracing_computation_class
+
+
+def _execute_traced(state: BaseState, transaction: SpoofTransaction) -> GasTracingComputation:
+    snapshot = state.snapshot()
+    computation_class = state.computation_class
+    state.computation_class = _get_tracing_computation_class(computation_class)
+    try:
+        return cast(GasTracingComputation, state.execute_transaction(transaction))
+    finally:
+        state.computation_class = computation_class
+        state.revert(snapshot)
+
+
+@curry
+def trace_gas_search(state: BaseState, transaction: BaseTransaction, tolerance: int=1) -> int:
+    """
+    Run the transaction once with the block gas limit, while tracing how much gas each
+    computation needed along the way, including what calls and creates forward under
+    EIP-150.  The gas limit that this leaves just enough for is confirmed by running the
+    transaction with it, and with one less gas.  Only if the trace was off, like for
+    code that behaves differently depending on the gas that is left, fall back to the
+    binary search of :func:`binary_gas_search`, in the direction that the trace was off.
+
+    :param int tolerance: The tolerance of the binary search, if needed.
+    :returns int: The smallest gas to not throw an OutOfGas exception, if the trace was
+        right.  Otherwise, like :func:`binary_gas_search`.
+    :raises VMError: if the computation fails even when given the block gas_limit to complete
+    """
+    if not hasattr(transaction, 'sender'):
+        raise TypeError(
+            "Transaction is missing attribute sender.",
+            "If sending an unsigned transaction, use SpoofTransaction and provide the",
+            "sender using the 'from' parameter")
+
+    maximum_transaction = SpoofTransaction(
+        transaction,
+        gas=state.gas_limit,
+        gas_price=0,
+    )
+    computation = _execute_traced(state, maximum_transaction)
+    if computation.is_error:
+        raise computation._error
+
+    intrinsic_gas = transaction.intrinsic_gas
+    candidate = max(intrinsic_gas, state.gas_limit - computation.gas_slack)
+
+    candidate_transaction = SpoofTransaction(transaction, gas=candidate, gas_price=0)
+    if _get_computation_error(state, candidate_transaction) is not None:
+        return _bisect_gas(state, transaction, state.gas_limit, candidate, tolerance)
+    elif candidate == intrinsic_gas:
+        return candidate
+
+    below_candidate_transaction = SpoofTransaction(transaction, gas=candidate - 1, gas_price=0)
+    if _get_computation_error(state, below_candidate_transaction) is not None:
+        return candidate
+    else:
+        return _bisect_gas(state, transaction, candidate - 1, intrinsic_gas, tolerance)
+
+
 # Estimate in increments of intrinsic gas usage
 binary_gas_search_intrinsic_tolerance = binary_gas_search(tolerance=21000)
 
@@ -86,3 +266,6 @@ binary_gas_search_1000_tolerance = binary_gas_search(tolerance=1000)
 
 # Estimate to the exact gas, takes roughly 15 more executions than intrinsic to estimate
 binary_gas_search_exact = binary_gas_search(tolerance=1)
+
+# Estimate to the exact gas from a trace of one execution, and two more to confirm it
+trace_gas_search_exact = trace_gas_search(tolerance=1)
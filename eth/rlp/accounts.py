@@ -3,6 +3,10 @@ from rlp.sedes import (
     big_endian_int,
 )
 
+from eth_typing import (
+    Hash32,
+)
+
 from eth.constants import (
     EMPTY_SHA3,
     BLANK_ROOT_HASH,
@@ -13,7 +17,11 @@ from .sedes import (
     hash32,
 )
 
-from typing import Any
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
 
 
 class Account(rlp.Serializable):
@@ -34,3 +42,156 @@ class Account(rlp.Serializable):
                  code_hash: bytes=EMPTY_SHA3,
                  **kwargs: Any) -> None:
         super().__init__(nonce, balance, storage_root, code_hash, **kwargs)
+
+
+class AccountRecord:
+    """
+    An account with the same fields as :class:`Account`, which is much cheaper to create
+    and copy, since its fields aren't validated.  It is encoded and decoded with
+    :func:`encode_account` and :func:`decode_account`.
+
+    Records are shared by the journals of the account database, so they must not be
+    changed once they were stored: use :meth:`copy` instead.
+    """
+    __slots__ = ('nonce', 'balance', 'storage_root', 'code_hash')
+
+    def __init__(self,
+                 nonce: int=0,
+                 balance: int=0,
+                 storage_root: Hash32=BLANK_ROOT_HASH,
+                 code_hash: Hash32=EMPTY_SHA3) -> None:
+        self.nonce = nonce
+        self.balance = balance
+        self.storage_root = storage_root
+        self.code_hash = code_hash
+
+    def copy(self,
+             nonce: int=None,
+             balance: int=None,
+             storage_root: Hash32=None,
+             code_hash: Hash32=None) -> 'AccountRecord':
+        return AccountRecord(
+            self.nonce if nonce is None else nonce,
+            self.balance if balance is None else balance,
+            self.storage_root if storage_root is None else storage_root,
+            self.code_hash if code_hash is None else code_hash,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, AccountRecord):
+            return (
+                self.nonce == other.nonce and
+                self.balance == other.balance and
+                self.storage_root == other.storage_root and
+                self.code_hash == other.code_hash
+            )
+        else:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return 'AccountRecord(nonce={0}, balance={1}, storage_root={2!r}, code_hash={3!r})'.format(
+            self.nonce,
+            self.balance,
+            self.storage_root,
+            self.code_hash,
+        )
+
+
+# The largest integer field that is encoded by hand, which keeps the whole encoding
+# shorter than 256 bytes
+_MAX_FAST_UINT = 2 ** 256 - 1
+
+
+def _encode_uint(value: int) -> bytes:
+    if value == 0:
+        return b'\x80'
+    elif value < 0x80:
+        return bytes((value,))
+    else:
+        data = value.to_bytes((value.bit_length() + 7) // 8, 'big')
+        return bytes((0x80 + len(data),)) + data
+
+
+def encode_account(account: AccountRecord) -> bytes:
+    """
+    Returns the same RLP encoding of the account as :class:`Account` does, but without
+    going through its sedes.
+    """
+    nonce = account.nonce
+    balance = account.balance
+    storage_root = account.storage_root
+    code_hash = account.code_hash
+    is_usual_layout = (
+        0 <= nonce <= _MAX_FAST_UINT and
+        0 <= balance <= _MAX_FAST_UINT and
+        len(storage_root) == 32 and
+        len(code_hash) == 32
+    )
+    if not is_usual_layout:
+        # like an empty storage root, or an invalid account, which this raises errors for
+        return rlp.encode(Account(nonce, balance, storage_root, code_hash))
+
+    payload = b''.join((
+        _encode_uint(nonce),
+        _encode_uint(balance),
+        b'\xa0',
+        storage_root,
+        b'\xa0',
+        code_hash,
+    ))
+    # the payload is always at least 68 bytes long, so it has a one byte long length
+    return b'\xf8' + bytes((len(payload),)) + payload
+
+
+def _decode_uint(encoded: bytes, position: int) -> Tuple[Optional[int], int]:
+    """
+    Decodes the integer at ``position``, and returns it with the position after it.  The
+    integer is None if it isn't encoded canonically, or isn't short enough.
+    """
+    if position >= len(encoded):
+        return None, position
+
+    prefix = encoded[position]
+    if prefix < 0x80:
+        # a zero byte is not a canonical integer
+        return (prefix or None), position + 1
+    elif prefix > 0xa0:
+        return None, position
+
+    end = position + 1 + prefix - 0x80
+    data = encoded[position + 1:end]
+    if not data:
+        return 0, end
+    elif len(data) != end - position - 1 or data[0] == 0 or (len(data) == 1 and data[0] < 0x80):
+        return None, position
+    else:
+        return int.from_bytes(data, 'big'), end
+
+
+def decode_account(encoded: bytes) -> AccountRecord:
+    """
+    Decodes an account from RLP.  Accounts of the usual layout are decoded by hand,
+    anything else goes through the sedes of :class:`Account`, which also raises the errors
+    for invalid encodings.
+    """
+    length = len(encoded)
+    if length > 2 and encoded[0] == 0xf8 and encoded[1] == length - 2:
+        nonce, position = _decode_uint(encoded, 2)
+        if nonce is not None:
+            balance, position = _decode_uint(encoded, position)
+            is_usual_layout = (
+                balance is not None and
+                position == length - 66 and
+                encoded[position] == 0xa0 and
+                encoded[position + 33] == 0xa0
+            )
+            if is_usual_layout:
+                return AccountRecord(
+                    nonce,
+                    balance,
+                    Hash32(encoded[position + 1:position + 33]),
+                    Hash32(encoded[position + 34:]),
+                )
+
+    account = rlp.decode(encoded, sedes=Account)
+    return AccountRecord(account.nonce, account.balance, account.storage_root, account.code_hash)
@@ -3,11 +3,18 @@ from abc import (
     abstractmethod
 )
 from typing import (  # noqa: F401
-    Type
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
 )
 
 import rlp
 
+from eth_hash.auto import keccak
+
 from eth_typing import (
     Hash32
 )
@@ -18,6 +25,8 @@ from eth._utils.datatypes import (
 
 from eth.db.chain import BaseChainDB
 
+from .codecs import fast_decode
+from .receipts import Receipt
 from .transactions import BaseTransaction
 from .headers import BlockHeader
 
@@ -61,3 +70,151 @@ class BaseBlock(rlp.Serializable, Configurable, ABC):
 
     def __str__(self) -> str:
         return "Block #{b.number}".format(b=self)
+
+
+class LazyBlock:
+    """
+    A handle on a block in the database, which only reads the transactions and uncles of
+    the block when they are first needed, and decodes each of them on first access.  So
+    the header, the number of transactions or a single transaction of a block can be
+    looked up without decoding the rest of it.
+
+    A handle is equal to the blocks and handles with the same hash, since the header
+    commits to the transactions and uncles.  Use :meth:`to_block` to get the full block.
+    """
+    def __init__(self,
+                 header: BlockHeader,
+                 block_class: Type[BaseBlock],
+                 chaindb: BaseChainDB) -> None:
+        self.header = header
+        self.block_class = block_class
+        self._chaindb = chaindb
+        self._encoded_transactions = None  # type: Tuple[bytes, ...]
+        self._transactions = None  # type: List[Optional[BaseTransaction]]
+        self._serialized_uncles = None  # type: List[Any]
+        self._uncles = None  # type: List[Optional[BlockHeader]]
+
+    @property
+    def number(self) -> int:
+        return self.header.block_number
+
+    @property
+    def hash(self) -> Hash32:
+        return self.header.hash
+
+    @property
+    def is_genesis(self) -> bool:
+        return self.header.is_genesis
+
+    @property
+    def transaction_class(self) -> Type[BaseTransaction]:
+        return self.block_class.get_transaction_class()
+
+    #
+    # Transactions
+    #
+    def _load_transactions(self) -> Tuple[bytes, ...]:
+        if self._encoded_transactions is None:
+            encoded_transactions = self._chaindb.get_block_transaction_data(self.header)
+            self._transactions = [None] * len(encoded_transactions)
+            self._encoded_transactions = encoded_transactions
+        return self._encoded_transactions
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self._load_transactions())
+
+    @property
+    def transaction_hashes(self) -> Tuple[Hash32, ...]:
+        return tuple(
+            Hash32(keccak(encoded_transaction))
+            for encoded_transaction
+            in self._load_transactions()
+        )
+
+    def get_transaction(self, index: int) -> BaseTransaction:
+        """
+        Returns the transaction at the given index of the block, decoding it if it
+        wasn't already.
+
+        Raises IndexError if the block has no transaction at that index.
+        """
+        encoded_transaction = self._load_transactions()[index]
+        transaction = self._transactions[index]
+        if transaction is None:
+            transaction = fast_decode(encoded_transaction, self.transaction_class)
+            self._transactions[index] = transaction
+        return transaction
+
+    @property
+    def transactions(self) -> Tuple[BaseTransaction, ...]:
+        return tuple(self.get_transaction(index) for index in range(self.transaction_count))
+
+    #
+    # Uncles
+    #
+    def _load_uncles(self) -> List[Any]:
+        if self._serialized_uncles is None:
+            # only splits the list into the fields of each uncle, without decoding them
+            serialized_uncles = rlp.decode(self._chaindb.get_block_uncle_data(
+                self.header.uncles_hash
+            ))
+            self._uncles = [None] * len(serialized_uncles)
+            self._serialized_uncles = serialized_uncles
+        return self._serialized_uncles
+
+    @property
+    def uncle_count(self) -> int:
+        return len(self._load_uncles())
+
+    def get_uncle(self, index: int) -> BlockHeader:
+        """
+        Returns the uncle at the given index of the block, decoding it if it wasn't already.
+
+        Raises IndexError if the block has no uncle at that index.
+        """
+        serialized_uncle = self._load_uncles()[index]
+        uncle = self._uncles[index]
+        if uncle is None:
+            uncle = BlockHeader.deserialize(serialized_uncle)
+            self._uncles[index] = uncle
+        return uncle
+
+    @property
+    def uncles(self) -> Tuple[BlockHeader, ...]:
+        return tuple(self.get_uncle(index) for index in range(self.uncle_count))
+
+    #
+    # Conversion
+    #
+    def get_receipts(self, chaindb: BaseChainDB) -> Iterable[Receipt]:
+        return chaindb.get_receipts(self.header, Receipt)
+
+    def to_block(self) -> BaseBlock:
+        """
+        Returns the full block, decoding all of the transactions and uncles that weren't
+        already.
+        """
+        return self.block_class(
+            header=self.header,
+            transactions=list(self.transactions),
+            uncles=list(self.uncles),
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (BaseBlock, LazyBlock)):
+            return self.hash == other.hash
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.hash)
+
+    def __repr__(self) -> str:
+        return '<{class_name}(#{b})>'.format(
+            class_name=self.__class__.__name__,
+            b=str(self),
+        )
+
+    def __str__(self) -> str:
+        return "Block #{b.number}".format(b=self)
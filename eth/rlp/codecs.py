@@ -0,0 +1,351 @@
+"""
+Fast RLP codecs for the objects that are encoded and decoded the most, like headers,
+transactions, receipts and logs.  A codec is generated for each serializable class from
+its fields, so that its values are encoded and decoded directly, instead of going through
+the generic sedes of ``rlp`` for every one of them.  The encodings are the same.
+
+Anything a codec doesn't handle, like an invalid value or a non-canonical encoding, goes
+through the generic ``rlp`` functions instead, which also raise the usual errors for it.
+"""
+from threading import RLock
+from typing import (  # noqa: F401
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import rlp
+from rlp.sedes import (
+    BigEndianInt,
+    Binary,
+    CountableList,
+)
+
+
+TSerializable = TypeVar('TSerializable', bound=rlp.Serializable)
+
+# Encodes a value of a field, including its RLP prefix
+Encoder = Callable[[Any], bytes]
+# Decodes a value of a field from the encoding, from whether the item is a list, and
+# where its payload starts and ends
+Decoder = Callable[[bytes, bool, int, int], Any]
+
+
+class _FallBack(Exception):
+    """
+    Raised when a value can't be handled by a codec, so that it goes through ``rlp``
+    instead.
+    """
+    pass
+
+
+#
+# Encoding
+#
+def _encode_length(length: int, offset: int) -> bytes:
+    if length < 56:
+        return bytes((offset + length,))
+    else:
+        length_bytes = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+        return bytes((offset + 55 + len(length_bytes),)) + length_bytes
+
+
+def _encode_string(value: bytes) -> bytes:
+    if len(value) == 1 and value[0] < 0x80:
+        return value
+    else:
+        return _encode_length(len(value), 0x80) + value
+
+
+def _encode_uint(value: int) -> bytes:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise _FallBack()
+    elif value == 0:
+        return b'\x80'
+    elif value < 0x80:
+        return bytes((value,))
+    else:
+        return _encode_string(value.to_bytes((value.bit_length() + 7) // 8, 'big'))
+
+
+def _make_fixed_uint_encoder(length: int) -> Encoder:
+    upper_bound = 256 ** length
+
+    def encode_fixed_uint(value: int) -> bytes:
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value < upper_bound:
+            raise _FallBack()
+        return _encode_string(value.to_bytes(length, 'big'))
+
+    return encode_fixed_uint
+
+
+def _make_binary_encoder(sedes: Binary) -> Encoder:
+    is_valid_length = sedes.is_valid_length
+
+    def encode_binary(value: bytes) -> bytes:
+        if not isinstance(value, bytes) or not is_valid_length(len(value)):
+            raise _FallBack()
+        return _encode_string(value)
+
+    return encode_binary
+
+
+def _make_list_encoder(sedes: CountableList) -> Encoder:
+    encode_element = _make_encoder(sedes.element_sedes)
+    max_length = sedes.max_length
+
+    def encode_list(values: Sequence[Any]) -> bytes:
+        if not isinstance(values, (list, tuple)):
+            raise _FallBack()
+        elif max_length is not None and len(values) > max_length:
+            raise _FallBack()
+        payload = b''.join([encode_element(value) for value in values])
+        return _encode_length(len(payload), 0xc0) + payload
+
+    return encode_list
+
+
+def _make_encoder(sedes: Any) -> Encoder:
+    if isinstance(sedes, BigEndianInt):
+        if sedes.l is None:
+            return _encode_uint
+        else:
+            return _make_fixed_uint_encoder(sedes.l)
+    elif isinstance(sedes, Binary):
+        return _make_binary_encoder(sedes)
+    elif isinstance(sedes, CountableList):
+        return _make_list_encoder(sedes)
+    elif isinstance(sedes, type) and issubclass(sedes, rlp.Serializable):
+        return get_codec(sedes).encode_item
+    else:
+        raise TypeError("No fast encoding for the sedes {0!r}".format(sedes))
+
+
+#
+# Decoding
+#
+def _consume_long_length(data: bytes, position: int, length_of_length: int) -> Tuple[int, int]:
+    start = position + 1 + length_of_length
+    length_bytes = data[position + 1:start]
+    if len(length_bytes) != length_of_length or length_bytes[0] == 0:
+        raise _FallBack()
+    length = int.from_bytes(length_bytes, 'big')
+    if length < 56:
+        raise _FallBack()
+    return start, start + length
+
+
+def _consume_item(data: bytes, position: int, limit: int) -> Tuple[bool, int, int]:
+    """
+    Reads the prefix of the item at ``position``, and returns whether the item is a list,
+    and where its payload starts and ends.  The item must end before ``limit``.
+    """
+    if position >= limit:
+        raise _FallBack()
+
+    prefix = data[position]
+    if prefix < 0x80:
+        is_list, start, end = False, position, position + 1
+    elif prefix < 0xb8:
+        is_list, start, end = False, position + 1, position + 1 + prefix - 0x80
+        if prefix == 0x81 and end <= limit and data[start] < 0x80:
+            # a single byte that should have been encoded as itself
+            raise _FallBack()
+    elif prefix < 0xc0:
+        start, end = _consume_long_length(data, position, prefix - 0xb7)
+        is_list = False
+    elif prefix < 0xf8:
+        is_list, start, end = True, position + 1, position + 1 + prefix - 0xc0
+    else:
+        start, end = _consume_long_length(data, position, prefix - 0xf7)
+        is_list = True
+
+    if end > limit:
+        raise _FallBack()
+    return is_list, start, end
+
+
+def _decode_uint(data: bytes, is_list: bool, start: int, end: int) -> int:
+    if is_list or (end > start and data[start] == 0):
+        raise _FallBack()
+    return int.from_bytes(data[start:end], 'big')
+
+
+def _make_fixed_uint_decoder(length: int) -> Decoder:
+    def decode_fixed_uint(data: bytes, is_list: bool, start: int, end: int) -> int:
+        if is_list or end - start != length:
+            raise _FallBack()
+        return int.from_bytes(data[start:end], 'big')
+
+    return decode_fixed_uint
+
+
+def _make_binary_decoder(sedes: Binary) -> Decoder:
+    is_valid_length = sedes.is_valid_length
+
+    def decode_binary(data: bytes, is_list: bool, start: int, end: int) -> bytes:
+        if is_list or not is_valid_length(end - start):
+            raise _FallBack()
+        return data[start:end]
+
+    return decode_binary
+
+
+def _make_list_decoder(sedes: CountableList) -> Decoder:
+    decode_element = _make_decoder(sedes.element_sedes)
+    max_length = sedes.max_length
+
+    def decode_list(data: bytes, is_list: bool, start: int, end: int) -> Tuple[Any, ...]:
+        if not is_list:
+            raise _FallBack()
+        values = []
+        position = start
+        while position < end:
+            element_is_list, element_start, position = _consume_item(data, position, end)
+            values.append(decode_element(data, element_is_list, element_start, position))
+        if max_length is not None and len(values) > max_length:
+            raise _FallBack()
+        return tuple(values)
+
+    return decode_list
+
+
+def _make_decoder(sedes: Any) -> Decoder:
+    if isinstance(sedes, BigEndianInt):
+        if sedes.l is None:
+            return _decode_uint
+        else:
+            return _make_fixed_uint_decoder(sedes.l)
+    elif isinstance(sedes, Binary):
+        return _make_binary_decoder(sedes)
+    elif isinstance(sedes, CountableList):
+        return _make_list_decoder(sedes)
+    elif isinstance(sedes, type) and issubclass(sedes, rlp.Serializable):
+        return get_codec(sedes).decode_item
+    else:
+        raise TypeError("No fast decoding for the sedes {0!r}".format(sedes))
+
+
+#
+# Codecs
+#
+class SerializableCodec(Generic[TSerializable]):
+    """
+    Encodes and decodes the objects of one serializable class, with an encoder and a
+    decoder for each of its fields.  Fork-specific classes, like the transactions of each
+    fork, have codecs of their own, which produce objects of that class.
+    """
+    def __init__(self, serializable_class: Type[TSerializable]) -> None:
+        self.serializable_class = serializable_class
+        self._field_names = serializable_class._meta.field_names
+        try:
+            self._field_encoders = tuple(
+                _make_encoder(sedes) for _, sedes in serializable_class._meta.fields
+            )
+            self._field_decoders = tuple(
+                _make_decoder(sedes) for _, sedes in serializable_class._meta.fields
+            )
+        except TypeError:
+            # a field with a sedes the codecs don't know, so everything goes through rlp
+            self._field_encoders = None
+            self._field_decoders = None
+
+    def encode(self, obj: TSerializable) -> bytes:
+        """
+        Returns the same encoding of the object as :func:`rlp.encode`, which is also cached
+        on the object like that function does.
+        """
+        cached_rlp = obj._cached_rlp
+        if cached_rlp:
+            return cached_rlp
+
+        try:
+            encoded = self.encode_item(obj)
+        except _FallBack:
+            return rlp.encode(obj)
+        else:
+            obj._cached_rlp = encoded
+            return encoded
+
+    def encode_item(self, obj: TSerializable) -> bytes:
+        if self._field_encoders is None:
+            raise _FallBack()
+        elif not isinstance(obj, rlp.Serializable) or len(obj) != len(self._field_encoders):
+            raise _FallBack()
+        payload = b''.join([
+            encode_field(value)
+            for encode_field, value
+            in zip(self._field_encoders, obj)
+        ])
+        return _encode_length(len(payload), 0xc0) + payload
+
+    def decode(self, encoded: bytes) -> TSerializable:
+        """
+        Returns the same object as :func:`rlp.decode` with the class as the sedes.
+        """
+        try:
+            if not isinstance(encoded, bytes):
+                raise _FallBack()
+            is_list, start, end = _consume_item(encoded, 0, len(encoded))
+            if end != len(encoded):
+                raise _FallBack()
+            obj = self.decode_item(encoded, is_list, start, end)
+        except _FallBack:
+            return rlp.decode(encoded, sedes=self.serializable_class)
+        else:
+            obj._cached_rlp = encoded
+            return obj
+
+    def decode_item(self, data: bytes, is_list: bool, start: int, end: int) -> TSerializable:
+        if self._field_decoders is None or not is_list:
+            raise _FallBack()
+        values = []
+        position = start
+        for decode_field in self._field_decoders:
+            field_is_list, field_start, position = _consume_item(data, position, end)
+            values.append(decode_field(data, field_is_list, field_start, position))
+        if position != end:
+            raise _FallBack()
+        return self.serializable_class(**dict(zip(self._field_names, values)))
+
+
+_codecs = {}  # type: Dict[type, SerializableCodec[Any]]
+_codecs_lock = RLock()
+
+
+def get_codec(serializable_class: Type[TSerializable]) -> SerializableCodec[TSerializable]:
+    """
+    Returns the codec of the serializable class, which is generated on first use.
+    """
+    try:
+        return _codecs[serializable_class]
+    except KeyError:
+        pass
+
+    with _codecs_lock:
+        if serializable_class not in _codecs:
+            _codecs[serializable_class] = SerializableCodec(serializable_class)
+        return _codecs[serializable_class]
+
+
+def fast_encode(obj: rlp.Serializable) -> bytes:
+    """
+    Encodes a serializable object like :func:`rlp.encode`, with the codec of its class.
+    """
+    if isinstance(obj, rlp.Serializable):
+        return get_codec(type(obj)).encode(obj)
+    else:
+        return rlp.encode(obj)
+
+
+def fast_decode(encoded: bytes, sedes: Type[TSerializable]) -> TSerializable:
+    """
+    Decodes a serializable object of the class ``sedes`` like :func:`rlp.decode`, with the
+    codec of that class.
+    """
+    return get_codec(sedes).decode(encoded)
@@ -37,6 +37,9 @@ from eth.vm.execution_context import (
     ExecutionContext,
 )
 
+from .codecs import (
+    fast_encode,
+)
 from .sedes import (
     address,
     hash32,
@@ -155,7 +158,7 @@ class BlockHeader(rlp.Serializable):
     @property
     def hash(self) -> Hash32:
         if self._hash is None:
-            self._hash = keccak(rlp.encode(self))
+            self._hash = keccak(fast_encode(self))
         return self._hash
 
     @property
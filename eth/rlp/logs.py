@@ -5,10 +5,14 @@ from rlp.sedes import (
 )
 
 from typing import (
-    List,
+    Sequence,
     Tuple,
 )
 
+from eth._utils.bloom import (
+    get_bloom,
+)
+
 from .sedes import (
     address,
     uint32,
@@ -22,7 +26,7 @@ class Log(rlp.Serializable):
         ('data', binary)
     ]
 
-    def __init__(self, address: bytes, topics: List[int], data: bytes) -> None:
+    def __init__(self, address: bytes, topics: Sequence[int], data: bytes) -> None:
         super().__init__(address, topics, data)
 
     @property
@@ -32,3 +36,7 @@ class Log(rlp.Serializable):
         ) + tuple(
             uint32.serialize(topic) for topic in self.topics
         )
+
+    @property
+    def bloom(self) -> int:
+        return get_bloom(self.bloomables)
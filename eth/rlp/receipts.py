@@ -1,5 +1,3 @@
-import itertools
-
 import rlp
 from rlp.sedes import (
     big_endian_int,
@@ -34,8 +32,9 @@ class Receipt(rlp.Serializable):
                  bloom: int=None) -> None:
 
         if bloom is None:
-            bloomables = itertools.chain.from_iterable(log.bloomables for log in logs)
-            bloom = int(BloomFilter.from_iterable(bloomables))
+            bloom = 0
+            for log in logs:
+                bloom |= log.bloom
 
         super().__init__(
             state_root=state_root,
@@ -21,6 +21,9 @@ from eth_utils import (
     ValidationError,
 )
 
+from eth.rlp.codecs import (
+    fast_encode,
+)
 from eth.rlp.sedes import (
     address,
 )
@@ -31,6 +34,8 @@ from eth.vm.computation import (
 
 
 class BaseTransactionMethods:
+    _intrinsic_gas = None  # type: int
+
     def validate(self) -> None:
         """
         Hook called during instantiation to ensure that all transaction
@@ -41,9 +46,12 @@ class BaseTransactionMethods:
     @property
     def intrinsic_gas(self) -> int:
         """
-        Convenience property for the return value of `get_intrinsic_gas`
+        Convenience property for the return value of `get_intrinsic_gas`, which is only
+        computed once.
         """
-        return self.get_intrinsic_gas()
+        if self._intrinsic_gas is None:
+            self._intrinsic_gas = self.get_intrinsic_gas()
+        return self._intrinsic_gas
 
     @abstractmethod
     def get_intrinsic_gas(self) -> int:
@@ -60,7 +68,7 @@ class BaseTransactionMethods:
         for example, this is sum of the intrinsic cost and the gas used
         during computation.
         """
-        return self.get_intrinsic_gas() + computation.get_gas_used()
+        return self.intrinsic_gas + computation.get_gas_used()
 
 
 class BaseTransactionFields(rlp.Serializable):
@@ -77,12 +85,18 @@ class BaseTransactionFields(rlp.Serializable):
         ('s', big_endian_int),
     ]
 
+    _hash = None  # type: bytes
+
     @property
     def hash(self) -> bytes:
-        return keccak(rlp.encode(self))
+        if self._hash is None:
+            self._hash = keccak(fast_encode(self))
+        return self._hash
 
 
 class BaseTransaction(BaseTransactionFields, BaseTransactionMethods):
+    _sender = None  # type: Address
+
     @classmethod
     def from_base_transaction(cls, transaction: 'BaseTransaction') -> 'BaseTransaction':
         return rlp.decode(rlp.encode(transaction), sedes=cls)
@@ -90,9 +104,13 @@ class BaseTransaction(BaseTransactionFields, BaseTransactionMethods):
     @property
     def sender(self) -> Address:
         """
-        Convenience property for the return value of `get_sender`
+        Convenience property for the return value of `get_sender`, which is only recovered
+        from the signature once.  See :func:`~eth._utils.transactions.recover_senders` to
+        recover the senders of many transactions in advance.
         """
-        return self.get_sender()
+        if self._sender is None:
+            self._sender = self.get_sender()
+        return self._sender
 
     # +-------------------------------------------------------------+
     # | API that must be implemented by all Transaction subclasses. |
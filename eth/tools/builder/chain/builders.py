@@ -1,3 +1,6 @@
+from concurrent.futures import (
+    Executor,
+)
 import functools
 import time
 from typing import (
@@ -287,6 +290,10 @@ class NoVMSealValidationMixin:
     def validate_seal(cls, header: BlockHeader) -> None:
         pass
 
+    @classmethod
+    def validate_seals(cls, headers: Iterable[BlockHeader], executor: Executor=None) -> None:
+        pass
+
 
 @to_tuple
 def _mix_in_disable_seal_validation(vm_configuration: VMConfiguration) -> Iterable[VMFork]:
@@ -420,8 +427,7 @@ def import_blocks(*blocks: BaseBlock) -> Callable[[BaseChain], BaseChain]:
     """
     @functools.wraps(import_blocks)
     def _import_blocks(chain: BaseChain) -> BaseChain:
-        for block in blocks:
-            chain.import_block(block)
+        chain.import_blocks(blocks)
         return chain
 
     return _import_blocks
@@ -0,0 +1,383 @@
+"""
+A pool of the transactions that are waiting to be included in a block.
+
+Transactions are kept in a queue per sender, ordered by nonce, and in a global heap
+keyed by gas price, which decides what to evict once the pool is full.  Blocks are
+filled from the pool in order of gas price, one nonce after the other for each sender::
+
+    with chain.build_block() as builder:
+        for transaction in pool.select_for_block(builder.gas_remaining):
+            try:
+                builder.apply_transaction(transaction)
+            except ValidationError:
+                pool.remove(transaction)
+    pool.set_state(chain.get_vm().state)
+"""
+from collections import (
+    OrderedDict,
+)
+import heapq
+import itertools
+import time
+from typing import (  # noqa: F401
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+from eth_keys.exceptions import (
+    BadSignature,
+)
+from eth_typing import (
+    Address,
+)
+from eth_utils import (
+    ValidationError,
+)
+
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
+from eth.vm.state import (
+    BaseState,
+)
+
+
+# How many transactions the pool holds at most
+DEFAULT_MAX_SIZE = 8192
+
+# How many seconds a transaction stays in the pool at most
+DEFAULT_MAX_AGE = 3 * 60 * 60
+
+
+class PooledTransaction(NamedTuple('PooledTransaction', [
+    ('transaction', BaseTransaction),
+    ('sender', Address),
+    ('added_at', float),
+    ('sequence', int),
+])):
+    """
+    A transaction in the pool, along with its sender, when it was added, and a number
+    that breaks ties between transactions with the same gas price, first come first
+    served.
+    """
+    pass
+
+
+class _SenderQueue:
+    """
+    The transactions of a sender by nonce, and the account of the sender in the state
+    that the pool validates against.  The sender has to be able to afford all of its
+    transactions in the pool together, which cost at most ``max_cost``.
+    """
+    __slots__ = ['nonce', 'balance', 'by_nonce', 'max_cost']
+
+    def __init__(self, nonce: int, balance: int) -> None:
+        self.nonce = nonce
+        self.balance = balance
+        self.by_nonce = {}  # type: Dict[int, bytes]
+        self.max_cost = 0
+
+
+class TransactionPool:
+    """
+    Holds pending transactions that are valid on top of ``state``, up to ``max_size`` of
+    them, and for up to ``max_age`` seconds, according to ``clock``.
+
+    The account of each sender is only looked up in the state once, when its first
+    transaction is added, and then again when the pool moves on to another state.
+    """
+    def __init__(self,
+                 state: BaseState,
+                 max_size: int=DEFAULT_MAX_SIZE,
+                 max_age: float=DEFAULT_MAX_AGE,
+                 clock: Callable[[], float]=time.monotonic) -> None:
+        if max_size < 1:
+            raise ValidationError("The pool must have room for at least one transaction")
+        self.max_size = max_size
+        self.max_age = max_age
+        self._clock = clock
+        self._state = state
+
+        # oldest first, which is the order they expire in
+        self._transactions = OrderedDict()  # type: OrderedDict[bytes, PooledTransaction]
+        self._senders = {}  # type: Dict[Address, _SenderQueue]
+        # (gas price, sequence, hash), cheapest first.  Entries of transactions that left
+        # the pool are only dropped once they come up.
+        self._price_heap = []  # type: List[Tuple[int, int, bytes]]
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __contains__(self, transaction_hash: bytes) -> bool:
+        return transaction_hash in self._transactions
+
+    def __iter__(self) -> Iterator[PooledTransaction]:
+        return iter(tuple(self._transactions.values()))
+
+    #
+    # Adding transactions
+    #
+    def add(self, transaction: BaseTransaction) -> None:
+        """
+        Add the transaction to the pool.  It replaces the transaction of the same sender
+        with the same nonce, if it pays a higher gas price.  Adding a transaction that is
+        already in the pool does nothing.
+
+        Raise a ValidationError if the transaction can't be included in a block on top of
+        the state of the pool, if its sender can't afford it along with the other
+        transactions of the sender in the pool, or if the pool is full of transactions
+        that pay more.
+        """
+        transaction_hash = transaction.hash
+        if transaction_hash in self._transactions:
+            return
+
+        if transaction.gas < transaction.intrinsic_gas:
+            raise ValidationError("Insufficient gas")
+        if transaction.gas > self._state.gas_limit:
+            raise ValidationError(
+                "Transaction gas {0} exceeds the block gas limit {1}".format(
+                    transaction.gas,
+                    self._state.gas_limit,
+                )
+            )
+        try:
+            # the signature is valid if a sender can be recovered from it
+            sender = transaction.sender
+        except BadSignature as err:
+            raise ValidationError("Invalid signature: {0}".format(err)) from err
+
+        queue = self._get_queue(sender)
+        if transaction.nonce < queue.nonce:
+            raise ValidationError(
+                "Transaction nonce {0} is below the account nonce {1}".format(
+                    transaction.nonce,
+                    queue.nonce,
+                )
+            )
+
+        max_cost = _get_max_cost(transaction)
+        # what all of the transactions of the sender would cost, with this one
+        queue_max_cost = queue.max_cost + max_cost
+        replaced_hash = queue.by_nonce.get(transaction.nonce)
+        if replaced_hash is not None:
+            replaced = self._transactions[replaced_hash].transaction
+            if transaction.gas_price <= replaced.gas_price:
+                raise ValidationError(
+                    "Replacement transaction must pay a higher gas price than {0}".format(
+                        replaced.gas_price,
+                    )
+                )
+            queue_max_cost -= _get_max_cost(replaced)
+        if queue_max_cost > queue.balance:
+            raise ValidationError(
+                "Sender {0} cannot afford the transaction along with its other pending "
+                "transactions".format(sender.hex())
+            )
+
+        if replaced_hash is None and len(self._transactions) >= self.max_size:
+            cheapest = self._peek_cheapest()
+            if transaction.gas_price <= cheapest.transaction.gas_price:
+                raise ValidationError(
+                    "The pool is full of transactions that pay a gas price of at least "
+                    "{0}".format(cheapest.transaction.gas_price)
+                )
+            if cheapest.sender == sender and cheapest.transaction.nonce < transaction.nonce:
+                # evicting it would evict this transaction too, which can't go without it
+                raise ValidationError(
+                    "The pool is full, and the cheapest transaction in it is an earlier one "
+                    "of the same sender"
+                )
+
+        if replaced_hash is not None:
+            self._remove(replaced_hash)
+        # the queue of a new sender is only kept once it has a transaction, and that of a
+        # known one may have been dropped along with the replaced transaction
+        self._senders[sender] = queue
+
+        pooled = PooledTransaction(transaction, sender, self._clock(), next(self._sequence))
+        self._transactions[transaction_hash] = pooled
+        queue.by_nonce[transaction.nonce] = transaction_hash
+        queue.max_cost += max_cost
+        heapq.heappush(
+            self._price_heap,
+            (transaction.gas_price, pooled.sequence, transaction_hash),
+        )
+
+        while len(self._transactions) > self.max_size:
+            self._remove_with_successors(self._peek_cheapest())
+        self._compact_price_heap()
+
+    def add_many(self, transactions: Iterable[BaseTransaction]) -> Tuple[BaseTransaction, ...]:
+        """
+        Add all of the transactions that are valid, like for a batch from a peer.
+        Recover their senders in advance with
+        :func:`~eth._utils.transactions.recover_senders` to do it in parallel.
+
+        :return: the transactions that were rejected
+        """
+        rejected = []
+        for transaction in transactions:
+            try:
+                self.add(transaction)
+            except ValidationError:
+                rejected.append(transaction)
+        return tuple(rejected)
+
+    #
+    # Removing transactions
+    #
+    def remove(self, transaction: BaseTransaction) -> None:
+        """
+        Remove the transaction from the pool, like when it turned out to be invalid, along
+        with the later transactions of its sender, which can't be included without it.
+        Removing a transaction that is not in the pool does nothing.
+        """
+        pooled = self._transactions.get(transaction.hash)
+        if pooled is not None:
+            self._remove_with_successors(pooled)
+
+    def remove_expired(self) -> Tuple[BaseTransaction, ...]:
+        """
+        Remove the transactions that were added more than ``max_age`` seconds ago, along
+        with the later transactions of their senders.
+
+        :return: the transactions that were removed
+        """
+        expired_before = self._clock() - self.max_age
+        removed = []  # type: List[BaseTransaction]
+        while self._transactions:
+            oldest = next(iter(self._transactions.values()))
+            if oldest.added_at > expired_before:
+                break
+            removed.extend(self._remove_with_successors(oldest))
+        self._compact_price_heap()
+        return tuple(removed)
+
+    def set_state(self, state: BaseState) -> None:
+        """
+        Validate the pool against ``state`` from now on, like the state after the latest
+        block.  The transactions that it already includes are dropped, and so are the
+        ones that their senders can't afford anymore on top of their earlier ones, along
+        with the later ones.
+        """
+        self._state = state
+        account_db = state.account_db
+        for sender, queue in tuple(self._senders.items()):
+            queue.nonce = account_db.get_nonce(sender)
+            queue.balance = account_db.get_balance(sender)
+
+            # what the transactions up to each nonce cost together
+            max_cost = 0
+            for nonce in sorted(queue.by_nonce):
+                pooled = self._transactions[queue.by_nonce[nonce]]
+                transaction = pooled.transaction
+                if nonce < queue.nonce:
+                    self._remove(transaction.hash)
+                    continue
+
+                max_cost += _get_max_cost(transaction)
+                if max_cost > queue.balance or transaction.gas > state.gas_limit:
+                    self._remove_with_successors(pooled)
+                    break
+        self._compact_price_heap()
+
+    #
+    # Filling blocks
+    #
+    def select_for_block(self, gas_limit: int) -> Tuple[BaseTransaction, ...]:
+        """
+        Select transactions with at most ``gas_limit`` gas in total that can go into the
+        next block, highest gas price first, and in order of nonce for each sender.  The
+        transactions stay in the pool until the pool moves on to a state that includes
+        them.
+        """
+        # the max-heap of the next transaction of each sender, by gas price
+        next_transactions = []  # type: List[Tuple[int, int, Address, int]]
+        for sender, queue in self._senders.items():
+            transaction_hash = queue.by_nonce.get(queue.nonce)
+            if transaction_hash is not None:
+                pooled = self._transactions[transaction_hash]
+                next_transactions.append(
+                    (-pooled.transaction.gas_price, pooled.sequence, sender, queue.nonce)
+                )
+        heapq.heapify(next_transactions)
+
+        selected = []  # type: List[BaseTransaction]
+        gas_remaining = gas_limit
+        while next_transactions:
+            _, _, sender, nonce = heapq.heappop(next_transactions)
+            queue = self._senders[sender]
+            transaction = self._transactions[queue.by_nonce[nonce]].transaction
+            if transaction.gas > gas_remaining:
+                # none of the later transactions of the sender can go in without this one
+                continue
+
+            selected.append(transaction)
+            gas_remaining -= transaction.gas
+
+            next_hash = queue.by_nonce.get(nonce + 1)
+            if next_hash is not None:
+                pooled = self._transactions[next_hash]
+                heapq.heappush(
+                    next_transactions,
+                    (-pooled.transaction.gas_price, pooled.sequence, sender, nonce + 1),
+                )
+        return tuple(selected)
+
+    #
+    # Internals
+    #
+    def _get_queue(self, sender: Address) -> _SenderQueue:
+        """
+        Return the queue of the sender, or a new one that is not in the pool yet.
+        """
+        try:
+            return self._senders[sender]
+        except KeyError:
+            account_db = self._state.account_db
+            return _SenderQueue(account_db.get_nonce(sender), account_db.get_balance(sender))
+
+    def _peek_cheapest(self) -> PooledTransaction:
+        price_heap = self._price_heap
+        while True:
+            _, sequence, transaction_hash = price_heap[0]
+            pooled = self._transactions.get(transaction_hash)
+            if pooled is not None and pooled.sequence == sequence:
+                return pooled
+            heapq.heappop(price_heap)
+
+    def _remove(self, transaction_hash: bytes) -> PooledTransaction:
+        pooled = self._transactions.pop(transaction_hash)
+        queue = self._senders[pooled.sender]
+        del queue.by_nonce[pooled.transaction.nonce]
+        queue.max_cost -= _get_max_cost(pooled.transaction)
+        if not queue.by_nonce:
+            del self._senders[pooled.sender]
+        return pooled
+
+    def _remove_with_successors(self, pooled: PooledTransaction) -> List[BaseTransaction]:
+        queue = self._senders[pooled.sender]
+        removed = []
+        nonce = pooled.transaction.nonce
+        for later_nonce in sorted(n for n in queue.by_nonce if n >= nonce):
+            removed.append(self._remove(queue.by_nonce[later_nonce]).transaction)
+        return removed
+
+    def _compact_price_heap(self) -> None:
+        if len(self._price_heap) > 2 * len(self._transactions) + 64:
+            self._price_heap = [
+                (pooled.transaction.gas_price, pooled.sequence, transaction_hash)
+                for transaction_hash, pooled in self._transactions.items()
+            ]
+            heapq.heapify(self._price_heap)
+
+
+def _get_max_cost(transaction: BaseTransaction) -> int:
+    return transaction.gas * transaction.gas_price + transaction.value
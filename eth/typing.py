@@ -25,6 +25,7 @@ from mypy_extensions import (
 )
 
 if TYPE_CHECKING:
+    from eth.rlp.blocks import BaseBlock, LazyBlock  # noqa: F401
     from eth.rlp.transactions import BaseTransaction  # noqa: F401
     from eth.vm.spoof import SpoofTransaction  # noqa: F401
     from eth.vm.base import BaseVM  # noqa: F401
@@ -44,6 +45,10 @@ AccountDiff = Iterable[Tuple[Address, str, Union[int, bytes], Union[int, bytes]]
 
 BaseOrSpoofTransaction = Union['BaseTransaction', 'SpoofTransaction']
 
+BlockOrLazyBlock = Union['BaseBlock', 'LazyBlock']
+
+BlockImportResult = Tuple['BaseBlock', Tuple[BlockOrLazyBlock, ...], Tuple[BlockOrLazyBlock, ...]]
+
 GeneralState = Union[
     AccountState,
     List[Tuple[Address, Dict[str, Union[int, bytes, Dict[int, int]]]]]
@@ -3,6 +3,7 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from concurrent.futures import Executor
 import contextlib
 import itertools
 import logging
@@ -18,10 +19,6 @@ from typing import Set  # noqa: F401
 
 import rlp
 
-from eth_bloom import (
-    BloomFilter,
-)
-
 from eth_typing import (
     Address,
     Hash32,
@@ -34,12 +31,17 @@ from eth_utils import (
 from eth_hash.auto import keccak
 from eth.consensus.pow import (
     check_pow,
+    check_pow_many,
 )
 from eth.constants import (
     GENESIS_PARENT_HASH,
     MAX_PREV_HEADER_DEPTH,
     MAX_UNCLES,
 )
+from eth.db.account import (
+    BaseAccountDB,
+    ReadOnlyAccountDB,
+)
 from eth.db.trie import make_trie_root_and_nodes
 from eth.db.chain import BaseChainDB  # noqa: F401
 from eth.exceptions import (
@@ -69,6 +71,9 @@ from eth._utils.db import (
 from eth._utils.headers import (
     generate_header_from_parent_header,
 )
+from eth._utils.transactions import (
+    recover_senders,
+)
 from eth.validation import (
     validate_length_lte,
     validate_gas_limit,
@@ -76,8 +81,18 @@ from eth.validation import (
 from eth.vm.message import (
     Message,
 )
+from eth.vm.prefetch import (
+    StatePrefetcher,
+)
+from eth.vm.speculation import (
+    apply_transactions_speculatively,
+    RecordingAccountDB,
+)
 from eth.vm.state import BaseState
-from eth.vm.computation import BaseComputation
+from eth.vm.computation import (
+    BaseComputation,
+    ComputationResult,
+)
 
 
 class BaseVM(Configurable, ABC):
@@ -86,6 +101,8 @@ class BaseVM(Configurable, ABC):
     fork = None  # type: str
     chaindb = None  # type: BaseChainDB
     _state_class = None  # type: Type[BaseState]
+    # Whether the receipt of each transaction includes the state root after it
+    receipts_have_state_root = True
 
     @property
     @abstractmethod
@@ -131,7 +148,8 @@ class BaseVM(Configurable, ABC):
     def apply_all_transactions(
             self,
             transactions: Tuple[BaseTransaction, ...],
-            base_header: BlockHeader
+            base_header: BlockHeader,
+            prefetcher: StatePrefetcher=None
     ) -> Tuple[BlockHeader, Tuple[Receipt, ...], Tuple[BaseComputation, ...]]:
         raise NotImplementedError("VM classes must implement this method")
 
@@ -139,7 +157,7 @@ class BaseVM(Configurable, ABC):
     def make_receipt(self,
                      base_header: BlockHeader,
                      transaction: BaseTransaction,
-                     computation: BaseComputation,
+                     computation: ComputationResult,
                      state: BaseState) -> Receipt:
         """
         Generate the receipt resulting from applying the transaction.
@@ -157,7 +175,11 @@ class BaseVM(Configurable, ABC):
     # Mining
     #
     @abstractmethod
-    def import_block(self, block: BaseBlock) -> BaseBlock:
+    def import_block(self,
+                     block: BaseBlock,
+                     parent_state: BaseState=None,
+                     speculative_executor: Executor=None,
+                     prefetcher: StatePrefetcher=None) -> BaseBlock:
         raise NotImplementedError("VM classes must implement this method")
 
     @abstractmethod
@@ -334,6 +356,11 @@ class BaseVM(Configurable, ABC):
     def validate_seal(cls, header: BlockHeader) -> None:
         raise NotImplementedError("VM classes must implement this method")
 
+    @classmethod
+    @abstractmethod
+    def validate_seals(cls, headers: Iterable[BlockHeader], executor: Executor=None) -> None:
+        raise NotImplementedError("VM classes must implement this method")
+
     @classmethod
     @abstractmethod
     def validate_uncle(
@@ -350,7 +377,7 @@ class BaseVM(Configurable, ABC):
 
     @abstractmethod
     @contextlib.contextmanager
-    def state_in_temp_block(self) -> Iterator[BaseState]:
+    def state_in_temp_block(self, read_only: bool=False) -> Iterator[BaseState]:
         raise NotImplementedError("VM classes must implement this method")
 
 
@@ -405,12 +432,12 @@ class VM(BaseVM):
         :param transaction: to apply
         """
         self.validate_transaction_against_header(header, transaction)
-        state_root, computation = self.state.apply_transaction(transaction)
+        state_root, computation, _ = self.state.apply_transaction(transaction)
         receipt = self.make_receipt(header, transaction, computation, self.state)
         self.validate_receipt(receipt)
 
         new_header = header.copy(
-            bloom=int(BloomFilter(header.bloom) | receipt.bloom),
+            bloom=header.bloom | receipt.bloom,
             gas_used=receipt.gas_used,
             state_root=state_root,
         )
@@ -462,7 +489,8 @@ class VM(BaseVM):
     def apply_all_transactions(
             self,
             transactions: Tuple[BaseTransaction, ...],
-            base_header: BlockHeader
+            base_header: BlockHeader,
+            prefetcher: StatePrefetcher=None
     ) -> Tuple[BlockHeader, Tuple[Receipt, ...], Tuple[BaseComputation, ...]]:
         """
         Determine the results of applying all transactions to the base header.
@@ -470,6 +498,7 @@ class VM(BaseVM):
 
         :param transactions: an iterable of all transactions to apply
         :param base_header: the starting header to apply transactions to
+        :param prefetcher: loads the state the transactions need ahead of their execution
         :return: the final header, the receipts of each transaction, and the computations
         """
         if base_header.block_number != self.block.number:
@@ -481,6 +510,23 @@ class VM(BaseVM):
                 )
             )
 
+        if prefetcher is None:
+            return self._apply_all_transactions(transactions, base_header)
+
+        with prefetcher.prefetch(self.state, transactions) as prefetch_db:
+            result = self._apply_all_transactions(transactions, base_header)
+        self.logger.debug(
+            "Prefetching saved %d cold reads for %d transactions",
+            prefetch_db.cold_reads_saved,
+            len(transactions),
+        )
+        return result
+
+    def _apply_all_transactions(
+            self,
+            transactions: Tuple[BaseTransaction, ...],
+            base_header: BlockHeader
+    ) -> Tuple[BlockHeader, Tuple[Receipt, ...], Tuple[BaseComputation, ...]]:
         receipts = []
         computations = []
         previous_header = base_header
@@ -504,9 +550,21 @@ class VM(BaseVM):
     #
     # Mining
     #
-    def import_block(self, block: BaseBlock) -> BaseBlock:
+    def import_block(self,
+                     block: BaseBlock,
+                     parent_state: BaseState=None,
+                     speculative_executor: Executor=None,
+                     prefetcher: StatePrefetcher=None) -> BaseBlock:
         """
         Import the given block to the chain.
+
+        ``parent_state`` may be the state left behind by importing the parent block.  If it's
+        at the state root this block starts from, its account database, along with all the
+        accounts it has cached, is carried on with instead of starting from an empty one.
+
+        If ``speculative_executor`` is given, the transactions of the block are executed
+        in it ahead of time, see :mod:`eth.vm.speculation`.  Otherwise, ``prefetcher`` may
+        load the state they need ahead of time.
         """
         if self.block.number != block.number:
             raise ValidationError(
@@ -528,15 +586,43 @@ class VM(BaseVM):
             ),
             uncles=block.uncles,
         )
+        if speculative_executor is None:
+            account_db_class = self.get_state_class().get_account_db_class()
+        else:
+            account_db_class = RecordingAccountDB
+
+        if parent_state is not None and self._can_carry_on_from(parent_state, account_db_class):
+            account_db = parent_state.account_db
+        elif speculative_executor is not None:
+            account_db = RecordingAccountDB(self.chaindb.db, self.block.header.state_root)
+        else:
+            account_db = None
+
         # we need to re-initialize the `state` to update the execution context.
         self._state = self.get_state_class()(
             db=self.chaindb.db,
             execution_context=self.block.header.create_execution_context(self.previous_hashes),
             state_root=self.block.header.state_root,
+            account_db=account_db,
         )
 
+        # recover all of the senders up front, unless the chain already did so in parallel.
+        recover_senders(block.transactions)
+
         # run all of the transactions.
-        new_header, receipts, _ = self.apply_all_transactions(block.transactions, self.block.header)
+        if speculative_executor is None:
+            new_header, receipts, _ = self.apply_all_transactions(
+                block.transactions,
+                self.block.header,
+                prefetcher,
+            )
+        else:
+            new_header, receipts = apply_transactions_speculatively(
+                self,
+                block.transactions,
+                self.block.header,
+                speculative_executor,
+            )
 
         self.block = self.set_block_transactions(
             self.block,
@@ -547,6 +633,16 @@ class VM(BaseVM):
 
         return self.mine_block()
 
+    def _can_carry_on_from(self,
+                           parent_state: BaseState,
+                           account_db_class: Type[BaseAccountDB]) -> bool:
+        # The header may have been configured with a different state root than the one the
+        # parent state ended with, like in the DAO fork block.
+        return (
+            type(parent_state.account_db) is account_db_class and
+            parent_state.state_root == self.block.header.state_root
+        )
+
     def mine_block(self, *args: Any, **kwargs: Any) -> BaseBlock:
         """
         Mine the current block. Proxies to self.pack_block method.
@@ -571,9 +667,11 @@ class VM(BaseVM):
 
         tx_root_hash, tx_kv_nodes = make_trie_root_and_nodes(transactions)
         self.chaindb.persist_trie_data_dict(tx_kv_nodes)
+        self.chaindb.persist_transaction_list(tx_root_hash, transactions)
 
         receipt_root_hash, receipt_kv_nodes = make_trie_root_and_nodes(receipts)
         self.chaindb.persist_trie_data_dict(receipt_kv_nodes)
+        self.chaindb.persist_receipt_list(receipt_root_hash, receipts)
 
         return base_block.copy(
             transactions=transactions,
@@ -693,8 +791,20 @@ class VM(BaseVM):
                         last_block_hash: Hash32,
                         chaindb: BaseChainDB) -> Optional[Iterable[Hash32]]:
         if last_block_hash == GENESIS_PARENT_HASH:
-            return
+            return tuple()
 
+        recent_canonical_hashes = chaindb.get_recent_canonical_hashes(
+            last_block_hash,
+            MAX_PREV_HEADER_DEPTH,
+        )
+        if recent_canonical_hashes:
+            return recent_canonical_hashes
+        else:
+            # Not a recent canonical block, so lazily walk the ancestor headers instead
+            return cls._walk_prev_hashes(last_block_hash, chaindb)
+
+    @staticmethod
+    def _walk_prev_hashes(last_block_hash: Hash32, chaindb: BaseChainDB) -> Iterable[Hash32]:
         block_header = get_block_header_by_hash(last_block_hash, chaindb)
 
         for _ in range(MAX_PREV_HEADER_DEPTH):
@@ -875,6 +985,14 @@ class VM(BaseVM):
             header.block_number, header.mining_hash,
             header.mix_hash, header.nonce, header.difficulty)
 
+    @classmethod
+    def validate_seals(cls, headers: Iterable[BlockHeader], executor: Executor=None) -> None:
+        """
+        Validate the seals on all of the given headers, spread across the workers of
+        ``executor`` if there is one.  See :func:`~eth.consensus.pow.check_pow_many`.
+        """
+        check_pow_many(headers, executor)
+
     @classmethod
     def validate_uncle(cls, block: BaseBlock, uncle: BaseBlock, uncle_parent: BaseBlock) -> None:
         """
@@ -912,15 +1030,32 @@ class VM(BaseVM):
         return cls._state_class
 
     @contextlib.contextmanager
-    def state_in_temp_block(self) -> Iterator[BaseState]:
+    def state_in_temp_block(self, read_only: bool=False) -> Iterator[BaseState]:
+        """
+        Yield a state for executing on top of this VM's block, which is reverted when the
+        context exits.
+
+        :param read_only: keep all changes in memory with a
+            :class:`~eth.db.account.ReadOnlyAccountDB`, which is cheaper and can run
+            alongside writers to the database, but can't make state roots
+        """
         header = self.block.header
         temp_block = self.generate_block_from_parent_header_and_coinbase(header, header.coinbase)
         prev_hashes = itertools.chain((header.hash, ), self.previous_hashes)
 
+        if read_only:
+            account_db = ReadOnlyAccountDB(
+                self.chaindb.db,
+                temp_block.header.state_root,
+            )  # type: BaseAccountDB
+        else:
+            account_db = None
+
         state = self.get_state_class()(
             db=self.chaindb.db,
             execution_context=temp_block.header.create_execution_context(prev_hashes),
             state_root=temp_block.header.state_root,
+            account_db=account_db,
         )
 
         snapshot = state.snapshot()
@@ -0,0 +1,170 @@
+from typing import (  # noqa: F401
+    List,
+    Tuple,
+    TYPE_CHECKING,
+)
+from uuid import UUID  # noqa: F401
+
+from eth_utils import (
+    ValidationError,
+)
+
+from eth.rlp.blocks import (
+    BaseBlock,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
+from eth.vm.computation import (
+    BaseComputation,
+)
+
+if TYPE_CHECKING:
+    from eth.vm.base import (  # noqa: F401
+        BaseVM,
+    )
+
+
+Snapshot = Tuple[bytes, Tuple[UUID, UUID]]
+
+
+class BlockBuilder:
+    """
+    Applies transactions to the current block of a VM one after the other, with only a
+    constant amount of bookkeeping for each of them.
+
+    The transaction and receipt tries of the block are only made once it is finished.  So
+    is its state root, unless the VM's receipts include the state root after every
+    transaction, like before Byzantium.  The last transaction that was applied can be
+    rolled back, like when it made the block use more gas than it should.
+    """
+    def __init__(self, vm: 'BaseVM') -> None:
+        self.vm = vm
+        block = vm.block
+        self._header = block.header
+        self._bloom = block.header.bloom
+        self._transactions = list(block.transactions)  # type: List[BaseTransaction]
+        self._receipts = list(block.get_receipts(vm.chaindb))  # type: List[Receipt]
+        # what the block was before the last transaction, if it can be rolled back
+        self._before_last = None  # type: Tuple[BlockHeader, int, Snapshot]
+        self._is_finished = False
+
+    @property
+    def header(self) -> BlockHeader:
+        """
+        The header of the block so far.  Only its gas used is kept up to date, while the
+        rest, like its bloom and the roots, are only set when the block is finished.
+        """
+        return self._header
+
+    @property
+    def gas_remaining(self) -> int:
+        return self._header.gas_limit - self._header.gas_used
+
+    @property
+    def transactions(self) -> Tuple[BaseTransaction, ...]:
+        return tuple(self._transactions)
+
+    @property
+    def receipts(self) -> Tuple[Receipt, ...]:
+        return tuple(self._receipts)
+
+    def apply_transaction(self,
+                          transaction: BaseTransaction) -> Tuple[Receipt, BaseComputation]:
+        """
+        Apply the transaction to the block.  If it is invalid, the block stays as it was.
+
+        :return: the receipt of the transaction, and its computation
+        """
+        self._validate_not_finished()
+        vm = self.vm
+        state = vm.state
+        vm.validate_transaction_against_header(self._header, transaction)
+
+        if self._before_last is not None and not vm.receipts_have_state_root:
+            # merge the changes of the previous transaction into the rest of the block, so
+            # that lookups don't get slower with every transaction
+            _, _, previous_snapshot = self._before_last
+            state.commit(previous_snapshot)
+        self._before_last = None
+
+        snapshot = state.snapshot()
+        try:
+            computation = state.execute_transaction(transaction)
+        except Exception:
+            state.revert(snapshot)
+            raise
+
+        if vm.receipts_have_state_root:
+            # The receipt needs the state root.  Persisting it is also what keeps the state
+            # before the transaction around to roll back to.
+            state.account_db.persist()
+
+        receipt = vm.make_receipt(self._header, transaction, computation, state)
+        vm.validate_receipt(receipt)
+
+        self._before_last = (self._header, self._bloom, snapshot)
+        self._header = self._header.copy(gas_used=receipt.gas_used)
+        self._bloom |= receipt.bloom
+        self._transactions.append(transaction)
+        self._receipts.append(receipt)
+
+        return receipt, computation
+
+    def rollback(self) -> None:
+        """
+        Undo the last transaction that was applied.  Only the very last one can be rolled
+        back, and only once.
+        """
+        self._validate_not_finished()
+        if self._before_last is None:
+            raise ValidationError("There is no transaction to roll back")
+
+        header, bloom, snapshot = self._before_last
+        state = self.vm.state
+        if self.vm.receipts_have_state_root:
+            # The changes of the transaction were persisted, so going back to the state root
+            # before it is all there is to do, along with discarding a fresh changeset to
+            # drop the accounts that were cached since.
+            state_root, _ = snapshot
+            state.revert((state_root, state.account_db.record()))
+        else:
+            state.revert(snapshot)
+
+        self._before_last = None
+        self._header = header
+        self._bloom = bloom
+        self._transactions.pop()
+        self._receipts.pop()
+
+    def finish(self) -> BaseBlock:
+        """
+        Make the state root and the transaction and receipt tries of the block, and set
+        the block as the block of the VM.  Nothing can be applied to it afterwards.
+        """
+        self._validate_not_finished()
+        self._is_finished = True
+
+        vm = self.vm
+        vm.state.account_db.persist()
+        header = self._header.copy(
+            bloom=self._bloom,
+            state_root=vm.state.state_root,
+        )
+        vm.block = vm.set_block_transactions(
+            vm.block,
+            header,
+            tuple(self._transactions),
+            tuple(self._receipts),
+        )
+        return vm.block
+
+    def _validate_not_finished(self) -> None:
+        if self._is_finished:
+            raise ValidationError("The block was already finished")
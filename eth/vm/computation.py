@@ -10,6 +10,7 @@ from typing import (  # noqa: F401
     cast,
     Dict,
     List,
+    Sequence,
     Tuple,
     Union,
 )
@@ -84,7 +85,35 @@ def memory_gas_cost(size_in_bytes: int) -> int:
     return total_cost
 
 
-class BaseComputation(Configurable, ABC):
+class ComputationResult(ABC):
+    """
+    The outcome of running a transaction, as far as making its receipt is concerned.
+    """
+    @property
+    @abstractmethod
+    def is_error(self) -> bool:
+        """
+        Return ``True`` if the transaction resulted in an error.
+        """
+        raise NotImplementedError("Must be implemented by subclasses")
+
+    @abstractmethod
+    def get_log_entries(self) -> Tuple[Tuple[bytes, Sequence[int], bytes], ...]:
+        """
+        Return the ``(address, topics, data)`` of the logs of the transaction, in order.
+        """
+        raise NotImplementedError("Must be implemented by subclasses")
+
+    @abstractmethod
+    def get_gas_remaining(self) -> int:
+        raise NotImplementedError("Must be implemented by subclasses")
+
+    @abstractmethod
+    def get_gas_refund(self) -> int:
+        raise NotImplementedError("Must be implemented by subclasses")
+
+
+class BaseComputation(Configurable, ComputationResult):
     """
     The base class for all execution computations.
 
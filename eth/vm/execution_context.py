@@ -1,5 +1,8 @@
+from collections import abc
 from typing import (
     Iterable,
+    Sequence,
+    Union,
 )
 
 from eth_typing import (
@@ -10,6 +13,9 @@ from eth_typing import (
 from eth._utils.generator import CachedIterable
 
 
+PrevHashes = Union[Sequence[Hash32], CachedIterable[Hash32]]
+
+
 class ExecutionContext:
     _coinbase = None
 
@@ -17,7 +23,7 @@ class ExecutionContext:
     _number = None
     _difficulty = None
     _gas_limit = None
-    _prev_hashes = None
+    _prev_hashes = None  # type: PrevHashes
 
     def __init__(
             self,
@@ -32,7 +38,10 @@ class ExecutionContext:
         self._block_number = block_number
         self._difficulty = difficulty
         self._gas_limit = gas_limit
-        self._prev_hashes = CachedIterable(prev_hashes)
+        if isinstance(prev_hashes, abc.Sequence):
+            self._prev_hashes = prev_hashes
+        else:
+            self._prev_hashes = CachedIterable(prev_hashes)
 
     @property
     def coinbase(self) -> Address:
@@ -55,5 +64,9 @@ class ExecutionContext:
         return self._gas_limit
 
     @property
-    def prev_hashes(self) -> Iterable[Hash32]:
+    def prev_hashes(self) -> PrevHashes:
+        """
+        The hashes of the ancestors of this block, most recent first. Supports
+        lookups by index, so that the ``BLOCKHASH`` opcode doesn't need to walk them.
+        """
         return self._prev_hashes
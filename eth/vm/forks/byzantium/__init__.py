@@ -23,7 +23,7 @@ from eth.validation import (
 )
 from eth.vm.forks.spurious_dragon import SpuriousDragonVM
 from eth.vm.forks.frontier import make_frontier_receipt
-from eth.vm.computation import BaseComputation
+from eth.vm.computation import ComputationResult
 from eth.vm.state import BaseState  # noqa: F401
 
 from .blocks import ByzantiumBlock
@@ -42,7 +42,7 @@ from .state import ByzantiumState
 
 def make_byzantium_receipt(base_header: BlockHeader,
                            transaction: BaseTransaction,
-                           computation: BaseComputation,
+                           computation: ComputationResult,
                            state: BaseState) -> Receipt:
     frontier_receipt = make_frontier_receipt(base_header, transaction, computation, state)
 
@@ -80,6 +80,7 @@ class ByzantiumVM(SpuriousDragonVM):
     compute_difficulty = staticmethod(compute_byzantium_difficulty)     # type: ignore
     configure_header = configure_byzantium_header
     make_receipt = staticmethod(make_byzantium_receipt)     # type: ignore
+    receipts_have_state_root = False
     # Separated into two steps due to mypy bug of staticmethod.
     # https://github.com/python/mypy/issues/5530
     get_uncle_reward = get_uncle_reward(EIP649_BLOCK_REWARD)
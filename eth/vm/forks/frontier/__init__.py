@@ -12,7 +12,7 @@ from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransaction
 
 from eth.vm.base import VM
-from eth.vm.computation import BaseComputation
+from eth.vm.computation import ComputationResult
 from eth.vm.state import BaseState  # noqa: F401
 
 from .blocks import FrontierBlock
@@ -27,7 +27,7 @@ from .validation import validate_frontier_transaction_against_header
 
 def make_frontier_receipt(base_header: BlockHeader,
                           transaction: BaseTransaction,
-                          computation: BaseComputation,
+                          computation: ComputationResult,
                           state: BaseState) -> Receipt:
     # Reusable for other forks
 
@@ -0,0 +1,255 @@
+"""
+Loading the state that the transactions of a block will need, while the ones before
+them are still executing.
+
+The senders and recipients of the transactions are known from the block body, so worker
+threads can look up their accounts and code, along with every trie node on the way.
+Optionally, the workers also run each transaction ahead of time against the state before
+the block, which additionally loads the storage it touches.  Database backends like
+LevelDB release the GIL while reading, so the workers wait on the disk in parallel with
+the execution.
+"""
+from concurrent.futures import (
+    Executor,
+)
+import contextlib
+from typing import (  # noqa: F401
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Set,
+    Type,
+)
+
+from trie import (
+    HexaryTrie,
+)
+
+from eth_keys.exceptions import (
+    BadSignature,
+)
+from eth_typing import (
+    Address,
+    Hash32,
+)
+from eth_utils import (
+    ValidationError,
+)
+from eth_utils.toolz import (
+    partition_all,
+)
+
+from eth.constants import (
+    EMPTY_SHA3,
+)
+from eth.db.backends.base import (
+    BaseDB,
+)
+from eth.db.hash_trie import (
+    HashTrie,
+)
+from eth.rlp.accounts import (
+    decode_account,
+)
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
+from eth.vm.execution_context import (
+    ExecutionContext,
+)
+from eth.vm.state import (
+    BaseState,
+)
+
+
+# How many transactions each task of a worker prefetches for
+PREFETCH_BATCH_SIZE = 4
+
+
+class PrefetchDB(BaseDB):
+    """
+    Reads through to a database, but serves what the workers of a
+    :class:`StatePrefetcher` already loaded from it.
+
+    Only values that are stored under their own hash, like trie nodes and code, are ever
+    prefetched.  Those can't change, so they are as good as new whenever they were loaded.
+    """
+    def __init__(self, wrapped_db: BaseDB) -> None:
+        self.wrapped_db = wrapped_db
+        self._prefetched = {}  # type: Dict[bytes, bytes]
+        self._used = set()  # type: Set[bytes]
+
+    @property
+    def cold_reads_saved(self) -> int:
+        """
+        How many of the values that were read through this database were already loaded
+        """
+        return len(self._used)
+
+    def prefetch(self, key: bytes) -> bytes:
+        """
+        Load the value at ``key``, so that reading it later doesn't have to wait for the
+        database.  This is safe to call from any thread.
+        """
+        try:
+            return self._prefetched[key]
+        except KeyError:
+            value = self.wrapped_db[key]
+            self._prefetched[key] = value
+            return value
+
+    def __getitem__(self, key: bytes) -> bytes:
+        try:
+            value = self._prefetched[key]
+        except KeyError:
+            return self.wrapped_db[key]
+        else:
+            self._used.add(key)
+            return value
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self.wrapped_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        self._prefetched.pop(key, None)
+        del self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self._prefetched or key in self.wrapped_db
+
+
+class _PrefetchingView(BaseDB):
+    """
+    How the workers see the database: every value they read is prefetched.
+    """
+    def __init__(self, prefetch_db: PrefetchDB) -> None:
+        self._prefetch_db = prefetch_db
+
+    def __getitem__(self, key: bytes) -> bytes:
+        return self._prefetch_db.prefetch(key)
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        raise TypeError("Prefetching never writes to the database")
+
+    def __delitem__(self, key: bytes) -> None:
+        raise TypeError("Prefetching never writes to the database")
+
+
+class StatePrefetcher:
+    """
+    Loads the state that transactions will need in the threads of ``executor``, ahead
+    of their execution.
+
+    If ``pre_execute`` is set, each transaction is also run against the state before
+    them, without validating or finalizing it, to find the storage it will touch.
+    Speculative import already executes every transaction ahead of time, so this is not
+    used along with it.
+    """
+    def __init__(self, executor: Executor, pre_execute: bool=False) -> None:
+        self.executor = executor
+        self.pre_execute = pre_execute
+
+    @contextlib.contextmanager
+    def prefetch(self,
+                 state: BaseState,
+                 transactions: Sequence[BaseTransaction]) -> Iterator[PrefetchDB]:
+        """
+        Start prefetching what ``transactions`` need from the persisted state of
+        ``state``, and read through everything that was prefetched in ``state``, until
+        the context exits.
+        """
+        prefetch_db = PrefetchDB(state._db)
+        view = _PrefetchingView(prefetch_db)
+        state_root = Hash32(state.state_root)
+
+        futures = [
+            self.executor.submit(_prefetch_accounts, view, state_root, [state.coinbase]),
+        ]
+        if self.pre_execute:
+            # the previous hashes are usually lazy, which can't be shared between threads
+            execution_context = ExecutionContext(
+                coinbase=state.coinbase,
+                timestamp=state.timestamp,
+                block_number=state.block_number,
+                difficulty=state.difficulty,
+                gas_limit=state.gas_limit,
+                prev_hashes=tuple(state.execution_context.prev_hashes),
+            )
+            futures.extend(
+                self.executor.submit(
+                    _pre_execute,
+                    type(state),
+                    view,
+                    execution_context,
+                    state_root,
+                    batch,
+                )
+                for batch in partition_all(PREFETCH_BATCH_SIZE, transactions)
+            )
+        else:
+            futures.extend(
+                self.executor.submit(_prefetch_transactions, view, state_root, batch)
+                for batch in partition_all(PREFETCH_BATCH_SIZE, transactions)
+            )
+
+        try:
+            with state.account_db.reading_through(prefetch_db):
+                yield prefetch_db
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _get_addresses(transactions: Iterable[BaseTransaction]) -> List[Address]:
+    addresses = []
+    for transaction in transactions:
+        try:
+            addresses.append(transaction.sender)
+        except (BadSignature, ValidationError):
+            # the transaction is invalid, which its execution will find out
+            pass
+        if transaction.to:
+            addresses.append(transaction.to)
+    return addresses
+
+
+def _prefetch_accounts(view: _PrefetchingView,
+                       state_root: Hash32,
+                       addresses: Iterable[Address]) -> None:
+    account_trie = HashTrie(HexaryTrie(view, state_root))
+    for address in addresses:
+        rlp_account = account_trie.get(address, b'')
+        if rlp_account:
+            account = decode_account(rlp_account)
+            if account.code_hash != EMPTY_SHA3:
+                try:
+                    view[account.code_hash]
+                except KeyError:
+                    pass
+
+
+def _prefetch_transactions(view: _PrefetchingView,
+                           state_root: Hash32,
+                           transactions: Iterable[BaseTransaction]) -> None:
+    _prefetch_accounts(view, state_root, _get_addresses(transactions))
+
+
+def _pre_execute(state_class: Type[BaseState],
+                 view: _PrefetchingView,
+                 execution_context: ExecutionContext,
+                 state_root: Hash32,
+                 transactions: Iterable[BaseTransaction]) -> None:
+    _prefetch_transactions(view, state_root, transactions)
+
+    state = state_class(view, execution_context, state_root)
+    transaction_executor = state.get_transaction_executor()
+    for transaction in transactions:
+        try:
+            message = transaction_executor.build_evm_message(transaction)
+            transaction_executor.build_computation(message, transaction)
+        except ValidationError:
+            # the state before the block may not be good enough to get that far,
+            # like for the balance of a sender who is paid earlier in the block
+            pass
@@ -0,0 +1,531 @@
+"""
+Optimistic execution of the transactions of a block.
+
+Every transaction of the block is executed by workers against the state before the block,
+as if it was the only one.  The results are then committed in block order: each
+transaction is checked against everything the transactions before it wrote, and it is
+executed again, for real, if it read any of that.  Everything else comes out exactly like
+it would have, had the transactions been executed one after the other.
+"""
+from concurrent.futures import (
+    Executor,
+)
+from typing import (  # noqa: F401
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+    Union,
+)
+
+from eth_typing import (
+    Address,
+    Hash32,
+)
+from eth_utils import (
+    ValidationError,
+)
+from eth_utils.toolz import (
+    concat,
+    partition_all,
+)
+
+from eth.db.account import (
+    AccountDB,
+)
+from eth.db.backends.base import (
+    BaseDB,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
+from eth.vm.computation import (
+    ComputationResult,
+)
+from eth.vm.execution_context import (
+    ExecutionContext,
+)
+from eth.vm.state import (
+    BaseState,
+)
+
+if TYPE_CHECKING:
+    from eth.vm.base import (  # noqa: F401
+        BaseVM,
+    )
+
+
+# How many transactions each worker executes at a time
+SPECULATION_BATCH_SIZE = 8
+
+# The parts of an account that a transaction may read or write.  Storage slots are
+# identified by their number instead.
+BALANCE = 'balance'
+NONCE = 'nonce'
+CODE = 'code'
+EXISTS = 'exists'
+# Any of the storage of an account, which is read when it's cleared
+STORAGE = 'storage'
+# All of the storage of an account, which is written when it's cleared
+CLEARED_STORAGE = 'cleared storage'
+
+AccessKey = Tuple[Address, Union[str, int]]
+
+LogEntry = Tuple[bytes, Tuple[int, ...], bytes]
+
+
+class AccountChanges(NamedTuple('AccountChanges', [
+    ('address', Address),
+    ('exists', bool),
+    ('balance', Optional[int]),
+    ('balance_delta', int),
+    ('nonce', Optional[int]),
+    ('code', Optional[bytes]),
+    ('is_storage_cleared', bool),
+    ('storage', Tuple[Tuple[int, int], ...]),
+])):
+    """
+    How a transaction changed an account, relative to the state it was executed against.
+
+    Parts of the account that weren't changed are None.  The balance is only changed by
+    ``balance_delta`` if the transaction never looked at it, like the balance of the
+    coinbase.
+    """
+    def apply(self, account_db: AccountDB) -> None:
+        if not self.exists:
+            account_db.delete_account(self.address)
+            return
+
+        if self.is_storage_cleared:
+            account_db.delete_storage(self.address)
+        for slot, value in self.storage:
+            account_db.set_storage(self.address, slot, value)
+
+        if self.balance is not None:
+            account_db.set_balance(self.address, self.balance)
+        elif self.balance_delta:
+            account_db.delta_balance(self.address, self.balance_delta)
+        if self.nonce is not None:
+            account_db.set_nonce(self.address, self.nonce)
+        if self.code is not None:
+            account_db.set_code(self.address, self.code)
+
+        account_db.touch_account(self.address)
+
+
+class SpeculativeResult(NamedTuple('SpeculativeResult', [
+    ('reads', FrozenSet[AccessKey]),
+    ('writes', FrozenSet[AccessKey]),
+    ('account_changes', Tuple[AccountChanges, ...]),
+    ('log_entries', Tuple[LogEntry, ...]),
+    ('gas_remaining', int),
+    ('gas_refund', int),
+    ('is_error', bool),
+]), ComputationResult):
+    """
+    The outcome of executing a transaction against the state before its block.
+
+    It stands in for the computation of the transaction when making its receipt.
+    """
+    def get_log_entries(self) -> Tuple[LogEntry, ...]:
+        return self.log_entries
+
+    def get_gas_remaining(self) -> int:
+        return self.gas_remaining
+
+    def get_gas_refund(self) -> int:
+        return self.gas_refund
+
+
+class RecordingAccountDB(AccountDB):
+    """
+    An :class:`~eth.db.account.AccountDB` which can record what a transaction reads, and
+    work out what it changed from there.
+
+    Anything a transaction writes is also taken to be read by it, so that a write which
+    was reverted, and so can't be told apart from no write at all, is only ever skipped
+    when nothing else wrote there.  Increasing a balance, like when paying the coinbase,
+    doesn't count as reading it though, so that such deltas can be applied in any order.
+    """
+    _reads = None  # type: Set[AccessKey]
+    _balance_deltas = None  # type: Set[Address]
+    _cleared_storage = None  # type: Set[Address]
+    _changed_accounts = None  # type: Set[Address]
+    _changed_slots = None  # type: Set[Tuple[Address, int]]
+
+    def start_recording(self) -> None:
+        self._reads = set()
+        self._balance_deltas = set()
+        self._cleared_storage = set()
+        self._changed_accounts = set()
+        self._changed_slots = set()
+
+    def stop_recording(self) -> Tuple[
+            FrozenSet[AccessKey],
+            FrozenSet[AccessKey],
+            Tuple[AccountChanges, ...]]:
+        """
+        Stop recording, and return everything that was read since recording started,
+        everything that was written since, and how each of the written accounts changed.
+        """
+        reads = frozenset(self._reads)
+        self._reads = None
+
+        writes = set()  # type: Set[AccessKey]
+        account_changes = tuple(
+            changes
+            for changes
+            in (self._get_changes(address, writes) for address in sorted(self._changed_accounts))
+            if changes is not None
+        )
+        return reads, frozenset(writes), account_changes
+
+    def _get_changes(self, address: Address, writes: Set[AccessKey]) -> Optional[AccountChanges]:
+        did_exist = self._trie_cache.get(address, b'') != b''
+        exists = self.account_exists(address)
+        if not did_exist and not exists:
+            return None
+
+        if did_exist != exists:
+            writes.add((address, EXISTS))
+
+        if not exists:
+            writes.update(
+                (address, part)
+                for part in (BALANCE, NONCE, CODE, STORAGE, CLEARED_STORAGE)
+            )
+            return AccountChanges(address, False, None, 0, None, None, True, ())
+
+        previous_account = self._get_account(address, from_journal=False)
+        account = self._get_account(address)
+
+        if account.balance != previous_account.balance:
+            writes.add((address, BALANCE))
+        if address in self._balance_deltas:
+            balance = None  # type: Optional[int]
+            balance_delta = account.balance - previous_account.balance
+        else:
+            balance = account.balance if (address, BALANCE) in writes else None
+            balance_delta = 0
+
+        if account.nonce != previous_account.nonce:
+            writes.add((address, NONCE))
+            nonce = account.nonce  # type: Optional[int]
+        else:
+            nonce = None
+
+        if account.code_hash != previous_account.code_hash:
+            writes.add((address, CODE))
+            code = self.get_code(address)  # type: Optional[bytes]
+        else:
+            code = None
+
+        is_storage_cleared = (
+            address in self._cleared_storage and
+            account.storage_root != previous_account.storage_root
+        )
+        slots = sorted(
+            slot for slot_address, slot in self._changed_slots if slot_address == address
+        )
+        if is_storage_cleared:
+            writes.update(((address, STORAGE), (address, CLEARED_STORAGE)))
+            storage = tuple(
+                (slot, value)
+                for slot, value in ((slot, self.get_storage(address, slot)) for slot in slots)
+                if value
+            )
+        else:
+            storage = tuple(
+                (slot, value)
+                for slot, value in ((slot, self.get_storage(address, slot)) for slot in slots)
+                if value != self.get_storage(address, slot, from_journal=False)
+            )
+            if storage:
+                writes.add((address, STORAGE))
+        writes.update((address, slot) for slot, _ in storage)
+
+        return AccountChanges(
+            address,
+            True,
+            balance,
+            balance_delta,
+            nonce,
+            code,
+            is_storage_cleared,
+            storage,
+        )
+
+    @property
+    def _is_recording(self) -> bool:
+        return self._reads is not None
+
+    def _read(self, address: Address, part: Union[str, int]) -> None:
+        if self._is_recording:
+            self._reads.add((address, part))
+
+    def _write(self, address: Address, part: Union[str, int]) -> None:
+        if self._is_recording:
+            self._reads.add((address, part))
+            self._changed_accounts.add(address)
+
+    #
+    # Storage
+    #
+    def get_storage(self, address: Address, slot: int, from_journal: bool=True) -> int:
+        self._read(address, slot)
+        return super().get_storage(address, slot, from_journal)
+
+    def set_storage(self, address: Address, slot: int, value: int) -> None:
+        self._write(address, slot)
+        if self._is_recording:
+            self._changed_slots.add((address, slot))
+        super().set_storage(address, slot, value)
+
+    def delete_storage(self, address: Address) -> None:
+        self._write(address, STORAGE)
+        if self._is_recording:
+            self._cleared_storage.add(address)
+        super().delete_storage(address)
+
+    #
+    # Balance
+    #
+    def get_balance(self, address: Address) -> int:
+        self._read(address, BALANCE)
+        if self._is_recording:
+            self._balance_deltas.discard(address)
+        return super().get_balance(address)
+
+    def set_balance(self, address: Address, balance: int) -> None:
+        self._write(address, BALANCE)
+        if self._is_recording:
+            self._balance_deltas.discard(address)
+        super().set_balance(address, balance)
+
+    def delta_balance(self, address: Address, delta: int) -> None:
+        is_blind = (
+            self._is_recording and
+            delta >= 0 and
+            (address, BALANCE) not in self._reads
+        )
+        if is_blind:
+            self._balance_deltas.add(address)
+            self._changed_accounts.add(address)
+            account = self._get_account(address)
+            super().set_balance(address, account.balance + delta)
+        else:
+            super().delta_balance(address, delta)
+
+    #
+    # Nonce
+    #
+    def get_nonce(self, address: Address) -> int:
+        self._read(address, NONCE)
+        return super().get_nonce(address)
+
+    def set_nonce(self, address: Address, nonce: int) -> None:
+        self._write(address, NONCE)
+        super().set_nonce(address, nonce)
+
+    #
+    # Code
+    #
+    def get_code(self, address: Address) -> bytes:
+        self._read(address, CODE)
+        return super().get_code(address)
+
+    def set_code(self, address: Address, code: bytes) -> None:
+        self._write(address, CODE)
+        super().set_code(address, code)
+
+    def get_code_hash(self, address: Address) -> Hash32:
+        self._read(address, CODE)
+        return super().get_code_hash(address)
+
+    def delete_code(self, address: Address) -> None:
+        self._write(address, CODE)
+        super().delete_code(address)
+
+    #
+    # Account Methods
+    #
+    def delete_account(self, address: Address) -> None:
+        for part in (BALANCE, NONCE, CODE, EXISTS, STORAGE):
+            self._write(address, part)
+        if self._is_recording:
+            self._balance_deltas.discard(address)
+            self._cleared_storage.add(address)
+        super().delete_account(address)
+
+    def account_exists(self, address: Address) -> bool:
+        self._read(address, EXISTS)
+        return super().account_exists(address)
+
+    def touch_account(self, address: Address) -> None:
+        self._write(address, EXISTS)
+        super().touch_account(address)
+
+
+def execute_speculatively(
+        state_class: Type[BaseState],
+        db: BaseDB,
+        execution_context: ExecutionContext,
+        state_root: Hash32,
+        transactions: Iterable[BaseTransaction]) -> Tuple[Optional[SpeculativeResult], ...]:
+    """
+    Execute each of the given transactions against the state at ``state_root``, as if it
+    was the first transaction of its block.  Transactions which are invalid against that
+    state get a result of None.
+
+    This runs in the workers, so everything it's given must be picklable when they are
+    processes.
+    """
+    account_db = RecordingAccountDB(db, state_root)
+    state = state_class(db, execution_context, state_root, account_db=account_db)
+    return tuple(
+        _execute_speculatively(state, account_db, transaction)
+        for transaction in transactions
+    )
+
+
+def _execute_speculatively(state: BaseState,
+                           account_db: RecordingAccountDB,
+                           transaction: BaseTransaction) -> Optional[SpeculativeResult]:
+    snapshot = state.snapshot()
+    account_db.start_recording()
+    try:
+        computation = state.execute_transaction(transaction)
+    except ValidationError:
+        account_db.stop_recording()
+        return None
+    else:
+        reads, writes, account_changes = account_db.stop_recording()
+        return SpeculativeResult(
+            reads,
+            writes,
+            account_changes,
+            tuple(computation.get_log_entries()),
+            computation.get_gas_remaining(),
+            computation.get_gas_refund(),
+            computation.is_error,
+        )
+    finally:
+        state.revert(snapshot)
+
+
+def apply_transactions_speculatively(
+        vm: 'BaseVM',
+        transactions: Tuple[BaseTransaction, ...],
+        base_header: BlockHeader,
+        executor: Executor) -> Tuple[BlockHeader, Tuple[Receipt, ...]]:
+    """
+    Apply all of the given transactions to the state of ``vm``, executing them
+    speculatively in ``executor`` first.  The results are the same as those of
+    :meth:`~eth.vm.base.VM.apply_all_transactions`, except that the computations are
+    not returned.
+
+    The state of ``vm`` must have a :class:`RecordingAccountDB`, and everything it
+    persisted so far is all the workers get to see.  With a
+    :class:`~concurrent.futures.ProcessPoolExecutor`, its database must be picklable.
+    """
+    if base_header.block_number != vm.block.number:
+        raise ValidationError(
+            "This VM instance must only work on block #{}, "
+            "but the target header has block #{}".format(
+                vm.block.number,
+                base_header.block_number,
+            )
+        )
+
+    state = vm.state
+    account_db = state.account_db
+    if not isinstance(account_db, RecordingAccountDB):
+        raise TypeError(
+            "Speculative execution needs a RecordingAccountDB, got {0}".format(
+                type(account_db).__name__,
+            )
+        )
+
+    # the previous hashes are usually lazy, which can't be sent to a process
+    execution_context = ExecutionContext(
+        coinbase=state.coinbase,
+        timestamp=state.timestamp,
+        block_number=state.block_number,
+        difficulty=state.difficulty,
+        gas_limit=state.gas_limit,
+        prev_hashes=tuple(state.execution_context.prev_hashes),
+    )
+    futures = [
+        executor.submit(
+            execute_speculatively,
+            type(state),
+            state._db,
+            execution_context,
+            Hash32(state.state_root),
+            batch,
+        )
+        for batch in partition_all(SPECULATION_BATCH_SIZE, transactions)
+    ]
+
+    header = base_header
+    receipts = []  # type: List[Receipt]
+    # every part of an account that any of the committed transactions changed
+    writes = set()  # type: Set[AccessKey]
+    executed_again = 0
+    try:
+        results = concat(future.result() for future in futures)
+        for transaction, result in zip(transactions, results):
+            vm.validate_transaction_against_header(header, transaction)
+
+            if result is not None and not _is_conflicting(result.reads, writes):
+                for account_changes in result.account_changes:
+                    account_changes.apply(account_db)
+                writes.update(result.writes)
+                computation = result  # type: ComputationResult
+            else:
+                account_db.start_recording()
+                computation = state.execute_transaction(transaction)
+                _, transaction_writes, _ = account_db.stop_recording()
+                writes.update(transaction_writes)
+                executed_again += 1
+
+            state_root = account_db.make_state_root()
+            receipt = vm.make_receipt(header, transaction, computation, state)
+            vm.validate_receipt(receipt)
+
+            header = header.copy(
+                bloom=header.bloom | receipt.bloom,
+                gas_used=receipt.gas_used,
+                state_root=state_root,
+            )
+            receipts.append(receipt)
+    finally:
+        for future in futures:
+            future.cancel()
+
+    vm.logger.debug(
+        "Executed %d of %d speculatively executed transactions again",
+        executed_again,
+        len(transactions),
+    )
+    return header, tuple(receipts)
+
+
+def _is_conflicting(reads: FrozenSet[AccessKey], writes: Set[AccessKey]) -> bool:
+    for address, part in reads:
+        if (address, part) in writes:
+            return True
+        elif isinstance(part, int) and (address, CLEARED_STORAGE) in writes:
+            return True
+    return False
@@ -8,6 +8,7 @@ from typing import (  # noqa: F401
     cast,
     Callable,
     Iterator,
+    Optional,
     Tuple,
     Type,
     TYPE_CHECKING,
@@ -19,12 +20,13 @@ from eth_typing import (
     Address,
     Hash32,
 )
-from eth_utils.toolz import nth
-
 from eth.constants import (
     BLANK_ROOT_HASH,
     MAX_PREV_HEADER_DEPTH,
 )
+from eth.db.access import (
+    AccessSummary,
+)
 from eth.db.account import (  # noqa: F401
     BaseAccountDB,
     AccountDB,
@@ -85,11 +87,24 @@ class BaseState(Configurable, ABC):
     transaction_context_class = None  # type: Type[BaseTransactionContext]
     account_db_class = None  # type: Type[BaseAccountDB]
     transaction_executor = None  # type: Type[BaseTransactionExecutor]
-
-    def __init__(self, db: BaseDB, execution_context: ExecutionContext, state_root: bytes) -> None:
+    # Whether apply_transaction() summarizes what each transaction accessed
+    record_accesses = False
+
+    def __init__(self,
+                 db: BaseDB,
+                 execution_context: ExecutionContext,
+                 state_root: bytes,
+                 account_db: BaseAccountDB=None) -> None:
+        """
+        :param account_db: an account database to carry on with, which must already be at
+            ``state_root`` with nothing left to persist.  A new one is created by default.
+        """
         self._db = db
         self.execution_context = execution_context
-        self.account_db = self.get_account_db_class()(self._db, state_root)
+        if account_db is None:
+            self.account_db = self.get_account_db_class()(self._db, state_root)
+        else:
+            self.account_db = account_db
 
     #
     # Logging
@@ -208,8 +223,8 @@ class BaseState(Configurable, ABC):
             return Hash32(b'')
 
         try:
-            return nth(ancestor_depth, self.execution_context.prev_hashes)
-        except StopIteration:
+            return self.execution_context.prev_hashes[ancestor_depth]
+        except IndexError:
             # Ancestor with specified depth not present
             return Hash32(b'')
 
@@ -244,18 +259,31 @@ class BaseState(Configurable, ABC):
     #
     # Execution
     #
-    def apply_transaction(self, transaction: 'BaseTransaction') -> Tuple[bytes, 'BaseComputation']:
+    def apply_transaction(self,
+                          transaction: 'BaseTransaction'
+                          ) -> Tuple[bytes, 'BaseComputation', Optional[AccessSummary]]:
         """
         Apply transaction to the vm state
 
         :param transaction: the transaction to apply
-        :return: the new state root, and the computation
+        :return: the new state root, the computation, and the accounts, storage slots and
+            code that the transaction accessed if :attr:`record_accesses` is set, else None
         """
         if self.state_root != BLANK_ROOT_HASH and not self.account_db.has_root(self.state_root):
             raise StateRootNotFound(self.state_root)
-        computation = self.execute_transaction(transaction)
+
+        if self.record_accesses:
+            self.account_db.start_recording_accesses()
+            try:
+                computation = self.execute_transaction(transaction)
+            finally:
+                access_summary = self.account_db.stop_recording_accesses()
+        else:
+            computation = self.execute_transaction(transaction)
+            access_summary = None
+
         state_root = self.account_db.make_state_root()
-        return state_root, computation
+        return state_root, computation, access_summary
 
     def get_transaction_executor(self) -> 'BaseTransactionExecutor':
         return self.transaction_executor(self)
@@ -6,6 +6,22 @@ from .import_empty_blocks import (  # noqa: F401
     ImportEmptyBlocksBenchmark
 )
 
+from .import_value_transfer_blocks import (  # noqa: F401
+    ImportValueTransferBlocksBenchmark,
+)
+
 from .simple_value_transfers import (  # noqa: F401
     SimpleValueTransferBenchmark,
 )
+
+from .txpool_insert import (  # noqa: F401
+    TransactionPoolInsertBenchmark,
+)
+
+from .concurrent_calls import (  # noqa: F401
+    ConcurrentCallBenchmark,
+)
+
+from .header_codec import (  # noqa: F401
+    HeaderDecodeBenchmark,
+)
@@ -0,0 +1,125 @@
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+import threading
+from typing import (  # noqa: F401
+    List,
+    Tuple,
+)
+
+from eth.chains.base import (
+    Chain,
+)
+from eth.rlp.blocks import (
+    BaseBlock,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.typing import (
+    BaseOrSpoofTransaction,
+)
+from eth.vm.spoof import (
+    SpoofTransaction,
+)
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from .import_value_transfer_blocks import (
+    ImportValueTransferBlocksBenchmark,
+)
+from _utils.chain_plumbing import (
+    ALL_VM,
+    DEFAULT_GENESIS_STATE,
+    FUNDED_ADDRESS,
+    get_chain,
+    SECOND_ADDRESS,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+
+
+class ConcurrentCallBenchmark(BaseBenchmark):
+    """
+    Runs ``num_calls`` calls against the genesis state from ``num_threads`` threads, while
+    another thread keeps importing blocks full of value transfers into the same database.
+    Calls keep their changes in a read-only overlay, so they don't wait for the import,
+    and the import doesn't wait for them.
+    """
+
+    def __init__(self,
+                 num_calls: int = 2000,
+                 num_threads: int = 4,
+                 num_blocks: int = 10) -> None:
+        self.num_calls = num_calls
+        self.num_threads = num_threads
+        self.num_blocks = num_blocks
+
+    @property
+    def name(self) -> str:
+        return 'Calls during block import'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        for vm in ALL_VM:
+            for mining_chain in get_chain(vm, DEFAULT_GENESIS_STATE):
+                blocks = ImportValueTransferBlocksBenchmark().mine_blocks(
+                    mining_chain,
+                    self.num_blocks,
+                )
+
+            for chain in get_chain(vm, DEFAULT_GENESIS_STATE):
+                genesis_header = chain.get_canonical_head()
+                # like a call over RPC, which has a sender but no signature
+                call = SpoofTransaction(
+                    chain.create_unsigned_transaction(
+                        nonce=0,
+                        gas_price=0,
+                        gas=100000,
+                        to=SECOND_ADDRESS,
+                        value=100,
+                        data=b'',
+                    ),
+                    from_=FUNDED_ADDRESS,
+                )
+
+                imported_blocks = []  # type: List[BaseBlock]
+                importer = threading.Thread(
+                    target=self.import_blocks,
+                    args=(chain, blocks, imported_blocks),
+                )
+                importer.start()
+                val = self.as_timed_result(lambda: self.run_calls(chain, call, genesis_header))
+                importer.join()
+
+            stat = DefaultStat(
+                caption=chain.get_vm().fork,
+                total_blocks=len(imported_blocks),
+                total_tx=val.wrapped_value,
+                total_seconds=val.duration,
+            )
+            total_stat = total_stat.cumulate(stat)
+            self.print_stat_line(stat)
+
+        return total_stat
+
+    def import_blocks(self,
+                      chain: Chain,
+                      blocks: Tuple[BaseBlock, ...],
+                      imported_blocks: List[BaseBlock]) -> None:
+        for block in blocks:
+            imported_block, _, _ = chain.import_block(block)
+            imported_blocks.append(imported_block)
+
+    def run_calls(self, chain: Chain, call: BaseOrSpoofTransaction, at_header: BlockHeader) -> int:
+        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+            results = [
+                executor.submit(chain.get_transaction_result, call, at_header)
+                for _ in range(self.num_calls)
+            ]
+            for result in results:
+                result.result()
+        return len(results)
@@ -0,0 +1,87 @@
+from typing import (  # noqa: F401
+    Callable,
+    List,
+    Tuple,
+)
+
+import rlp
+
+from eth.rlp.codecs import (
+    fast_decode,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+
+
+def generic_decode(encoded: bytes) -> BlockHeader:
+    return rlp.decode(encoded, sedes=BlockHeader)
+
+
+def fast_header_decode(encoded: bytes) -> BlockHeader:
+    return fast_decode(encoded, BlockHeader)
+
+
+class HeaderDecodeBenchmark(BaseBenchmark):
+    """
+    Decodes ``num_headers`` encoded headers ``num_rounds`` times, once with the generic
+    sedes of ``rlp`` and once with the generated codec of :class:`BlockHeader`.
+    """
+
+    def __init__(self, num_headers: int = 1000, num_rounds: int = 10) -> None:
+        self.num_headers = num_headers
+        self.num_rounds = num_rounds
+
+    @property
+    def name(self) -> str:
+        return 'Header decoding'
+
+    def execute(self) -> DefaultStat:
+        encoded_headers = self.make_encoded_headers()
+        total_stat = DefaultStat()
+
+        decoders = (
+            ('rlp', generic_decode),
+            ('fast', fast_header_decode),
+        )  # type: Tuple[Tuple[str, Callable[[bytes], BlockHeader]], ...]
+        for caption, decode in decoders:
+            val = self.as_timed_result(lambda: self.decode_headers(encoded_headers, decode))
+            stat = DefaultStat(
+                caption=caption,
+                total_blocks=val.wrapped_value,
+                total_seconds=val.duration,
+            )
+            total_stat = total_stat.cumulate(stat)
+            self.print_stat_line(stat)
+
+        return total_stat
+
+    def make_encoded_headers(self) -> List[bytes]:
+        parent = BlockHeader(difficulty=131072, block_number=0, gas_limit=8000000)
+        encoded_headers = []
+        for _ in range(self.num_headers):
+            parent = BlockHeader.from_parent(
+                parent,
+                gas_limit=parent.gas_limit,
+                difficulty=parent.difficulty,
+                timestamp=parent.timestamp + 15,
+                coinbase=b'\x01' * 20,
+                extra_data=b'benchmark',
+            )
+            encoded_headers.append(rlp.encode(parent))
+        return encoded_headers
+
+    def decode_headers(self,
+                       encoded_headers: List[bytes],
+                       decode: Callable[[bytes], BlockHeader]) -> int:
+        for _ in range(self.num_rounds):
+            for encoded in encoded_headers:
+                decode(encoded)
+        return self.num_rounds * len(encoded_headers)
@@ -0,0 +1,106 @@
+import logging
+from typing import (
+    Tuple,
+)
+
+import rlp
+
+from eth.chains.base import (
+    Chain,
+    MiningChain,
+)
+from eth.rlp.blocks import (
+    BaseBlock,
+)
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from .simple_value_transfers import (
+    SIMPLE_VALUE_TRANSFER_GAS_COST,
+)
+from _utils.chain_plumbing import (
+    ALL_VM,
+    DEFAULT_GENESIS_STATE,
+    FUNDED_ADDRESS,
+    FUNDED_ADDRESS_PRIVATE_KEY,
+    get_chain,
+    SECOND_ADDRESS,
+)
+from _utils.format import (
+    format_block,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+from _utils.tx import (
+    new_transaction,
+)
+
+
+class ImportValueTransferBlocksBenchmark(BaseBenchmark):
+    """
+    Imports blocks full of value transfers, which were decoded the way they would be when
+    received from a peer.  Most of the time spent per transaction is not spent in the EVM,
+    but on things like its hash, sender and intrinsic gas.
+    """
+
+    def __init__(self, num_blocks: int = 2) -> None:
+        self.num_blocks = num_blocks
+
+    @property
+    def name(self) -> str:
+        return 'Value transfer block import'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        for vm in ALL_VM:
+            for mining_chain in get_chain(vm, DEFAULT_GENESIS_STATE):
+                blocks = self.mine_blocks(mining_chain, self.num_blocks)
+
+            for chain in get_chain(vm, DEFAULT_GENESIS_STATE):
+                val = self.as_timed_result(lambda: self.import_blocks(chain, blocks))
+
+            stat = DefaultStat(
+                caption=chain.get_vm().fork,
+                total_blocks=len(blocks),
+                total_tx=sum(len(block.transactions) for block in blocks),
+                total_seconds=val.duration,
+                total_gas=val.wrapped_value,
+            )
+            total_stat = total_stat.cumulate(stat)
+            self.print_stat_line(stat)
+
+        return total_stat
+
+    def mine_blocks(self, chain: MiningChain, num_blocks: int) -> Tuple[BaseBlock, ...]:
+        blocks = []
+        for _ in range(num_blocks):
+            num_tx = chain.get_block().header.gas_limit // SIMPLE_VALUE_TRANSFER_GAS_COST
+            for _ in range(num_tx):
+                tx = new_transaction(
+                    vm=chain.get_vm(),
+                    private_key=FUNDED_ADDRESS_PRIVATE_KEY,
+                    from_=FUNDED_ADDRESS,
+                    to=SECOND_ADDRESS,
+                    amount=100,
+                    data=b''
+                )
+                chain.apply_transaction(tx)
+
+            block = chain.mine_block()
+            # drop everything the mined transactions have cached
+            blocks.append(rlp.decode(rlp.encode(block), sedes=type(block)))
+
+        return tuple(blocks)
+
+    def import_blocks(self, chain: Chain, blocks: Tuple[BaseBlock, ...]) -> int:
+        total_gas_used = 0
+        for block in blocks:
+            imported_block, _, _ = chain.import_block(block)
+
+            total_gas_used = total_gas_used + imported_block.header.gas_used
+            logging.debug(format_block(imported_block))
+
+        return total_gas_used
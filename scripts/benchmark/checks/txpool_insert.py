@@ -0,0 +1,105 @@
+import logging
+from typing import (
+    List,
+    Tuple,
+)
+
+from eth_keys import (
+    keys
+)
+from eth_typing import (
+    Address,
+)
+
+from eth._utils.transactions import (
+    recover_senders,
+)
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
+from eth.txpool import (
+    TransactionPool,
+)
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from _utils.chain_plumbing import (
+    ALL_VM,
+    DEFAULT_INITIAL_BALANCE,
+    get_chain,
+    SECOND_ADDRESS,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+
+
+class TransactionPoolInsertBenchmark(BaseBenchmark):
+    """
+    Adds transactions to a pool until ``num_transactions`` of them are pending, spread
+    over ``num_senders`` senders at varying gas prices.  The senders are recovered before
+    the timing starts, so that only the bookkeeping of the pool is measured.
+    """
+    def __init__(self, num_transactions: int = 100000, num_senders: int = 1000) -> None:
+        self.num_transactions = num_transactions
+        self.num_senders = num_senders
+
+    @property
+    def name(self) -> str:
+        return 'Transaction pool insert'
+
+    def execute(self) -> DefaultStat:
+        private_keys = [
+            keys.PrivateKey(index.to_bytes(32, 'big'))
+            for index in range(1, self.num_senders + 1)
+        ]
+        genesis_state = [
+            (Address(key.public_key.to_canonical_address()), {
+                'balance': DEFAULT_INITIAL_BALANCE,
+                'code': b'',
+            })
+            for key in private_keys
+        ]
+
+        vm = ALL_VM[-1]
+        for chain in get_chain(vm, genesis_state):
+            logging.debug('Signing %d transactions', self.num_transactions)
+            transactions = self.make_transactions(chain, private_keys)
+            recover_senders(transactions)
+
+            pool = TransactionPool(chain.get_vm().state, max_size=self.num_transactions)
+            val = self.as_timed_result(lambda: self.insert(pool, transactions))
+
+            stat = DefaultStat(
+                caption=vm.fork,
+                total_tx=len(pool),
+                total_seconds=val.duration,
+            )
+            self.print_stat_line(stat)
+            return stat
+
+    def make_transactions(self,
+                          chain: MiningChain,
+                          private_keys: List[keys.PrivateKey]) -> Tuple[BaseTransaction, ...]:
+        per_sender = self.num_transactions // len(private_keys)
+        return tuple(
+            chain.create_unsigned_transaction(
+                nonce=nonce,
+                gas_price=1 + (nonce * 7 + key_index) % 100,
+                gas=21000,
+                to=SECOND_ADDRESS,
+                value=1,
+                data=b'',
+            ).as_signed_transaction(private_key)
+            # nonces are interleaved between the senders, like they arrive from the network
+            for nonce in range(per_sender)
+            for key_index, private_key in enumerate(private_keys)
+        )
+
+    def insert(self, pool: TransactionPool, transactions: Tuple[BaseTransaction, ...]) -> None:
+        for transaction in transactions:
+            pool.add(transaction)
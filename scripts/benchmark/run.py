@@ -8,9 +8,13 @@ from eth._utils.version import (
 )
 
 from checks import (
+    ConcurrentCallBenchmark,
+    HeaderDecodeBenchmark,
     ImportEmptyBlocksBenchmark,
+    ImportValueTransferBlocksBenchmark,
     MineEmptyBlocksBenchmark,
     SimpleValueTransferBenchmark,
+    TransactionPoolInsertBenchmark,
 )
 
 from checks.erc20_interact import (
@@ -78,6 +82,7 @@ def run() -> None:
     benchmarks = [
         MineEmptyBlocksBenchmark(),
         ImportEmptyBlocksBenchmark(),
+        ImportValueTransferBlocksBenchmark(),
         SimpleValueTransferBenchmark(TO_EXISTING_ADDRESS_CONFIG),
         SimpleValueTransferBenchmark(TO_NON_EXISTING_ADDRESS_CONFIG),
         ERC20DeployBenchmark(),
@@ -89,6 +94,9 @@ def run() -> None:
         DOSContractCreateEmptyContractBenchmark(),
         DOSContractRevertSstoreUint64Benchmark(),
         DOSContractRevertCreateEmptyContractBenchmark(),
+        TransactionPoolInsertBenchmark(),
+        ConcurrentCallBenchmark(),
+        HeaderDecodeBenchmark(),
     ]
 
     for benchmark in benchmarks:
@@ -0,0 +1,178 @@
+import pytest
+
+from eth_utils import (
+    decode_hex,
+    ValidationError,
+)
+
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    copy,
+    disable_pow_check,
+    frontier_at,
+    genesis,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+# stores 1 at slot 0, and logs it
+CONTRACT = decode_hex('0x' + '33' * 20)
+
+
+@pytest.fixture(params=(frontier_at, byzantium_at))
+def chain(request, funded_address, funded_address_initial_balance):
+    return build(
+        MiningChain,
+        request.param(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={
+                funded_address: {'balance': funded_address_initial_balance},
+                CONTRACT: {'code': decode_hex('0x6001600055600160005260206000a0')},
+            },
+        ),
+    )
+
+
+def _transfer(vm, funded_address, funded_address_private_key, **kwargs):
+    return new_transaction(
+        vm,
+        funded_address,
+        RECIPIENT,
+        1,
+        funded_address_private_key,
+        **kwargs
+    )
+
+
+def _call_contract(vm, funded_address, funded_address_private_key):
+    return new_transaction(vm, funded_address, CONTRACT, 0, funded_address_private_key)
+
+
+def test_build_block_matches_applying_transactions(chain,
+                                                   funded_address,
+                                                   funded_address_private_key):
+    expected_chain = build(chain, copy)
+    for _ in range(2):
+        expected_chain.apply_transaction(
+            _transfer(expected_chain.get_vm(), funded_address, funded_address_private_key)
+        )
+    expected_chain.apply_transaction(
+        _call_contract(expected_chain.get_vm(), funded_address, funded_address_private_key)
+    )
+    expected_block = expected_chain.mine_block()
+
+    with chain.build_block() as builder:
+        for _ in range(2):
+            builder.apply_transaction(
+                _transfer(builder.vm, funded_address, funded_address_private_key)
+            )
+        receipt, computation = builder.apply_transaction(
+            _call_contract(builder.vm, funded_address, funded_address_private_key)
+        )
+        assert computation.is_success
+        assert len(receipt.logs) == 1
+        assert builder.header.gas_used == receipt.gas_used
+
+    block = chain.mine_block()
+    assert block == expected_block
+    assert chain.get_canonical_head() == expected_block.header
+
+
+def test_build_block_after_applying_transaction(chain,
+                                                funded_address,
+                                                funded_address_private_key):
+    expected_chain = build(chain, copy)
+    for _ in range(2):
+        expected_chain.apply_transaction(
+            _transfer(expected_chain.get_vm(), funded_address, funded_address_private_key)
+        )
+    expected_block = expected_chain.mine_block()
+
+    chain.apply_transaction(_transfer(chain.get_vm(), funded_address, funded_address_private_key))
+    with chain.build_block() as builder:
+        assert len(builder.transactions) == 1
+        builder.apply_transaction(_transfer(builder.vm, funded_address, funded_address_private_key))
+
+    assert chain.mine_block() == expected_block
+
+
+def test_build_block_rollback(chain, funded_address, funded_address_private_key):
+    expected_chain = build(chain, copy)
+    expected_chain.apply_transaction(
+        _transfer(expected_chain.get_vm(), funded_address, funded_address_private_key)
+    )
+    expected_block = expected_chain.mine_block()
+
+    with chain.build_block() as builder:
+        with pytest.raises(ValidationError):
+            builder.rollback()
+
+        builder.apply_transaction(_transfer(builder.vm, funded_address, funded_address_private_key))
+        gas_used = builder.header.gas_used
+
+        builder.apply_transaction(
+            _call_contract(builder.vm, funded_address, funded_address_private_key)
+        )
+        builder.rollback()
+        assert builder.header.gas_used == gas_used
+        assert len(builder.transactions) == len(builder.receipts) == 1
+
+        # only the last transaction can be rolled back
+        with pytest.raises(ValidationError):
+            builder.rollback()
+
+    assert chain.mine_block() == expected_block
+
+
+def test_build_block_with_invalid_transactions(chain,
+                                               funded_address,
+                                               funded_address_private_key):
+    expected_chain = build(chain, copy)
+    expected_chain.apply_transaction(
+        _transfer(expected_chain.get_vm(), funded_address, funded_address_private_key)
+    )
+    expected_block = expected_chain.mine_block()
+
+    with chain.build_block() as builder:
+        too_much_gas = _transfer(
+            builder.vm,
+            funded_address,
+            funded_address_private_key,
+            gas=builder.gas_remaining + 1,
+        )
+        with pytest.raises(ValidationError):
+            builder.apply_transaction(too_much_gas)
+
+        transaction = _transfer(builder.vm, funded_address, funded_address_private_key)
+        builder.apply_transaction(transaction)
+        with pytest.raises(ValidationError):
+            builder.apply_transaction(transaction)
+
+    assert chain.mine_block() == expected_block
+
+
+def test_finished_block_builder(chain, funded_address, funded_address_private_key):
+    header = chain.header
+    with pytest.raises(ZeroDivisionError):
+        with chain.build_block() as builder:
+            builder.apply_transaction(
+                _transfer(builder.vm, funded_address, funded_address_private_key)
+            )
+            1 / 0
+    assert chain.header == header
+
+    with chain.build_block() as builder:
+        pass
+    transaction = _transfer(builder.vm, funded_address, funded_address_private_key)
+    with pytest.raises(ValidationError):
+        builder.apply_transaction(transaction)
+    with pytest.raises(ValidationError):
+        builder.finish()
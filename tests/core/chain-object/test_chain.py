@@ -73,6 +73,32 @@ def test_import_block(chain, tx):
     assert chain.get_canonical_transaction(tx.hash) == tx
 
 
+def test_get_lazy_block_by_hash(chain, tx):
+    if hasattr(chain, 'apply_transaction'):
+        new_block, _, _ = chain.apply_transaction(tx)
+    else:
+        new_block, _, _ = chain.build_block_with_transactions([tx])
+    block, _, _ = chain.import_block(new_block)
+
+    lazy_block = chain.get_lazy_block_by_hash(block.hash)
+    assert lazy_block.header == block.header
+    assert lazy_block.transaction_count == 1
+    assert lazy_block.transaction_hashes == (tx.hash,)
+    # nothing is decoded until it's accessed
+    assert lazy_block._transactions == [None]
+    assert lazy_block._serialized_uncles is None
+
+    assert lazy_block.get_transaction(0) == tx
+    assert lazy_block.get_transaction(0) is lazy_block.get_transaction(0)
+    with pytest.raises(IndexError):
+        lazy_block.get_transaction(1)
+    assert lazy_block.uncles == ()
+
+    assert lazy_block == block
+    assert lazy_block.to_block() == block
+    assert lazy_block != chain.get_lazy_block_by_hash(block.header.parent_hash)
+
+
 def test_empty_transaction_lookups(chain):
     with pytest.raises(TransactionNotFound):
         chain.get_canonical_transaction(b'\0' * 32)
@@ -1,6 +1,7 @@
 import pytest
 
 from eth.chains.base import MiningChain
+from eth.rlp.blocks import LazyBlock
 
 from eth.tools.builder.chain import api
 
@@ -76,6 +77,11 @@ def test_import_block_with_reorg(chain, funded_address_private_key):
     _, new_canonical_blocks, old_canonical_blocks = main_chain.import_block(f_block_6)
     assert new_canonical_blocks == (f_block_4, f_block_5, f_block_6)
     assert old_canonical_blocks == (block_4, block_5)
+    # only the imported block is a full block, the others are decoded when used
+    assert all(isinstance(block, LazyBlock) for block in new_canonical_blocks[:-1])
+    assert not isinstance(new_canonical_blocks[-1], LazyBlock)
+    assert all(isinstance(block, LazyBlock) for block in old_canonical_blocks)
+    assert tuple(block.to_block() for block in old_canonical_blocks) == (block_4, block_5)
 
     assert main_chain.get_canonical_head() == f_block_6.header
 
@@ -117,3 +123,8 @@ def test_import_block_with_reorg_with_current_head_as_uncle(
     block = final_chain.get_canonical_block_by_number(header.block_number)
 
     assert len(block.uncles) == 1
+
+    lazy_block = final_chain.get_lazy_block_by_hash(block.hash)
+    assert lazy_block.uncle_count == 1
+    assert lazy_block.get_uncle(0) == uncle
+    assert lazy_block.to_block() == block
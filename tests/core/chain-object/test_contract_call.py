@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from eth_utils.toolz import (
     assoc,
 )
@@ -13,6 +15,9 @@ from eth_utils import (
 )
 import pytest
 
+from eth.db.account import (
+    AccountDB,
+)
 from eth.exceptions import (
     InvalidInstruction,
     OutOfGas,
@@ -232,3 +237,59 @@ def test_get_transaction_result_revert(
     )
     with pytest.raises(expected):
         chain.get_transaction_result(call_txn, chain.get_canonical_head())
+
+
+def test_get_transaction_results(chain, simple_contract_address):
+    def call(signature, gas_price=0):
+        return new_transaction(
+            chain.get_vm(),
+            b'\xff' * 20,
+            simple_contract_address,
+            gas_price=gas_price,
+            data=function_signature_to_4byte_selector(signature),
+        )
+
+    calls = (
+        call('getMeaningOfLife()'),
+        call('useLotsOfGas()'),
+        call('getGasPrice()', gas_price=9),
+        call('getMeaningOfLife()'),
+    )
+    results = chain.get_transaction_results(calls, chain.get_canonical_head())
+
+    assert len(results) == 4
+    assert results[0] == results[3] == uint256_to_bytes(42)
+    assert isinstance(results[1], OutOfGas)
+    assert results[2] == uint256_to_bytes(9)
+
+
+def test_get_transaction_result_alongside_writes(chain, base_db, simple_contract_address):
+    call_txn = new_transaction(
+        chain.get_vm(),
+        b'\xff' * 20,
+        simple_contract_address,
+        gas_price=0,
+        data=function_signature_to_4byte_selector('getMeaningOfLife()'),
+    )
+    head = chain.get_canonical_head()
+
+    stored = dict(base_db.wrapped_db.kv_store)
+    assert chain.get_transaction_result(call_txn, head) == uint256_to_bytes(42)
+    assert chain.estimate_gas(call_txn, head) > 21000
+    # calls don't write anything
+    assert base_db.wrapped_db.kv_store == stored
+
+    def write_states():
+        account_db = AccountDB(base_db, head.state_root)
+        for slot in range(100):
+            account_db.set_storage(simple_contract_address, slot, slot + 1)
+            account_db.persist()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = [
+            executor.submit(chain.get_transaction_result, call_txn, head)
+            for _ in range(20)
+        ]
+        write_states()
+
+    assert all(result.result() == uint256_to_bytes(42) for result in results)
@@ -1,6 +1,25 @@
 import pytest
 
-from eth.estimators.gas import binary_gas_search_1000_tolerance
+from eth_utils import (
+    decode_hex,
+    ValidationError,
+)
+
+from eth.chains.base import MiningChain
+from eth.constants import CREATE_CONTRACT_ADDRESS
+from eth.estimators.gas import (
+    binary_gas_search_1000_tolerance,
+    binary_gas_search_exact,
+    trace_gas_search_exact,
+)
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    disable_pow_check,
+    frontier_at,
+    genesis,
+)
+from eth.vm.spoof import SpoofTransaction
 from eth._utils.address import force_bytes_to_address
 
 from tests.core.helpers import (
@@ -126,3 +145,96 @@ def test_estimate_gas_on_full_block(chain, funded_address_private_key, funded_ad
     next_pending_tx = mk_estimation_txn(chain, from_, from_key, data=garbage_data * 2)
 
     assert chain.estimate_gas(next_pending_tx, chain.header) == 722760
+
+
+CALLEE = force_bytes_to_address(b'\x20\x20')
+# calls CALLEE with up to 100000 gas, and fails if the call fails
+CALLER = force_bytes_to_address(b'\x20\x21')
+CALLER_CODE = decode_hex(
+    '0x60006000600060006000' + '73' + CALLEE.hex() + '620186a0f1' + '15602957' + '00' + '5bfe'
+)
+# stores 1 at slot 0
+CALLEE_CODE = decode_hex('0x600160005500')
+# deploys CALLEE_CODE
+INIT_CODE = decode_hex('0x6006600c60003960066000f3') + CALLEE_CODE
+
+
+@pytest.fixture(params=(frontier_at, byzantium_at))
+def estimation_chain(request, funded_address, funded_address_initial_balance):
+    return build(
+        MiningChain,
+        request.param(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={
+                funded_address: {'balance': funded_address_initial_balance},
+                CALLER: {'code': CALLER_CODE},
+                CALLEE: {'code': CALLEE_CODE},
+            },
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    'to, data',
+    (
+        (ADDR_1010, b''),
+        (ADDRESS_2, b'\xff' * 32),
+        (CALLER, b''),
+        (CALLEE, b''),
+        (CREATE_CONTRACT_ADDRESS, INIT_CODE),
+    ),
+)
+def test_trace_gas_search(
+        estimation_chain,
+        to,
+        data,
+        funded_address,
+        funded_address_private_key,
+        monkeypatch):
+    vm = estimation_chain.get_vm()
+    tx = new_transaction(vm, funded_address, to, 0, funded_address_private_key, data=data)
+    expected = binary_gas_search_exact(vm.state, tx)
+
+    execute_transaction = vm.state.execute_transaction
+    executions = []
+
+    def counting_execute_transaction(transaction):
+        executions.append(transaction.gas)
+        return execute_transaction(transaction)
+
+    monkeypatch.setattr(vm.state, 'execute_transaction', counting_execute_transaction)
+    assert trace_gas_search_exact(vm.state, tx) == expected
+    if to == CREATE_CONTRACT_ADDRESS and vm.fork == 'frontier':
+        # the code is not deposited if there is not enough gas left for it, without failing
+        assert len(executions) > 3
+    else:
+        assert len(executions) <= 3
+
+    # the estimate is tight
+    state = vm.state
+    snapshot = state.snapshot()
+    assert not state.costless_execute_transaction(SpoofTransaction(tx, gas=expected)).is_error
+    state.revert(snapshot)
+    if expected > tx.intrinsic_gas:
+        assert state.costless_execute_transaction(
+            SpoofTransaction(tx, gas=expected - 1)
+        ).is_error
+
+
+def test_estimate_gas_many(chain, funded_address, funded_address_private_key):
+    vm = chain.get_vm()
+    transactions = (
+        new_transaction(vm, funded_address, ADDR_1010, 100, funded_address_private_key),
+        new_transaction(vm, funded_address, ADDRESS_2, 100, data=b'\xff' * 32),
+        # more than the sender has
+        new_transaction(vm, funded_address, ADDR_1010, 10 ** 30),
+        new_transaction(vm, funded_address, ADDRESS_2, 100, data=b'\xff' * 320),
+    )
+    estimates = chain.estimate_gas_many(transactions)
+
+    assert estimates[0] == chain.estimate_gas(transactions[0]) == 21000
+    assert estimates[1] == chain.estimate_gas(transactions[1])
+    assert isinstance(estimates[2], ValidationError)
+    assert estimates[3] == chain.estimate_gas(transactions[3])
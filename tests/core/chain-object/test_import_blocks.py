@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import rlp
+
+from eth_utils import (
+    decode_hex,
+    ValidationError,
+)
+
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    copy,
+    disable_pow_check,
+    frontier_at,
+    genesis,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+
+
+@pytest.fixture
+def genesis_chain(funded_address, funded_address_initial_balance):
+    return build(
+        MiningChain,
+        frontier_at(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={funded_address: {'balance': funded_address_initial_balance}},
+        ),
+    )
+
+
+@pytest.fixture
+def blocks(genesis_chain, funded_address, funded_address_private_key):
+    chain = build(genesis_chain, copy)
+    mined_blocks = []
+    for block_number in range(1, 5):
+        for _ in range(block_number):
+            tx = new_transaction(
+                chain.get_vm(),
+                funded_address,
+                RECIPIENT,
+                amount=1,
+                private_key=funded_address_private_key,
+            )
+            chain.apply_transaction(tx)
+        mined_blocks.append(chain.mine_block())
+    return tuple(mined_blocks)
+
+
+@pytest.mark.parametrize('executor', (None, ThreadPoolExecutor(max_workers=2)))
+@pytest.mark.parametrize('lookahead', (1, 3, 8))
+def test_import_blocks(genesis_chain, blocks, executor, lookahead):
+    import_results = genesis_chain.import_blocks(
+        blocks,
+        executor=executor,
+        lookahead=lookahead,
+    )
+
+    assert len(import_results) == len(blocks)
+    for block, (imported_block, new_canonical_blocks, old_canonical_blocks) in zip(
+            blocks,
+            import_results):
+        assert imported_block == block
+        assert new_canonical_blocks == (block,)
+        assert old_canonical_blocks == tuple()
+
+    assert genesis_chain.get_canonical_head() == blocks[-1].header
+    assert genesis_chain.header.parent_hash == blocks[-1].hash
+    assert genesis_chain.get_vm().state.account_db.get_balance(RECIPIENT) == 10
+
+
+def test_import_blocks_is_eager(genesis_chain, blocks):
+    # the blocks are imported even if the results are never looked at
+    genesis_chain.import_blocks(blocks)
+    assert genesis_chain.get_canonical_head() == blocks[-1].header
+
+
+def test_import_blocks_stops_at_invalid_header(genesis_chain, blocks):
+    invalid_block = blocks[2].copy(header=blocks[2].header.copy(
+        timestamp=blocks[1].header.timestamp,
+    ))
+    with pytest.raises(ValidationError, match="timestamp"):
+        genesis_chain.import_blocks(blocks[:2] + (invalid_block,) + blocks[3:])
+
+    assert genesis_chain.get_canonical_head() == blocks[1].header
+    assert genesis_chain.header.parent_hash == blocks[1].hash
+
+
+def _without_senders(blocks):
+    return tuple(rlp.decode(rlp.encode(block), sedes=type(block)) for block in blocks)
+
+
+def test_import_blocks_recovers_senders(genesis_chain, blocks, funded_address):
+    decoded_blocks = _without_senders(blocks)
+    assert all(txn._sender is None for block in decoded_blocks for txn in block.transactions)
+
+    genesis_chain.import_blocks(decoded_blocks)
+
+    for block in decoded_blocks:
+        assert all(txn._sender == funded_address for txn in block.transactions)
+
+
+def test_import_block_recovers_senders_with_executor(genesis_chain, blocks, funded_address):
+    decoded_blocks = _without_senders(blocks)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        genesis_chain.sender_recovery_executor = executor
+        for block in decoded_blocks:
+            genesis_chain.import_block(block)
+
+    assert genesis_chain.get_canonical_head() == blocks[-1].header
+    for block in decoded_blocks:
+        assert all(txn._sender == funded_address for txn in block.transactions)
@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from eth_utils import (
+    ValidationError,
+)
+
+from eth.chains.base import MiningChain
+from eth.consensus.pow import (
+    check_pow_many,
+)
+from eth.vm.forks.frontier import FrontierVM
+from eth.tools.builder.chain import (
+    build,
+    enable_pow_mining,
+    frontier_at,
+    genesis,
+    mine_blocks,
+)
+
+
+@pytest.fixture(scope='module')
+def pow_chain():
+    return build(
+        MiningChain,
+        frontier_at(0),
+        enable_pow_mining(),
+        genesis(),
+        mine_blocks(6),
+    )
+
+
+@pytest.fixture(scope='module')
+def headers(pow_chain):
+    return tuple(
+        pow_chain.get_canonical_block_by_number(number).header
+        for number in range(1, 7)
+    )
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def _with_bad_seal(header):
+    return header.copy(nonce=(int.from_bytes(header.nonce, 'big') + 1).to_bytes(8, 'big'))
+
+
+@pytest.mark.parametrize('use_executor', (False, True))
+def test_check_pow_many(headers, executor, use_executor):
+    pool = executor if use_executor else None
+    check_pow_many(headers, pool)
+
+    bad_headers = headers[:3] + (_with_bad_seal(headers[3]),) + headers[4:]
+    with pytest.raises(ValidationError, match='block #4'):
+        check_pow_many(bad_headers, pool)
+
+
+def test_validate_chain_with_seal_check_executor(pow_chain, headers, executor):
+    root = pow_chain.get_canonical_block_by_number(0).header
+    pow_chain.validate_chain(root, headers, seal_check_executor=executor)
+
+    # the header with the bad seal has to be re-linked to its child
+    bad_header = _with_bad_seal(headers[2])
+    bad_child = headers[3].copy(parent_hash=bad_header.hash)
+    with pytest.raises(ValidationError, match='block #3'):
+        pow_chain.validate_chain(
+            root,
+            headers[:2] + (bad_header, bad_child),
+            seal_check_executor=executor,
+        )
+
+
+def test_validate_chain_with_seal_check_stride():
+    checked = []
+
+    class ChainClass(MiningChain):
+        vm_configuration = ((0, FrontierVM.configure(
+            validate_seal=classmethod(lambda cls, header: checked.append(header.block_number)),
+        )),)
+
+    chain = build(ChainClass, genesis(), mine_blocks(7))
+    root, *descendants = (
+        chain.get_canonical_block_by_number(number).header
+        for number in range(8)
+    )
+    checked.clear()
+
+    # the last header is always checked
+    chain.validate_chain(root, descendants, seal_check_stride=3)
+    assert checked == [3, 6, 7]
+
+    checked.clear()
+    chain.validate_chain(root, descendants)
+    assert checked == list(range(1, 8))
+
+    with pytest.raises(ValidationError):
+        chain.validate_chain(
+            root,
+            descendants,
+            seal_check_random_sample_rate=2,
+            seal_check_stride=2,
+        )
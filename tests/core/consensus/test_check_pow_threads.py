@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from eth_utils import (
+    ValidationError,
+)
+
+from pyethash import EPOCH_LENGTH
+
+from eth.consensus import pow
+
+
+MIX_HASH = b'\x01' * 32
+MINING_HASH = b'\x02' * 32
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    # real caches take seconds to generate, and only how often they are generated matters
+    monkeypatch.setattr(pow, 'cache_seeds', [b'\x00' * 32])
+    monkeypatch.setattr(pow, 'cache_by_seed', OrderedDict())
+    monkeypatch.setattr(pow, '_generation_locks', {})
+    generated = []
+    generated_lock = threading.Lock()
+
+    def mkcache_bytes(block_number):
+        # give the other threads time to miss the same cache
+        time.sleep(0.01)
+        epoch = block_number // EPOCH_LENGTH
+        with generated_lock:
+            generated.append(epoch)
+        return bytes([epoch]) * 64
+
+    def hashimoto_light(block_number, cache, mining_hash, nonce):
+        assert cache == bytes([block_number // EPOCH_LENGTH]) * 64
+        return {b'mix digest': MIX_HASH, b'result': b'\x00' * 32}
+
+    monkeypatch.setattr(pow, 'mkcache_bytes', mkcache_bytes)
+    monkeypatch.setattr(pow, 'hashimoto_light', hashimoto_light)
+    return generated
+
+
+def test_check_pow_from_many_threads(generated):
+    # headers of a few epochs, checked the way import_blocks() does by default
+    block_numbers = [
+        epoch * EPOCH_LENGTH + offset
+        for offset in range(20)
+        for epoch in range(3)
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(pow.check_pow, block_number, MINING_HASH, MIX_HASH, b'\x00' * 8, 1)
+            for block_number in block_numbers
+        ]
+        for future in futures:
+            future.result()
+
+    assert sorted(generated) == [0, 1, 2]
+    assert sorted(pow.cache_by_seed.values()) == [bytes([epoch]) * 64 for epoch in range(3)]
+    assert pow._generation_locks == {}
+
+    with pytest.raises(ValidationError, match='mix hash mismatch'):
+        pow.check_pow(0, MINING_HASH, b'\x03' * 32, b'\x00' * 8, 1)
+
+
+def test_get_cache_from_many_threads_within_cache_limit(generated, monkeypatch):
+    monkeypatch.setattr(pow, 'CACHE_MAX_ITEMS', 2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        caches = list(executor.map(
+            pow.get_cache,
+            [epoch * EPOCH_LENGTH for epoch in range(5)] * 4,
+        ))
+
+    assert caches == [bytes([epoch]) * 64 for epoch in range(5)] * 4
+    assert len(pow.cache_by_seed) == 2
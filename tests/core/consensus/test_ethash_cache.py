@@ -0,0 +1,117 @@
+from collections import OrderedDict
+import os
+from pathlib import Path
+
+import pytest
+
+from pyethash import EPOCH_LENGTH
+
+from eth.consensus import (
+    ethash_cache,
+    pow,
+)
+from eth.consensus.ethash_cache import (
+    ETHASH_CACHE_DIR_ENV,
+    EthashCacheStore,
+    get_cache_store,
+    set_cache_dir,
+)
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    # generating real caches takes seconds, and only their storage is tested here
+    generated = []
+
+    def mkcache_bytes(block_number):
+        epoch = block_number // EPOCH_LENGTH
+        generated.append(epoch)
+        return bytes([epoch]) * 64
+
+    monkeypatch.setattr(ethash_cache, 'mkcache_bytes', mkcache_bytes)
+    return generated
+
+
+@pytest.fixture
+def cache_dir(tmpdir):
+    return Path(str(tmpdir)) / 'ethash'
+
+
+def test_load_generates_cache_once(cache_dir, generated):
+    store = EthashCacheStore(cache_dir)
+    assert store.load(EPOCH_LENGTH + 1)[:] == b'\x01' * 64
+    assert generated == [1]
+
+    # another process maps what was stored
+    assert EthashCacheStore(cache_dir).load(2 * EPOCH_LENGTH - 1)[:] == b'\x01' * 64
+    assert generated == [1]
+    assert os.listdir(str(cache_dir)) == [store.get_path(EPOCH_LENGTH).name]
+
+
+def test_pregenerate(cache_dir, generated):
+    store = EthashCacheStore(cache_dir)
+    future = store.pregenerate(2 * EPOCH_LENGTH)
+    # only once at a time
+    assert store.pregenerate(2 * EPOCH_LENGTH) is None
+
+    future.result()
+    assert store.get_path(2 * EPOCH_LENGTH).exists()
+    assert store.pregenerate(2 * EPOCH_LENGTH) is None
+
+    assert store.load(2 * EPOCH_LENGTH)[:] == b'\x02' * 64
+    assert generated == [2]
+
+
+@pytest.fixture
+def cache_settings(monkeypatch):
+    # the settings of the module, back to the default of reading the environment
+    monkeypatch.setattr(ethash_cache, '_cache_dir', None)
+    monkeypatch.setattr(ethash_cache, '_is_cache_dir_set', False)
+    monkeypatch.setattr(ethash_cache, '_cache_store', None)
+    monkeypatch.delenv(ETHASH_CACHE_DIR_ENV, raising=False)
+    yield
+    store = ethash_cache._cache_store
+    if store is not None:
+        store.close()
+
+
+def test_get_cache_from_cache_dir(cache_dir, generated, cache_settings, monkeypatch):
+    monkeypatch.setattr(pow, 'cache_by_seed', OrderedDict())
+    set_cache_dir(cache_dir)
+    assert get_cache_store().cache_dir == cache_dir
+    assert ETHASH_CACHE_DIR_ENV not in os.environ
+
+    assert pow.get_cache(0)[:] == b'\x00' * 64
+    assert pow.get_cache(1)[:] == b'\x00' * 64
+    assert generated[0] == 0
+
+    # the next epoch is generated in the background
+    get_cache_store().close()
+    assert sorted(generated) == [0, 1]
+    assert get_cache_store().get_path(EPOCH_LENGTH).exists()
+
+    set_cache_dir(None)
+    assert get_cache_store() is None
+
+
+def test_cache_dir_from_environment(cache_dir, cache_settings, monkeypatch):
+    assert get_cache_store() is None
+
+    monkeypatch.setenv(ETHASH_CACHE_DIR_ENV, str(cache_dir))
+    store = get_cache_store()
+    assert store.cache_dir == cache_dir
+    assert get_cache_store() is store
+
+    # a directory that is set overrides the environment
+    set_cache_dir(None)
+    assert get_cache_store() is None
+
+
+def test_changing_cache_dir_closes_store(cache_dir, generated, cache_settings):
+    set_cache_dir(cache_dir)
+    store = get_cache_store()
+
+    set_cache_dir(cache_dir / 'other')
+    assert get_cache_store().cache_dir == cache_dir / 'other'
+    # the old store doesn't start generating anything anymore
+    assert store.pregenerate(0) is None
@@ -6,6 +6,8 @@ from eth_utils.toolz import (
 )
 import itertools
 
+import pytest
+
 
 def test_cached_generator():
     use_once = itertools.count()
@@ -30,3 +32,22 @@ def test_cached_generator_iterable():
     repeated_use = CachedIterable(input_vals)
     assert list(repeated_use) == input_vals
     assert list(repeated_use) == input_vals
+
+
+def test_cached_generator_indexing():
+    repeated_use = CachedIterable(itertools.count())
+
+    assert repeated_use[3] == 3
+    assert repeated_use[0] == 0
+    assert repeated_use[10] == 10
+    assert list(itertools.islice(repeated_use, 4)) == [0, 1, 2, 3]
+
+
+def test_cached_generator_indexing_out_of_range():
+    repeated_use = CachedIterable(iter([0, 1]))
+
+    with pytest.raises(IndexError):
+        repeated_use[2]
+    with pytest.raises(IndexError):
+        repeated_use[-1]
+    assert repeated_use[1] == 1
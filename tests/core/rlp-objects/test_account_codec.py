@@ -0,0 +1,88 @@
+from hypothesis import (
+    example,
+    given,
+    strategies as st,
+)
+import pytest
+import rlp
+
+from eth.constants import (
+    BLANK_ROOT_HASH,
+    EMPTY_SHA3,
+)
+from eth.rlp.accounts import (
+    Account,
+    AccountRecord,
+    decode_account,
+    encode_account,
+)
+
+
+uint256 = st.integers(min_value=0, max_value=2 ** 256 - 1)
+hash32 = st.binary(min_size=32, max_size=32)
+
+
+@given(uint256, uint256, hash32, hash32)
+@example(0, 0, BLANK_ROOT_HASH, EMPTY_SHA3)
+@example(0x7f, 0x80, BLANK_ROOT_HASH, EMPTY_SHA3)
+def test_account_codec_matches_rlp(nonce, balance, storage_root, code_hash):
+    encoded = rlp.encode(Account(nonce, balance, storage_root, code_hash))
+    account = AccountRecord(nonce, balance, storage_root, code_hash)
+
+    assert encode_account(account) == encoded
+    assert decode_account(encoded) == account
+
+
+@given(st.binary(max_size=150))
+def test_account_decoding_matches_rlp(encoded):
+    try:
+        account = rlp.decode(encoded, sedes=Account)
+    except (rlp.DecodingError, rlp.DeserializationError):
+        with pytest.raises((rlp.DecodingError, rlp.DeserializationError)):
+            decode_account(encoded)
+    else:
+        assert decode_account(encoded) == AccountRecord(
+            account.nonce,
+            account.balance,
+            account.storage_root,
+            account.code_hash,
+        )
+
+
+@pytest.mark.parametrize(
+    'encoded_nonce',
+    (
+        # zero as a single byte
+        b'\x00',
+        # a leading zero
+        b'\x82\x00\x01',
+        # a single byte below 0x80 with a length
+        b'\x81\x01',
+    ),
+)
+def test_non_canonical_account_encodings(encoded_nonce):
+    payload = encoded_nonce + b'\x80' + rlp.encode(BLANK_ROOT_HASH) + rlp.encode(EMPTY_SHA3)
+    encoded = b'\xf8' + bytes((len(payload),)) + payload
+
+    with pytest.raises((rlp.DecodingError, rlp.DeserializationError)):
+        decode_account(encoded)
+
+
+def test_unusual_account_layouts():
+    # an empty storage root is valid, but is left to the generic codec
+    account = AccountRecord(1, 2, b'', EMPTY_SHA3)
+    encoded = rlp.encode(Account(1, 2, b'', EMPTY_SHA3))
+    assert encode_account(account) == encoded
+    assert decode_account(encoded) == account
+
+    with pytest.raises(rlp.SerializationError):
+        encode_account(AccountRecord(-1, 0))
+
+
+def test_account_record_copy():
+    account = AccountRecord(nonce=1)
+    updated = account.copy(balance=0, code_hash=b'\x01' * 32)
+
+    assert updated == AccountRecord(1, 0, BLANK_ROOT_HASH, b'\x01' * 32)
+    assert account == AccountRecord(nonce=1)
+    assert updated != account
@@ -0,0 +1,147 @@
+from hypothesis import (
+    given,
+    settings,
+    strategies as st,
+)
+import pytest
+import rlp
+
+from eth.rlp.codecs import (
+    fast_decode,
+    fast_encode,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.rlp.logs import (
+    Log,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth.vm.forks import (
+    ByzantiumVM,
+    ConstantinopleVM,
+    FrontierVM,
+    HomesteadVM,
+    PetersburgVM,
+    SpuriousDragonVM,
+)
+
+
+TRANSACTION_CLASSES = tuple(
+    vm_class.get_transaction_class()
+    for vm_class
+    in (FrontierVM, HomesteadVM, SpuriousDragonVM, ByzantiumVM, ConstantinopleVM, PetersburgVM)
+)
+
+uints = st.one_of(st.integers(min_value=0, max_value=300), st.integers(min_value=0))
+uint256s = st.one_of(
+    st.integers(min_value=0, max_value=300),
+    st.integers(min_value=0, max_value=2 ** 256 - 1),
+)
+hash32s = st.binary(min_size=32, max_size=32)
+addresses = st.one_of(st.just(b''), st.binary(min_size=20, max_size=20))
+# long enough for the encodings of some of the values to have long lengths
+data = st.binary(max_size=100)
+
+headers = st.builds(
+    BlockHeader,
+    parent_hash=hash32s,
+    uncles_hash=hash32s,
+    coinbase=st.binary(min_size=20, max_size=20),
+    state_root=hash32s,
+    transaction_root=hash32s,
+    receipt_root=hash32s,
+    bloom=st.integers(min_value=0, max_value=2 ** 2048 - 1),
+    difficulty=uints,
+    block_number=uints,
+    gas_limit=uints,
+    gas_used=uints,
+    timestamp=uints,
+    extra_data=data,
+    mix_hash=data,
+    nonce=st.one_of(st.just(b''), st.binary(min_size=8, max_size=8)),
+)
+
+logs = st.builds(
+    Log,
+    address=addresses,
+    topics=st.lists(uint256s, max_size=4),
+    data=data,
+)
+
+receipts = st.builds(
+    Receipt,
+    state_root=data,
+    gas_used=uints,
+    logs=st.lists(logs, max_size=3),
+    bloom=st.integers(min_value=0, max_value=2 ** 2048 - 1),
+)
+
+
+@st.composite
+def transactions(draw):
+    transaction_class = draw(st.sampled_from(TRANSACTION_CLASSES))
+    return transaction_class(
+        nonce=draw(uints),
+        gas_price=draw(uints),
+        gas=draw(uints),
+        to=draw(addresses),
+        value=draw(uint256s),
+        data=draw(data),
+        v=draw(uints),
+        r=draw(uint256s),
+        s=draw(uint256s),
+    )
+
+
+serializables = st.one_of(headers, transactions(), receipts, logs)
+
+
+@settings(max_examples=300)
+@given(serializables)
+def test_fast_codecs_match_rlp(obj):
+    sedes = type(obj)
+    encoded = rlp.encode(obj, cache=False)
+
+    assert fast_encode(obj) == encoded
+    decoded = fast_decode(encoded, sedes)
+    assert type(decoded) is sedes
+    assert decoded == rlp.decode(encoded, sedes=sedes)
+    assert decoded._cached_rlp == encoded
+
+
+def _decode_or_error(decode, encoded, sedes):
+    try:
+        return decode(encoded, sedes)
+    except (rlp.DecodingError, rlp.DeserializationError) as error:
+        return type(error)
+
+
+@settings(max_examples=300)
+@given(serializables, st.data())
+def test_fast_decoding_of_corrupted_encodings_matches_rlp(obj, draw):
+    encoded = bytearray(rlp.encode(obj))
+    for _ in range(draw.draw(st.integers(min_value=1, max_value=3))):
+        index = draw.draw(st.integers(min_value=0, max_value=len(encoded) - 1))
+        encoded[index] = draw.draw(st.integers(min_value=0, max_value=255))
+    encoded = bytes(encoded[:draw.draw(st.integers(min_value=0, max_value=len(encoded)))])
+    sedes = type(obj)
+
+    expected = _decode_or_error(lambda data, sedes: rlp.decode(data, sedes=sedes), encoded, sedes)
+    assert _decode_or_error(fast_decode, encoded, sedes) == expected
+
+
+@pytest.mark.parametrize(
+    'make_invalid',
+    (
+        lambda header: header.copy(gas_used=-1),
+        lambda header: header.copy(parent_hash=b'short'),
+        lambda header: header.copy(coinbase=b'\x01' * 21),
+    ),
+)
+def test_fast_encoding_of_invalid_values(make_invalid):
+    header = make_invalid(BlockHeader(difficulty=1, block_number=0, gas_limit=0, timestamp=0))
+    with pytest.raises(rlp.SerializationError):
+        fast_encode(header)
@@ -0,0 +1,35 @@
+import itertools
+
+from eth_bloom import BloomFilter
+from hypothesis import (
+    given,
+    strategies as st,
+)
+
+from eth.rlp.logs import (
+    Log,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+
+
+addresses = st.sampled_from([b'\x00' * 20, b'\x01' * 20, b'\xff' * 20])
+topics = st.integers(min_value=0, max_value=2 ** 256 - 1)
+logs = st.builds(
+    Log,
+    address=addresses,
+    topics=st.lists(topics, max_size=4),
+    data=st.binary(max_size=8),
+)
+
+
+@given(st.lists(logs, max_size=6))
+def test_receipt_bloom_matches_bloom_filter(receipt_logs):
+    receipt = Receipt(state_root=b'\x00' * 32, gas_used=0, logs=receipt_logs)
+
+    bloomables = itertools.chain.from_iterable(log.bloomables for log in receipt_logs)
+    assert receipt.bloom == int(BloomFilter.from_iterable(bloomables))
+    for log in receipt_logs:
+        assert log.bloom == int(BloomFilter.from_iterable(log.bloomables))
+        assert log.bloom & receipt.bloom == log.bloom
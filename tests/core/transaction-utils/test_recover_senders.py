@@ -0,0 +1,83 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+import pytest
+
+import rlp
+
+from eth_keys.exceptions import BadSignature
+from eth_utils import (
+    decode_hex,
+)
+
+from eth.vm.forks.spurious_dragon.transactions import (
+    SpuriousDragonTransaction,
+)
+
+from eth._utils.transactions import (
+    extract_transaction_sender,
+    recover_sender_batch,
+    recover_senders,
+    SENDER_RECOVERY_BATCH_SIZE,
+)
+
+
+@pytest.fixture
+def transactions(txn_fixture):
+    # enough of them to need more than one batch
+    return tuple(
+        rlp.decode(decode_hex(txn_fixture['signed']), sedes=SpuriousDragonTransaction)
+        for _ in range(SENDER_RECOVERY_BATCH_SIZE + 1)
+    )
+
+
+@pytest.mark.parametrize('executor_class', (None, ThreadPoolExecutor, ProcessPoolExecutor))
+def test_recover_senders(transactions, executor_class):
+    expected_senders = tuple(extract_transaction_sender(txn) for txn in transactions)
+
+    if executor_class is None:
+        recover_senders(transactions)
+    else:
+        with executor_class(max_workers=2) as executor:
+            recover_senders(transactions, executor)
+
+    assert tuple(txn._sender for txn in transactions) == expected_senders
+
+
+def test_recovered_sender_is_not_recovered_again(transactions, monkeypatch):
+    recover_senders(transactions)
+
+    def get_sender(self):
+        raise AssertionError("The sender was recovered again")
+
+    monkeypatch.setattr(SpuriousDragonTransaction, 'get_sender', get_sender)
+
+    for transaction in transactions:
+        assert transaction.sender == transaction._sender
+
+
+def test_sender_is_only_recovered_once(transactions):
+    transaction = transactions[0]
+    assert transaction._sender is None
+    sender = transaction.sender
+    assert transaction._sender == sender
+    assert transaction.sender is sender
+
+
+def test_recover_senders_skips_bad_signatures(transactions):
+    good_transaction = transactions[0]
+    bad_transaction = transactions[1].copy(r=0)
+
+    assert recover_sender_batch((good_transaction, bad_transaction)) == (
+        extract_transaction_sender(good_transaction),
+        None,
+    )
+
+    recover_senders((good_transaction, bad_transaction))
+
+    assert good_transaction._sender is not None
+    assert bad_transaction._sender is None
+    with pytest.raises(BadSignature):
+        bad_transaction.sender
@@ -0,0 +1,77 @@
+import pytest
+
+import rlp
+
+from eth_hash.auto import keccak
+from eth_utils import (
+    decode_hex,
+)
+
+from eth.vm.forks.homestead.transactions import (
+    HomesteadTransaction,
+)
+from eth.vm.spoof import SpoofTransaction
+
+
+@pytest.fixture
+def transaction(txn_fixture):
+    return rlp.decode(decode_hex(txn_fixture['signed']), sedes=HomesteadTransaction)
+
+
+def test_transaction_hash_is_cached(transaction):
+    assert transaction._hash is None
+    assert transaction.hash == keccak(rlp.encode(transaction))
+    assert transaction._hash == transaction.hash
+
+
+def test_transaction_intrinsic_gas_is_cached(transaction, monkeypatch):
+    intrinsic_gas = transaction.intrinsic_gas
+    assert intrinsic_gas == transaction.get_intrinsic_gas()
+
+    def get_intrinsic_gas(self):
+        raise AssertionError("The intrinsic gas was computed again")
+
+    monkeypatch.setattr(HomesteadTransaction, 'get_intrinsic_gas', get_intrinsic_gas)
+    assert transaction.intrinsic_gas == intrinsic_gas
+
+
+def test_transaction_copy_is_not_cached(transaction):
+    original_hash = transaction.hash
+    original_intrinsic_gas = transaction.intrinsic_gas
+    original_sender = transaction.sender
+
+    changed_transaction = transaction.copy(data=transaction.data + b'\x01')
+
+    assert changed_transaction._hash is None
+    assert changed_transaction._intrinsic_gas is None
+    assert changed_transaction._sender is None
+    assert changed_transaction.hash != original_hash
+    assert changed_transaction.intrinsic_gas == original_intrinsic_gas + 68
+    assert changed_transaction.sender != original_sender
+
+
+def test_spoof_transaction_without_field_overrides(transaction):
+    spoof = SpoofTransaction(transaction)
+
+    assert spoof.hash == transaction.hash
+    assert spoof.intrinsic_gas == transaction.intrinsic_gas
+    assert spoof.sender == transaction.sender
+
+
+def test_spoof_transaction_derives_values_from_overridden_fields(transaction):
+    original_hash = transaction.hash
+    original_intrinsic_gas = transaction.intrinsic_gas
+    original_sender = transaction.sender
+
+    spoof = SpoofTransaction(transaction, data=transaction.data + b'\x01')
+
+    assert spoof.hash == spoof.spoofed_fields.hash
+    assert spoof.hash != original_hash
+    assert spoof.intrinsic_gas == original_intrinsic_gas + 68
+    assert spoof.get_intrinsic_gas() == original_intrinsic_gas + 68
+    # the sender is not recovered again from the changed fields
+    assert spoof.sender == original_sender
+
+    # the cache of the spoofed transaction is untouched
+    assert transaction.hash == original_hash
+    assert transaction.intrinsic_gas == original_intrinsic_gas
@@ -0,0 +1,250 @@
+import pytest
+
+from eth_keys import keys
+from eth_utils import (
+    decode_hex,
+    ValidationError,
+)
+
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    disable_pow_check,
+    genesis,
+)
+from eth.txpool import (
+    TransactionPool,
+)
+
+
+RECIPIENT = decode_hex('0xa94f5374fce5edbc8e2a8697c15331677e6ebf0c')
+PRIVATE_KEYS = tuple(keys.PrivateKey(bytes([index]) * 32) for index in range(1, 4))
+SENDERS = tuple(key.public_key.to_canonical_address() for key in PRIVATE_KEYS)
+BALANCE = 10 ** 18
+GAS = 21000
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def chain():
+    return build(
+        MiningChain,
+        byzantium_at(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={sender: {'balance': BALANCE} for sender in SENDERS},
+        ),
+    )
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def pool(chain, clock):
+    return TransactionPool(chain.get_vm().state, max_size=5, max_age=60, clock=clock)
+
+
+def make_transaction(chain, sender_index, nonce, gas_price, value=1, gas=GAS):
+    return chain.create_unsigned_transaction(
+        nonce=nonce,
+        gas_price=gas_price,
+        gas=gas,
+        to=RECIPIENT,
+        value=value,
+        data=b'',
+    ).as_signed_transaction(PRIVATE_KEYS[sender_index])
+
+
+def test_select_for_block_by_price_and_nonce(chain, pool):
+    first_0 = make_transaction(chain, 0, 0, gas_price=5)
+    second_0 = make_transaction(chain, 0, 1, gas_price=50)
+    first_1 = make_transaction(chain, 1, 0, gas_price=10)
+    gapped_2 = make_transaction(chain, 2, 1, gas_price=100)
+    rejected = pool.add_many((second_0, gapped_2, first_1, first_0))
+
+    assert rejected == ()
+    assert len(pool) == 4
+    # the gapped transaction waits for nonce 0, and the second one of the first sender
+    # for its first one, despite their higher prices
+    assert pool.select_for_block(3141592) == (first_1, first_0, second_0)
+    assert pool.select_for_block(2 * GAS) == (first_1, first_0)
+    assert pool.select_for_block(GAS - 1) == ()
+
+
+def test_select_for_block_feeds_block_builder(chain, pool):
+    transactions = (
+        make_transaction(chain, 0, 0, gas_price=1),
+        make_transaction(chain, 1, 0, gas_price=2),
+        make_transaction(chain, 1, 1, gas_price=2),
+    )
+    pool.add_many(transactions)
+
+    with chain.build_block() as builder:
+        for transaction in pool.select_for_block(builder.gas_remaining):
+            builder.apply_transaction(transaction)
+    block = chain.mine_block()
+    assert block.transactions == transactions[1:] + transactions[:1]
+
+    # the pool drops what the new state includes
+    pool.set_state(chain.get_vm().state)
+    assert len(pool) == 0
+
+
+def test_add_rejects_invalid_transactions(chain, pool):
+    transaction = make_transaction(chain, 0, 0, gas_price=10)
+    pool.add(transaction)
+    # adding it again does nothing
+    pool.add(transaction)
+    assert len(pool) == 1
+
+    with pytest.raises(ValidationError):
+        # not a higher price
+        pool.add(make_transaction(chain, 0, 0, gas_price=10, value=2))
+    with pytest.raises(ValidationError):
+        pool.add(make_transaction(chain, 0, 1, gas_price=10, value=BALANCE))
+    with pytest.raises(ValidationError):
+        pool.add(make_transaction(chain, 0, 1, gas_price=10, gas=GAS - 1))
+    with pytest.raises(ValidationError):
+        pool.add(make_transaction(chain, 0, 1, gas_price=10, gas=3141593))
+
+    replacement = make_transaction(chain, 0, 0, gas_price=11)
+    pool.add(replacement)
+    assert transaction.hash not in pool
+    assert replacement.hash in pool
+    assert pool.select_for_block(3141592) == (replacement,)
+
+
+def test_add_evicts_cheapest_when_full(chain, pool):
+    pool.add_many(make_transaction(chain, 0, nonce, gas_price=10) for nonce in range(3))
+    cheap = make_transaction(chain, 1, 0, gas_price=1)
+    pool.add(cheap)
+    pool.add(make_transaction(chain, 1, 1, gas_price=20))
+    assert len(pool) == 5
+
+    with pytest.raises(ValidationError):
+        pool.add(make_transaction(chain, 2, 0, gas_price=1))
+
+    # evicting the cheapest transaction also evicts the one of the same sender after it
+    expensive = make_transaction(chain, 2, 0, gas_price=30)
+    pool.add(expensive)
+    assert len(pool) == 4
+    assert cheap.hash not in pool
+    assert expensive.hash in pool
+    assert pool.select_for_block(3141592)[0] == expensive
+
+
+def test_remove_expired(chain, pool, clock):
+    first = make_transaction(chain, 0, 0, gas_price=10)
+    second = make_transaction(chain, 0, 1, gas_price=10)
+    other = make_transaction(chain, 1, 0, gas_price=10)
+    pool.add(second)
+    clock.now = 30
+    pool.add(first)
+    pool.add(other)
+
+    clock.now = 60
+    assert pool.remove_expired() == (second,)
+    assert len(pool) == 2
+
+    clock.now = 90
+    assert pool.remove_expired() == (first, other)
+    assert len(pool) == 0
+
+
+def test_remove_drops_later_nonces(chain, pool):
+    transactions = tuple(make_transaction(chain, 0, nonce, gas_price=10) for nonce in range(3))
+    pool.add_many(transactions)
+
+    pool.remove(transactions[1])
+    assert [pooled.transaction for pooled in pool] == [transactions[0]]
+    assert pool.select_for_block(3141592) == transactions[:1]
+
+
+def test_add_checks_cumulative_cost(chain, pool):
+    # each of them on its own is affordable, but not all three together
+    value = BALANCE // 3
+    first = make_transaction(chain, 0, 0, gas_price=1, value=value)
+    second = make_transaction(chain, 0, 1, gas_price=1, value=value)
+    pool.add_many((first, second))
+
+    with pytest.raises(ValidationError, match='cannot afford'):
+        pool.add(make_transaction(chain, 0, 2, gas_price=1, value=value))
+    # not even in a gap, before the later nonces
+    with pytest.raises(ValidationError, match='cannot afford'):
+        pool.add(make_transaction(chain, 0, 5, gas_price=1, value=value))
+
+    # a replacement only has to be affordable instead of the one it replaces
+    with pytest.raises(ValidationError, match='cannot afford'):
+        pool.add(make_transaction(chain, 0, 1, gas_price=2, value=BALANCE - value))
+    replacement = make_transaction(chain, 0, 1, gas_price=2, value=value + 1)
+    pool.add(replacement)
+
+    # removing transactions makes room for others, up to all of the balance
+    pool.remove(replacement)
+    third = make_transaction(chain, 0, 1, gas_price=1, value=BALANCE - value - 2 * GAS)
+    pool.add(third)
+    assert pool.select_for_block(3141592) == (first, third)
+
+
+def test_set_state_checks_cumulative_cost(chain, pool):
+    value = BALANCE // 4
+    transactions = tuple(
+        make_transaction(chain, 0, nonce, gas_price=1, value=value) for nonce in range(3)
+    )
+    pool.add_many(transactions)
+    other = make_transaction(chain, 1, 0, gas_price=1)
+    pool.add(other)
+
+    # the sender spends half of its balance elsewhere
+    with chain.build_block() as builder:
+        builder.apply_transaction(
+            make_transaction(chain, 0, 0, gas_price=2, value=BALANCE // 2)
+        )
+    chain.mine_block()
+    pool.set_state(chain.get_vm().state)
+
+    # the first one was replaced, and only one of the others is still affordable
+    assert [pooled.transaction for pooled in pool] == [transactions[1], other]
+
+    # which leaves no room for another one
+    with pytest.raises(ValidationError, match='cannot afford'):
+        pool.add(make_transaction(chain, 0, 2, gas_price=1, value=value))
+
+
+def test_add_does_not_evict_its_own_predecessor(chain, clock):
+    pool = TransactionPool(chain.get_vm().state, max_size=1, max_age=60, clock=clock)
+    first = make_transaction(chain, 0, 0, gas_price=1)
+    pool.add(first)
+
+    with pytest.raises(ValidationError, match='same sender'):
+        pool.add(make_transaction(chain, 0, 1, gas_price=5))
+    assert [pooled.transaction for pooled in pool] == [first]
+
+    # another sender can still push it out
+    other = make_transaction(chain, 1, 0, gas_price=5)
+    pool.add(other)
+    assert [pooled.transaction for pooled in pool] == [other]
+
+
+def test_rejected_senders_are_not_kept(chain, pool):
+    with pytest.raises(ValidationError, match='cannot afford'):
+        pool.add(make_transaction(chain, 0, 0, gas_price=1, value=BALANCE))
+    assert len(pool) == 0
+    assert pool._senders == {}
+
+    pool.add_many(make_transaction(chain, 0, nonce, gas_price=10) for nonce in range(5))
+    with pytest.raises(ValidationError, match='full'):
+        pool.add(make_transaction(chain, 1, 0, gas_price=1))
+    assert set(pool._senders) == {SENDERS[0]}
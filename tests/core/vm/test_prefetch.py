@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from eth_utils import (
+    decode_hex,
+    to_wei,
+)
+
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    copy,
+    disable_pow_check,
+    genesis,
+)
+from eth.vm.prefetch import (
+    PrefetchDB,
+    StatePrefetcher,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+# increments storage slot 0
+COUNTER = decode_hex('0x' + '33' * 20)
+
+
+@pytest.fixture
+def genesis_chain(funded_address):
+    return build(
+        MiningChain,
+        byzantium_at(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={
+                funded_address: {'balance': to_wei(10, 'ether')},
+                COUNTER: {'code': decode_hex('0x60005460010160005500'), 'storage': {0: 1}},
+            },
+        ),
+    )
+
+
+@pytest.fixture
+def transaction(genesis_chain, funded_address, funded_address_private_key):
+    return new_transaction(
+        genesis_chain.get_vm(),
+        funded_address,
+        COUNTER,
+        0,
+        funded_address_private_key,
+    )
+
+
+@pytest.mark.parametrize('pre_execute', (False, True))
+def test_prefetch(genesis_chain, transaction, funded_address, pre_execute):
+    state = genesis_chain.get_vm().state
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        prefetcher = StatePrefetcher(executor, pre_execute)
+        with prefetcher.prefetch(state, (transaction,)) as prefetch_db:
+            # wait for everything to be prefetched
+            executor.shutdown(wait=True)
+
+            assert state.account_db.get_balance(funded_address) == to_wei(10, 'ether')
+            assert state.account_db.get_code(COUNTER) == decode_hex('0x60005460010160005500')
+            account_reads_saved = prefetch_db.cold_reads_saved
+            assert account_reads_saved > 0
+
+            assert state.account_db.get_storage(COUNTER, 0) == 1
+            if pre_execute:
+                assert prefetch_db.cold_reads_saved > account_reads_saved
+            else:
+                assert prefetch_db.cold_reads_saved == account_reads_saved
+
+    # reads go straight to the database again
+    assert state.account_db._batchdb.wrapped_db is genesis_chain.chaindb.db
+
+
+@pytest.mark.parametrize('pre_execute', (False, True))
+def test_import_block_with_prefetcher(genesis_chain, transaction, pre_execute):
+    mining_chain = build(genesis_chain, copy)
+    mining_chain.apply_transaction(transaction)
+    block = mining_chain.mine_block()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        genesis_chain.state_prefetcher = StatePrefetcher(executor, pre_execute)
+        imported_block, _, _ = genesis_chain.import_block(block)
+
+    assert imported_block == block
+    assert genesis_chain.get_canonical_head() == block.header
+
+
+def test_prefetch_db(base_db):
+    base_db[b'key'] = b'value'
+    prefetch_db = PrefetchDB(base_db)
+
+    assert prefetch_db[b'key'] == b'value'
+    assert prefetch_db.cold_reads_saved == 0
+
+    assert prefetch_db.prefetch(b'key') == b'value'
+    assert prefetch_db[b'key'] == b'value'
+    assert prefetch_db[b'key'] == b'value'
+    assert prefetch_db.cold_reads_saved == 1
+
+    with pytest.raises(KeyError):
+        prefetch_db.prefetch(b'missing')
+
+    prefetch_db[b'other key'] = b'other value'
+    assert base_db[b'other key'] == b'other value'
+
+    del prefetch_db[b'key']
+    assert b'key' not in prefetch_db
+    assert b'key' not in base_db
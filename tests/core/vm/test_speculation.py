@@ -0,0 +1,189 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+import logging
+
+import pytest
+
+from eth_keys import keys
+from eth_utils import (
+    decode_hex,
+    int_to_big_endian,
+    to_wei,
+)
+
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    constantinople_at,
+    copy,
+    disable_dao_fork,
+    disable_pow_check,
+    frontier_at,
+    genesis,
+    homestead_at,
+    spurious_dragon_at,
+    tangerine_whistle_at,
+)
+from eth.vm import base
+from eth.vm.speculation import (
+    RecordingAccountDB,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+SENDER_KEYS = tuple(
+    keys.PrivateKey(int_to_big_endian(index).rjust(32, b'\0'))
+    for index in range(1, 7)
+)
+SENDERS = tuple(key.public_key.to_canonical_address() for key in SENDER_KEYS)
+
+EXISTING_RECIPIENT = decode_hex('0x' + '11' * 20)
+NEW_RECIPIENT = decode_hex('0x' + '22' * 20)
+# increments storage slot 0
+COUNTER = decode_hex('0x' + '33' * 20)
+# stores the value sent to it at the slot of the caller
+DEPOSITS = decode_hex('0x' + '44' * 20)
+# self-destructs in favor of the caller
+SUICIDAL = decode_hex('0x' + '55' * 20)
+
+GENESIS_STATE = {
+    EXISTING_RECIPIENT: {'balance': 1},
+    COUNTER: {'code': decode_hex('0x60005460010160005500'), 'storage': {0: 1}},
+    DEPOSITS: {'code': decode_hex('0x343355'), 'storage': {1: 1}},
+    SUICIDAL: {'code': decode_hex('0x33ff'), 'balance': 1000},
+}
+GENESIS_STATE.update({sender: {'balance': to_wei(10, 'ether')} for sender in SENDERS})
+
+# stores 1 at slot 0, and returns no code
+INIT_CODE = decode_hex('0x600160005500')
+
+
+@pytest.fixture(params=(
+    (frontier_at(0),),
+    (homestead_at(0), disable_dao_fork),
+    (tangerine_whistle_at(0),),
+    (spurious_dragon_at(0),),
+    (byzantium_at(0),),
+    (constantinople_at(0),),
+))
+def genesis_chain(request):
+    return build(
+        MiningChain,
+        *request.param,
+        disable_pow_check,
+        genesis(params={'gas_limit': 3141592}, state=GENESIS_STATE)
+    )
+
+
+# Transactions which touch the same accounts in every way they could, along with others
+# that don't: (sender index, recipient, value, extra transaction parameters)
+TRANSACTIONS = (
+    (0, EXISTING_RECIPIENT, 1, {}),
+    (1, NEW_RECIPIENT, 2, {}),
+    (2, NEW_RECIPIENT, 3, {}),
+    (3, COUNTER, 0, {}),
+    (4, DEPOSITS, 5, {}),
+    (5, DEPOSITS, 6, {}),
+    # runs out of gas
+    (0, COUNTER, 0, {'gas': 21010}),
+    (1, b'', 0, {'data': INIT_CODE}),
+    (2, SUICIDAL, 0, {}),
+    (3, SUICIDAL, 0, {'gas_price': 0}),
+)
+
+
+def _mine_block(chain):
+    for sender_index, recipient, value, params in TRANSACTIONS:
+        transaction = new_transaction(
+            chain.get_vm(),
+            SENDERS[sender_index],
+            recipient,
+            value,
+            SENDER_KEYS[sender_index],
+            **params
+        )
+        chain.apply_transaction(transaction)
+    return chain.mine_block()
+
+
+@pytest.fixture
+def block(genesis_chain):
+    return _mine_block(build(genesis_chain, copy))
+
+
+@pytest.mark.parametrize('executor_class', (ThreadPoolExecutor, ProcessPoolExecutor))
+def test_speculative_import_matches_sequential_import(genesis_chain,
+                                                      block,
+                                                      executor_class,
+                                                      caplog):
+    caplog.set_level(logging.DEBUG)
+    with executor_class(max_workers=2) as executor:
+        genesis_chain.speculative_executor = executor
+        imported_block, _, _ = genesis_chain.import_block(block)
+
+    # the state root, receipt root, bloom and gas used are all the same
+    assert imported_block == block
+    assert genesis_chain.get_canonical_head() == block.header
+
+    # the second transfer to the new recipient, which sees it exist, and the last four,
+    # whose senders' nonces and balances were changed by their earlier transactions
+    assert "Executed 5 of 10 speculatively executed transactions again" in caplog.text
+
+
+def test_speculative_import_of_many_blocks(genesis_chain, monkeypatch):
+    mining_chain = build(genesis_chain, copy)
+    blocks = tuple(_mine_block(mining_chain) for _ in range(3))
+
+    account_dbs = []
+
+    class CountedRecordingAccountDB(RecordingAccountDB):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            account_dbs.append(self)
+
+    monkeypatch.setattr(base, 'RecordingAccountDB', CountedRecordingAccountDB)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        genesis_chain.speculative_executor = executor
+        imported_blocks = tuple(
+            imported_block
+            for imported_block, _, _ in genesis_chain.import_blocks(blocks)
+        )
+
+    assert imported_blocks == blocks
+    assert genesis_chain.get_canonical_head() == blocks[-1].header
+    # the account database of the first block is carried on with by the others
+    assert len(account_dbs) == 1
+
+
+def test_recording_account_db_changes(base_db):
+    account_db = RecordingAccountDB(base_db)
+    account_db.set_balance(EXISTING_RECIPIENT, 10)
+    account_db.set_storage(COUNTER, 0, 1)
+    account_db.persist()
+
+    account_db.start_recording()
+    account_db.delta_balance(EXISTING_RECIPIENT, 5)
+    account_db.set_storage(COUNTER, 0, account_db.get_storage(COUNTER, 0) + 1)
+    snapshot = account_db.record()
+    account_db.set_nonce(NEW_RECIPIENT, 1)
+    account_db.discard(snapshot)
+    reads, writes, account_changes = account_db.stop_recording()
+
+    assert (EXISTING_RECIPIENT, 'balance') not in reads
+    assert (COUNTER, 0) in reads
+    assert (NEW_RECIPIENT, 'nonce') in reads
+    assert writes == {(EXISTING_RECIPIENT, 'balance'), (COUNTER, 0), (COUNTER, 'storage')}
+
+    recipient_changes, counter_changes = sorted(account_changes)
+    assert recipient_changes.address == EXISTING_RECIPIENT
+    assert recipient_changes.balance is None
+    assert recipient_changes.balance_delta == 5
+    assert counter_changes.address == COUNTER
+    assert counter_changes.storage == ((0, 2),)
@@ -73,3 +73,49 @@ def test_import_block(chain, funded_address, funded_address_private_key):
     validation_vm = chain.get_vm(pending_header)
     block = validation_vm.import_block(new_block)
     assert block.transactions == (tx, )
+
+
+def test_prev_hashes_served_from_canonical_ring(chain):
+    if not isinstance(chain, MiningChain):
+        pytest.skip("Only test mining on a MiningChain")
+        return
+
+    mined_blocks = tuple(chain.mine_block() for _ in range(3))
+
+    vm = chain.get_vm()
+    prev_hashes = vm.state.execution_context.prev_hashes
+    assert isinstance(prev_hashes, tuple)
+
+    expected = tuple(block.hash for block in reversed(mined_blocks)) + (
+        chain.get_canonical_block_hash(0),
+    )
+    assert prev_hashes == expected
+    assert tuple(vm._walk_prev_hashes(vm.block.header.parent_hash, chain.chaindb)) == expected
+
+    for depth, block in enumerate(reversed(mined_blocks)):
+        assert vm.state.get_ancestor_hash(vm.block.number - depth - 1) == block.hash
+
+
+def test_import_block_carries_on_with_parent_state(chain):
+    if not isinstance(chain, MiningChain):
+        pytest.skip("Only test mining on a MiningChain")
+        return
+
+    genesis_header = chain.get_canonical_head()
+    block_1 = chain.mine_block()
+    block_2 = chain.mine_block()
+
+    vm_1 = chain.get_vm(chain.create_header_from_parent(genesis_header))
+    vm_1.import_block(block_1)
+
+    vm_2 = chain.get_vm(chain.create_header_from_parent(block_1.header))
+    imported_block_2 = vm_2.import_block(block_2, parent_state=vm_1.state)
+    assert vm_2.state.account_db is vm_1.state.account_db
+    assert imported_block_2.header.state_root == block_2.header.state_root
+
+    # a state left at any other state root is not carried on with
+    unrelated_vm = chain.get_vm(chain.create_header_from_parent(genesis_header))
+    vm_2 = chain.get_vm(chain.create_header_from_parent(block_1.header))
+    imported_block_2 = vm_2.import_block(block_2, parent_state=unrelated_vm.state)
+    assert vm_2.state.account_db is not unrelated_vm.state.account_db
+    assert imported_block_2.header.state_root == block_2.header.state_root
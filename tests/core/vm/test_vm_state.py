@@ -4,6 +4,10 @@ from eth.db.backends.memory import MemoryDB
 from eth.exceptions import StateRootNotFound
 from eth.vm.forks.frontier.state import FrontierState
 
+from tests.core.helpers import (
+    new_transaction,
+)
+
 
 @pytest.fixture
 def state(chain_without_block_validation):
@@ -27,3 +31,44 @@ def test_missing_state_root():
     state = FrontierState(MemoryDB(), context, b'\x0f' * 32)
     with pytest.raises(StateRootNotFound):
         state.apply_transaction(None)
+
+
+def test_apply_transaction_access_summary(chain_without_block_validation,
+                                          funded_address,
+                                          funded_address_private_key):
+    vm = chain_without_block_validation.get_vm()
+    recipient = b'\x10' * 20
+    transaction = new_transaction(vm, funded_address, recipient, 1, funded_address_private_key)
+
+    _, _, access_summary = vm.state.apply_transaction(transaction)
+    assert access_summary is None
+
+    transaction = new_transaction(vm, funded_address, recipient, 1, funded_address_private_key)
+    state = vm.state
+    state.record_accesses = True
+    state_root, computation, access_summary = state.apply_transaction(transaction)
+
+    assert computation.is_success
+    assert state_root == state.state_root
+    assert {funded_address, recipient, state.coinbase} <= access_summary.accounts_written
+    assert access_summary.accounts_written <= access_summary.accounts_read
+    assert not access_summary.storage_read
+
+
+def test_read_only_state_records_accesses(chain_without_block_validation,
+                                          funded_address,
+                                          funded_address_private_key):
+    vm = chain_without_block_validation.get_vm()
+    recipient = b'\x10' * 20
+    transaction = new_transaction(vm, funded_address, recipient, 1, funded_address_private_key)
+
+    with vm.state_in_temp_block(read_only=True) as state:
+        state.record_accesses = True
+        state.account_db.start_recording_accesses()
+        computation = state.execute_transaction(transaction)
+        access_summary = state.account_db.stop_recording_accesses()
+
+    assert computation.is_success
+    assert {funded_address, recipient, state.coinbase} <= access_summary.accounts_written
+    assert access_summary.accounts_written <= access_summary.accounts_read
+    assert not access_summary.storage_read
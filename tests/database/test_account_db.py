@@ -6,9 +6,11 @@ from eth_utils import (
     ValidationError,
 )
 
+from eth.db import account as account_module
 from eth.db.backends.memory import MemoryDB
 from eth.db.account import (
     AccountDB,
+    ReadOnlyAccountDB,
 )
 
 from eth.constants import (
@@ -23,6 +25,7 @@ INVALID_ADDRESS = b'aa' * 20
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_balance(state):
     assert state.get_balance(ADDRESS) == 0
@@ -49,6 +52,7 @@ def test_balance(state):
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_nonce(state):
     assert state.get_nonce(ADDRESS) == 0
@@ -73,6 +77,7 @@ def test_nonce(state):
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_code(state):
     assert state.get_code(ADDRESS) == b''
@@ -93,6 +98,7 @@ def test_code(state):
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_storage(state):
     assert state.get_storage(ADDRESS, 0) == 0
@@ -116,6 +122,7 @@ def test_storage(state):
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_storage_deletion(state):
     state.set_storage(ADDRESS, 0, 123)
@@ -130,6 +137,7 @@ def test_storage_deletion(state):
 
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
+    ReadOnlyAccountDB(MemoryDB()),
 ])
 def test_accounts(state):
     assert not state.account_exists(ADDRESS)
@@ -155,3 +163,159 @@ def test_accounts(state):
         state.delete_account(INVALID_ADDRESS)
     with pytest.raises(ValidationError):
         state.account_has_code_or_nonce(INVALID_ADDRESS)
+
+
+@pytest.mark.parametrize("account_db_class", [AccountDB, ReadOnlyAccountDB])
+def test_recording_accesses(account_db_class):
+    state = account_db_class(MemoryDB())
+    state.set_code(ADDRESS, b'code')
+    state.set_storage(ADDRESS, 0, 1)
+
+    state.start_recording_accesses()
+    state.get_code(ADDRESS)
+    state.set_storage(ADDRESS, 1, state.get_storage(ADDRESS, 0))
+    state.get_balance(OTHER_ADDRESS)
+    summary = state.stop_recording_accesses()
+
+    assert summary.accounts_read == {ADDRESS, OTHER_ADDRESS}
+    assert summary.accounts_written == {ADDRESS}
+    assert summary.storage_read == {(ADDRESS, 0), (ADDRESS, 1)}
+    assert summary.storage_written == {(ADDRESS, 1)}
+    assert summary.code_read == {keccak(b'code')}
+    assert summary.code_written == set()
+
+    # nothing is recorded anymore
+    state.set_balance(ADDRESS, 1)
+    state.start_recording_accesses()
+    assert state.stop_recording_accesses().accounts_read == set()
+
+
+@pytest.mark.parametrize("account_db_class", [AccountDB, ReadOnlyAccountDB])
+def test_recording_accesses_follows_checkpoints(account_db_class):
+    state = account_db_class(MemoryDB())
+    before_recording = state.record()
+
+    state.start_recording_accesses()
+    state.set_balance(ADDRESS, 1)
+
+    committed = state.record()
+    state.set_nonce(ADDRESS, 1)
+    discarded = state.record()
+    state.set_storage(OTHER_ADDRESS, 0, 1)
+    state.discard(discarded)
+    state.commit(committed)
+
+    # still open when recording stops
+    state.record()
+    state.set_code(OTHER_ADDRESS, b'code')
+
+    summary = state.stop_recording_accesses()
+    assert summary.accounts_read == {ADDRESS, OTHER_ADDRESS}
+    assert summary.accounts_written == {ADDRESS, OTHER_ADDRESS}
+    assert summary.storage_read == {(OTHER_ADDRESS, 0)}
+    assert summary.storage_written == set()
+    assert summary.code_written == {keccak(b'code')}
+
+    state.start_recording_accesses()
+    state.set_balance(OTHER_ADDRESS, 1)
+    state.discard(before_recording)
+    summary = state.stop_recording_accesses()
+    assert summary.accounts_read == {OTHER_ADDRESS}
+    assert summary.accounts_written == set()
+
+
+@pytest.mark.parametrize("account_db_class", [AccountDB, ReadOnlyAccountDB])
+def test_recording_accesses_twice(account_db_class):
+    state = account_db_class(MemoryDB())
+    with pytest.raises(ValidationError):
+        state.stop_recording_accesses()
+
+    state.start_recording_accesses()
+    with pytest.raises(ValidationError):
+        state.start_recording_accesses()
+
+
+def test_accounts_are_encoded_when_written_to_trie(monkeypatch):
+    encoded = []
+
+    def encode_account(account):
+        encoded.append(account)
+        return original_encode_account(account)
+
+    original_encode_account = account_module.encode_account
+    monkeypatch.setattr(account_module, 'encode_account', encode_account)
+
+    db = MemoryDB()
+    account_db = AccountDB(db)
+    account_db.set_balance(ADDRESS, 10)
+    changeset = account_db.record()
+    account_db.increment_nonce(ADDRESS)
+    account_db.set_balance(OTHER_ADDRESS, 5)
+    account_db.discard(changeset)
+    account_db.set_code(ADDRESS, b'code')
+    account_db.delta_balance(ADDRESS, -1)
+    assert encoded == []
+
+    state_root = account_db.make_state_root()
+    assert len(encoded) == 1
+    assert (encoded[0].nonce, encoded[0].balance) == (0, 9)
+
+    account_db.persist()
+    state = AccountDB(db, state_root)
+    assert state.get_balance(ADDRESS) == 9
+    assert state.get_code(ADDRESS) == b'code'
+    assert not state.account_exists(OTHER_ADDRESS)
+
+
+def test_read_only_overlay():
+    db = MemoryDB()
+    account_db = AccountDB(db)
+    account_db.set_balance(ADDRESS, 10)
+    account_db.set_storage(ADDRESS, 0, 1)
+    account_db.set_storage(ADDRESS, 1, 2)
+    account_db.set_code(ADDRESS, b'code')
+    account_db.persist()
+    state_root = account_db.state_root
+    stored = dict(db.kv_store)
+
+    state = ReadOnlyAccountDB(db, state_root)
+    assert state.get_balance(ADDRESS) == 10
+    assert state.get_storage(ADDRESS, 1) == 2
+    assert state.get_code(ADDRESS) == b'code'
+
+    state.set_balance(ADDRESS, 5)
+    state.set_storage(ADDRESS, 0, 3)
+    state.set_code(OTHER_ADDRESS, b'other')
+
+    changeset = state.record()
+    state.delete_storage(ADDRESS)
+    state.delete_account(OTHER_ADDRESS)
+    inner_changeset = state.record()
+    state.set_storage(ADDRESS, 1, 4)
+    state.commit(inner_changeset)
+    assert state.get_storage(ADDRESS, 0) == 0
+    assert state.get_storage(ADDRESS, 1) == 4
+    # the value at the state root
+    assert state.get_storage(ADDRESS, 1, from_journal=False) == 2
+    assert not state.account_exists(OTHER_ADDRESS)
+
+    state.discard(changeset)
+    assert state.get_balance(ADDRESS) == 5
+    assert state.get_storage(ADDRESS, 0) == 3
+    assert state.get_storage(ADDRESS, 1) == 2
+    assert state.get_code(OTHER_ADDRESS) == b'other'
+    with pytest.raises(ValidationError):
+        state.discard(inner_changeset)
+
+    # same root, like when reverting a snapshot
+    state.state_root = state_root
+    with pytest.raises(ValidationError):
+        state.state_root = keccak(b'another root')
+    with pytest.raises(ValidationError):
+        state.make_state_root()
+    with pytest.raises(ValidationError):
+        state.persist()
+
+    # none of it reached the database
+    assert db.kv_store == stored
+    assert AccountDB(db, state_root).get_balance(ADDRESS) == 10
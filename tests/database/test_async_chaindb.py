@@ -0,0 +1,186 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.db.chain import (
+    AsyncChainDB,
+)
+from eth.db.header import (
+    AsyncHeaderDB,
+)
+from eth.exceptions import (
+    ParentNotFound,
+    TransactionNotFound,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth._utils.address import (
+    force_bytes_to_address,
+)
+
+from tests.core.helpers import (
+    new_transaction,
+)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.jobs = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.jobs += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def executor():
+    with CountingExecutor() as executor:
+        yield executor
+
+
+@pytest.fixture
+def genesis_header():
+    return BlockHeader(difficulty=1, block_number=0, gas_limit=0)
+
+
+def mk_header_chain(parent, length):
+    headers = []
+    for _ in range(length):
+        parent = BlockHeader.from_parent(
+            parent,
+            gas_limit=0,
+            difficulty=1,
+            timestamp=parent.timestamp + 1,
+        )
+        headers.append(parent)
+    return tuple(headers)
+
+
+@pytest.fixture
+def chain(chain_without_block_validation):
+    if not isinstance(chain_without_block_validation, MiningChain):
+        pytest.skip("these tests require a mining chain implementation")
+    else:
+        return chain_without_block_validation
+
+
+@pytest.mark.asyncio
+async def test_coro_body_lookups(chain, funded_address, funded_address_private_key):
+    for _ in range(3):
+        chain.apply_transaction(new_transaction(
+            chain.get_vm(),
+            from_=funded_address,
+            to=force_bytes_to_address(b'\x10\x10'),
+            private_key=funded_address_private_key,
+        ))
+    block = chain.mine_block()
+    chaindb = chain.chaindb
+    async_chaindb = AsyncChainDB(chaindb.db)
+
+    assert await async_chaindb.coro_get_canonical_head() == block.header
+    assert await async_chaindb.coro_get_block_uncles(block.header.uncles_hash) == []
+    assert await async_chaindb.coro_get_block_transactions(
+        block.header,
+        block.transaction_class,
+    ) == chaindb.get_block_transactions(block.header, block.transaction_class)
+    assert await async_chaindb.coro_get_block_transaction_hashes(block.header) == [
+        transaction.hash for transaction in block.transactions
+    ]
+    assert await async_chaindb.coro_get_receipts(
+        block.header,
+        Receipt,
+    ) == chaindb.get_receipts(block.header, Receipt)
+    assert await async_chaindb.coro_get_receipt_by_index(
+        block.number,
+        2,
+    ) == chaindb.get_receipt_by_index(block.number, 2)
+    assert await async_chaindb.coro_get_transaction_by_index(
+        block.number,
+        1,
+        block.transaction_class,
+    ) == block.transactions[1]
+    assert await async_chaindb.coro_get_transaction_index(
+        block.transactions[2].hash,
+    ) == (block.number, 2)
+    assert await async_chaindb.coro_exists(block.header.state_root)
+    assert await async_chaindb.coro_get_logs(
+        0,
+        block.number,
+        [force_bytes_to_address(b'\x10\x10')],
+        [None, [1]],
+    ) == ()
+
+    with pytest.raises(TransactionNotFound):
+        await async_chaindb.coro_get_transaction_by_index(
+            block.number,
+            3,
+            block.transaction_class,
+        )
+
+
+@pytest.mark.asyncio
+async def test_coro_lookups_are_coalesced(base_db, genesis_header, executor):
+    lookups = []
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowHeaderDB(AsyncHeaderDB):
+        def get_score(self, block_hash):
+            lookups.append(block_hash)
+            started.set()
+            release.wait()
+            return super().get_score(block_hash)
+
+    headerdb = SlowHeaderDB(base_db, executor=executor)
+    headerdb.persist_header(genesis_header)
+
+    first = asyncio.ensure_future(headerdb.coro_get_score(genesis_header.hash))
+    await asyncio.sleep(0)
+    # cancelling one of the callers leaves the lookup running for the others
+    cancelled = asyncio.ensure_future(headerdb.coro_get_score(genesis_header.hash))
+    second = asyncio.ensure_future(headerdb.coro_get_score(genesis_header.hash))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    await asyncio.get_event_loop().run_in_executor(None, started.wait)
+    release.set()
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert lookups == [genesis_header.hash]
+
+    # later lookups go to the database again
+    assert await headerdb.coro_get_score(genesis_header.hash) == 1
+    assert lookups == [genesis_header.hash] * 2
+
+
+@pytest.mark.asyncio
+async def test_coro_writes_are_batched_in_order(base_db, genesis_header, executor):
+    headerdb = AsyncHeaderDB(base_db, executor=executor)
+    headers = mk_header_chain(genesis_header, 3)
+    orphan = mk_header_chain(BlockHeader(difficulty=1, block_number=10, gas_limit=0), 1)[0]
+
+    results = await asyncio.gather(
+        headerdb.coro_persist_header(genesis_header),
+        headerdb.coro_persist_header(orphan),
+        headerdb.coro_persist_header_chain(iter(headers)),
+        return_exceptions=True,
+    )
+
+    assert results[0] == ((genesis_header,), ())
+    # the failing write doesn't affect the others
+    assert isinstance(results[1], ParentNotFound)
+    assert results[2] == (headers, ())
+    assert executor.jobs == 1
+
+    assert await headerdb.coro_get_canonical_head() == headers[-1]
+    assert await headerdb.coro_get_canonical_block_hash(2) == headers[1].hash
+    assert await headerdb.coro_header_exists(orphan.hash) is False
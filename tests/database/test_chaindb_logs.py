@@ -0,0 +1,288 @@
+import pytest
+
+from eth.db import bloom_bits
+from eth.db.bloom_bits import (
+    get_first_indexed_block_number,
+    get_matching_block_numbers,
+)
+from eth.db.chain import (
+    ChainDB,
+)
+from eth.db.trie import (
+    make_trie_root_and_nodes,
+)
+from eth.rlp.headers import (
+    BlockHeader,
+)
+from eth.rlp.logs import (
+    Log,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth.vm.forks.frontier.transactions import (
+    FrontierTransaction,
+)
+
+
+A_ADDRESS = b'\xaa' * 20
+B_ADDRESS = b'\xbb' * 20
+C_ADDRESS = b'\xcc' * 20
+
+TOPIC_1 = 1
+TOPIC_2 = 2
+TOPIC_3 = 3
+
+
+@pytest.fixture
+def genesis_header():
+    return BlockHeader(difficulty=1, block_number=0, gas_limit=3141592)
+
+
+def mk_block(chaindb, parent, logs_of_transactions, difficulty=1):
+    """
+    Persist a block with a transaction for each list of logs, and return its header
+    and the hashes of its transactions.
+    """
+    transactions = tuple(
+        FrontierTransaction(
+            nonce=index,
+            gas_price=1,
+            gas=21000,
+            to=A_ADDRESS,
+            value=parent.block_number,
+            data=b'',
+            v=27,
+            r=1,
+            s=1,
+        )
+        for index in range(len(logs_of_transactions))
+    )
+    receipts = tuple(
+        Receipt(state_root=b'\x00' * 32, gas_used=21000 * (index + 1), logs=logs)
+        for index, logs in enumerate(logs_of_transactions)
+    )
+    transaction_root, transaction_nodes = make_trie_root_and_nodes(transactions)
+    receipt_root, receipt_nodes = make_trie_root_and_nodes(receipts)
+    chaindb.persist_trie_data_dict(transaction_nodes)
+    chaindb.persist_trie_data_dict(receipt_nodes)
+
+    bloom = 0
+    for receipt in receipts:
+        bloom |= receipt.bloom
+    header = BlockHeader.from_parent(
+        parent,
+        gas_limit=parent.gas_limit,
+        difficulty=difficulty,
+        timestamp=parent.timestamp + 1,
+        transaction_root=transaction_root,
+        receipt_root=receipt_root,
+    ).copy(bloom=bloom)
+    chaindb.persist_header(header)
+    return header, [transaction.hash for transaction in transactions]
+
+
+def mk_chain(chaindb, parent, logs_of_blocks, difficulty=1):
+    blocks = []
+    for logs_of_transactions in logs_of_blocks:
+        header, transaction_hashes = mk_block(chaindb, parent, logs_of_transactions, difficulty)
+        blocks.append((header, transaction_hashes))
+        parent = header
+    return blocks
+
+
+def get_positions(block_logs):
+    return [
+        (block_log.block_number, block_log.transaction_index, block_log.log_index)
+        for block_log in block_logs
+    ]
+
+
+@pytest.fixture(params=[True, False])
+def chaindb(base_db, genesis_header, request):
+    chaindb = ChainDB(base_db, bloom_bits_index=request.param)
+    chaindb.persist_header(genesis_header)
+    return chaindb
+
+
+@pytest.fixture
+def blocks(chaindb, genesis_header):
+    return mk_chain(chaindb, genesis_header, [
+        # block 1
+        [[Log(A_ADDRESS, [TOPIC_1], b'one')], [Log(B_ADDRESS, [TOPIC_1, TOPIC_2], b'two')]],
+        # block 2
+        [],
+        # block 3
+        [[], [Log(C_ADDRESS, [], b'three'), Log(A_ADDRESS, [TOPIC_3, TOPIC_2], b'four')]],
+        # block 4
+        [[Log(B_ADDRESS, [TOPIC_2], b'five')]],
+    ])
+
+
+def test_get_logs_without_filters(chaindb, blocks):
+    block_logs = chaindb.get_logs(0, 4)
+
+    assert [block_log.log.data for block_log in block_logs] == [
+        b'one',
+        b'two',
+        b'three',
+        b'four',
+        b'five',
+    ]
+    assert get_positions(block_logs) == [(1, 0, 0), (1, 1, 1), (3, 1, 0), (3, 1, 1), (4, 0, 0)]
+
+    header, transaction_hashes = blocks[2]
+    assert block_logs[3].block_hash == header.hash
+    assert block_logs[3].transaction_hash == transaction_hashes[1]
+
+
+@pytest.mark.parametrize(
+    'addresses, topics, expected',
+    (
+        ([A_ADDRESS], None, [b'one', b'four']),
+        ([A_ADDRESS, C_ADDRESS], None, [b'one', b'three', b'four']),
+        (None, [[TOPIC_1]], [b'one', b'two']),
+        (None, [[TOPIC_1, TOPIC_3]], [b'one', b'two', b'four']),
+        (None, [None, [TOPIC_2]], [b'two', b'four']),
+        # a log needs a topic at every position, even one that matches any topic
+        (None, [[TOPIC_2], None], []),
+        (None, [None], [b'one', b'two', b'four', b'five']),
+        ([B_ADDRESS], [[TOPIC_2]], [b'five']),
+        ([C_ADDRESS], [[TOPIC_1]], []),
+    ),
+)
+def test_get_logs_with_filters(chaindb, blocks, addresses, topics, expected):
+    block_logs = chaindb.get_logs(0, 4, addresses, topics)
+    assert [block_log.log.data for block_log in block_logs] == expected
+
+
+@pytest.mark.parametrize(
+    'from_block, to_block, expected',
+    (
+        (1, 1, [b'one', b'two']),
+        (2, 3, [b'three', b'four']),
+        # up to the canonical head
+        (4, 100, [b'five']),
+        (3, 2, []),
+    ),
+)
+def test_get_logs_in_range(chaindb, blocks, from_block, to_block, expected):
+    block_logs = chaindb.get_logs(from_block, to_block)
+    assert [block_log.log.data for block_log in block_logs] == expected
+
+
+def test_get_logs_only_decodes_receipts_of_candidate_blocks(base_db, genesis_header, monkeypatch):
+    chaindb = ChainDB(base_db)
+    chaindb.persist_header(genesis_header)
+    blocks = mk_chain(chaindb, genesis_header, [
+        [[Log(A_ADDRESS, [TOPIC_1], b'')]] if number == 7 else [[Log(B_ADDRESS, [], b'')]]
+        for number in range(1, 21)
+    ])
+
+    decoded = []
+    get_receipts = chaindb.get_receipts
+
+    def get_receipts_and_count(header, receipt_class):
+        decoded.append(header.block_number)
+        return get_receipts(header, receipt_class)
+
+    monkeypatch.setattr(chaindb, 'get_receipts', get_receipts_and_count)
+
+    block_logs = chaindb.get_logs(0, 20, [A_ADDRESS])
+    assert [block_log.block_hash for block_log in block_logs] == [blocks[6][0].hash]
+    assert decoded == [7]
+
+
+def test_bloom_bits_in_many_sections(base_db, genesis_header, monkeypatch):
+    monkeypatch.setattr(bloom_bits, 'BLOOM_BITS_SECTION_SIZE', 4)
+    chaindb = ChainDB(base_db)
+    chaindb.persist_header(genesis_header)
+    mk_chain(chaindb, genesis_header, [
+        [[Log(A_ADDRESS, [], b'')]] if number in (3, 4, 9) else []
+        for number in range(1, 13)
+    ])
+
+    assert list(get_matching_block_numbers(base_db, 0, 12, [[A_ADDRESS]])) == [3, 4, 9]
+    assert list(get_matching_block_numbers(base_db, 4, 8, [[A_ADDRESS]])) == [4]
+    assert list(get_matching_block_numbers(base_db, 5, 8, [[A_ADDRESS]])) == []
+    assert list(get_matching_block_numbers(base_db, 2, 5, [])) == [2, 3, 4, 5]
+    assert get_positions(chaindb.get_logs(4, 11, [A_ADDRESS])) == [(4, 0, 0), (9, 0, 0)]
+
+
+def test_bloom_bits_follow_the_canonical_chain(base_db, genesis_header):
+    chaindb = ChainDB(base_db)
+    chaindb.persist_header(genesis_header)
+    first_block, _ = mk_block(chaindb, genesis_header, [[Log(C_ADDRESS, [], b'')]])
+    old_blocks = mk_chain(chaindb, first_block, [
+        [[Log(A_ADDRESS, [], b'old')]],
+        [],
+        [[Log(A_ADDRESS, [], b'old')]],
+    ])
+    assert len(chaindb.get_logs(0, 4, [A_ADDRESS])) == 2
+
+    # a heavier fork, with the same addresses in other blocks
+    new_blocks = mk_chain(chaindb, first_block, [
+        [],
+        [[Log(A_ADDRESS, [], b'new'), Log(B_ADDRESS, [], b'new')]],
+    ], difficulty=10)
+    assert chaindb.get_canonical_head() == new_blocks[-1][0]
+
+    # the old block above the new head is left alone, like its canonical block number, and
+    # is cleared once a new block at that number is canonical
+    assert list(get_matching_block_numbers(base_db, 0, 3, [[A_ADDRESS]])) == [3]
+    assert get_positions(chaindb.get_logs(0, 4, [A_ADDRESS])) == [(3, 0, 0)]
+    assert get_positions(chaindb.get_logs(0, 4, [C_ADDRESS])) == [(1, 0, 0)]
+
+    # and back to the old chain
+    mk_chain(chaindb, old_blocks[-1][0], [[]], difficulty=100)
+    assert list(get_matching_block_numbers(base_db, 0, 5, [[A_ADDRESS]])) == [2, 4]
+    assert list(get_matching_block_numbers(base_db, 0, 5, [[B_ADDRESS]])) == []
+
+
+def test_get_logs_of_blocks_from_before_the_index(base_db, genesis_header):
+    # a database that was filled without the index, like by an earlier version
+    chaindb = ChainDB(base_db, bloom_bits_index=False)
+    chaindb.persist_header(genesis_header)
+    old_blocks = mk_chain(chaindb, genesis_header, [
+        [[Log(A_ADDRESS, [], b'old')]],
+        [],
+        [[Log(A_ADDRESS, [], b'old')]],
+    ])
+    assert get_first_indexed_block_number(base_db) is None
+
+    chaindb = ChainDB(base_db)
+    assert get_positions(chaindb.get_logs(0, 3, [A_ADDRESS])) == [(1, 0, 0), (3, 0, 0)]
+
+    # the blocks after it are in the index
+    mk_chain(chaindb, old_blocks[-1][0], [
+        [[Log(A_ADDRESS, [], b'new')]],
+        [[Log(B_ADDRESS, [], b'new')]],
+    ])
+    assert get_first_indexed_block_number(base_db) == 4
+    assert list(get_matching_block_numbers(base_db, 0, 5, [[A_ADDRESS]])) == [4]
+    assert get_positions(chaindb.get_logs(0, 5, [A_ADDRESS])) == [(1, 0, 0), (3, 0, 0), (4, 0, 0)]
+    assert get_positions(chaindb.get_logs(2, 5, [A_ADDRESS])) == [(3, 0, 0), (4, 0, 0)]
+    assert get_positions(chaindb.get_logs(0, 5, [B_ADDRESS])) == [(5, 0, 0)]
+
+
+def test_get_logs_after_turning_the_index_off_and_on(base_db, genesis_header):
+    chaindb = ChainDB(base_db)
+    chaindb.persist_header(genesis_header)
+    first_block, _ = mk_block(chaindb, genesis_header, [[Log(A_ADDRESS, [], b'')]])
+    assert get_first_indexed_block_number(base_db) == 0
+
+    second_block, _ = mk_block(
+        ChainDB(base_db, bloom_bits_index=False),
+        first_block,
+        [[Log(A_ADDRESS, [], b'')]],
+    )
+    assert get_first_indexed_block_number(base_db) is None
+    assert get_positions(chaindb.get_logs(0, 2, [A_ADDRESS])) == [(1, 0, 0), (2, 0, 0)]
+
+    mk_block(chaindb, second_block, [[Log(A_ADDRESS, [], b'')]])
+    assert get_first_indexed_block_number(base_db) == 3
+    assert get_positions(chaindb.get_logs(0, 3, [A_ADDRESS])) == [
+        (1, 0, 0),
+        (2, 0, 0),
+        (3, 0, 0),
+    ]
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+import random
+import sys
+import threading
+
+from eth_keys import keys
+import pytest
+import rlp
+
+from eth.chains.base import MiningChain
+from eth.db.account import (
+    ReadOnlyAccountDB,
+)
+from eth.db.cache import (
+    CacheDB,
+)
+from eth.rlp.receipts import (
+    Receipt,
+)
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    copy,
+    disable_pow_check,
+    genesis,
+)
+
+
+PRIVATE_KEY = keys.PrivateKey(b'\x01' * 32)
+SENDER = PRIVATE_KEY.public_key.to_canonical_address()
+RECIPIENTS = tuple(bytes([index]) * 20 for index in range(1, 5))
+
+
+@pytest.fixture
+def fast_thread_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def mine_transfers(chain, num_blocks):
+    blocks = []
+    for _ in range(num_blocks):
+        for recipient in RECIPIENTS:
+            chain.apply_transaction(chain.create_unsigned_transaction(
+                nonce=chain.get_vm().state.account_db.get_nonce(SENDER),
+                gas_price=1,
+                gas=21000,
+                to=recipient,
+                value=1,
+                data=b'',
+            ).as_signed_transaction(PRIVATE_KEY))
+        blocks.append(chain.mine_block())
+    return blocks
+
+
+def test_parallel_reads_during_persist_block(fast_thread_switching):
+    chain = build(
+        MiningChain,
+        byzantium_at(0),
+        disable_pow_check,
+        genesis(
+            params={'gas_limit': 3141592},
+            state={SENDER: {'balance': 10 ** 18}},
+        ),
+    )
+    blocks = mine_transfers(chain, 8)
+    new_blocks = mine_transfers(copy(chain), 20)
+
+    chaindb = chain.chaindb
+    receipts = {block.hash: chaindb.get_receipts(block.header, Receipt) for block in blocks}
+    state_root = blocks[-1].header.state_root
+    balances = {
+        recipient: ReadOnlyAccountDB(chaindb.db, state_root).get_balance(recipient)
+        for recipient in RECIPIENTS
+    }
+    # a single view of the state, and a cache that is too small for all the headers, which
+    # all of the readers share
+    account_db = ReadOnlyAccountDB(chaindb.db, state_root)
+    cache_db = CacheDB(chaindb.db, cache_size=4)
+
+    done = threading.Event()
+
+    def read():
+        reads = 0
+        while not done.is_set() or reads < 100:
+            block = random.choice(blocks)
+            header = chaindb.get_block_header_by_hash(block.hash)
+            assert header == block.header
+            assert cache_db[block.hash] == rlp.encode(block.header)
+            assert chaindb.get_canonical_block_hash(block.number) == block.hash
+            assert chaindb.get_block_transactions(
+                header,
+                block.transaction_class,
+            ) == list(block.transactions)
+            assert chaindb.get_receipts(header, Receipt) == receipts[block.hash]
+            assert chaindb.get_recent_canonical_hashes(block.hash, 2) in (
+                (block.hash, block.header.parent_hash),
+                # the ring may only hold hashes after the ones that were persisted
+                (),
+            )
+
+            recipient = random.choice(RECIPIENTS)
+            assert account_db.get_balance(recipient) == balances[recipient]
+            reads += 1
+        return reads
+
+    def write():
+        try:
+            for block in new_blocks:
+                chaindb.persist_block(block)
+        finally:
+            done.set()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        readers = [executor.submit(read) for _ in range(6)]
+        writer = executor.submit(write)
+
+        writer.result()
+        assert all(reader.result() >= 100 for reader in readers)
+
+    assert chaindb.get_canonical_head() == new_blocks[-1].header
+    assert chaindb.get_recent_canonical_hashes(new_blocks[-1].hash, 2) == (
+        new_blocks[-1].hash,
+        new_blocks[-2].hash,
+    )
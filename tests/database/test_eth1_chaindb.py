@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 import pytest
 
 from hypothesis import (
@@ -9,6 +12,10 @@ import rlp
 
 from eth_hash.auto import keccak
 
+from trie import (
+    HexaryTrie,
+)
+
 from eth.constants import (
     BLANK_ROOT_HASH,
 )
@@ -27,6 +34,9 @@ from eth.exceptions import (
 from eth.rlp.headers import (
     BlockHeader,
 )
+from eth.rlp.receipts import (
+    Receipt,
+)
 from eth.tools.rlp import (
     assert_headers_eq,
 )
@@ -195,3 +205,63 @@ def test_chaindb_get_receipt_by_index(
             NUMBER_BLOCKS_IN_CHAIN,
             TRANSACTIONS_IN_BLOCK + 1,
         )
+
+
+def test_chaindb_flat_block_bodies(chain, funded_address, funded_address_private_key, monkeypatch):
+    trie_chaindb = ChainDB(chain.chaindb.db)
+    chain.chaindb = ChainDB(chain.chaindb.db, flat_block_bodies=True)
+
+    for _ in range(3):
+        tx = new_transaction(
+            chain.get_vm(),
+            from_=funded_address,
+            to=force_bytes_to_address(b'\x10\x10'),
+            private_key=funded_address_private_key,
+        )
+        chain.apply_transaction(tx)
+    block = chain.mine_block()
+
+    expected_transactions = trie_chaindb.get_block_transactions(
+        block.header,
+        block.transaction_class,
+    )
+    expected_receipts = trie_chaindb.get_receipts(block.header, Receipt)
+    assert len(expected_transactions) == 3
+    assert len(expected_receipts) == 3
+
+    def fail_trie_lookup(db, trie_root):
+        raise AssertionError("Should read the flat list instead of walking the trie")
+
+    monkeypatch.setattr(ChainDB, '_get_trie_item_data', staticmethod(fail_trie_lookup))
+    monkeypatch.setattr(HexaryTrie, '__getitem__', fail_trie_lookup)
+
+    flat_chaindb = ChainDB(chain.chaindb.db, flat_block_bodies=True)
+    assert flat_chaindb.get_block_transactions(
+        block.header,
+        block.transaction_class,
+    ) == expected_transactions
+    assert flat_chaindb.get_block_transaction_hashes(block.header) == [
+        transaction.hash for transaction in expected_transactions
+    ]
+    assert flat_chaindb.get_receipts(block.header, Receipt) == expected_receipts
+    assert flat_chaindb.get_transaction_by_index(
+        block.number,
+        1,
+        block.transaction_class,
+    ) == expected_transactions[1]
+    assert flat_chaindb.get_receipt_by_index(block.number, 2) == expected_receipts[2]
+    with pytest.raises(ReceiptNotFound):
+        flat_chaindb.get_receipt_by_index(block.number, 3)
+
+
+def test_chaindb_get_block_transactions_is_cached_per_instance(chain):
+    block = chain.mine_block()
+    chaindb = ChainDB(chain.chaindb.db)
+    transactions = chaindb.get_block_transactions(block.header, block.transaction_class)
+    assert chaindb.get_block_transactions(block.header, block.transaction_class) is transactions
+
+    # the cache doesn't keep the instance around
+    chaindb_ref = weakref.ref(chaindb)
+    del chaindb
+    gc.collect()
+    assert chaindb_ref() is None
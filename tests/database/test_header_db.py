@@ -18,6 +18,7 @@ from eth.constants import (
 )
 from eth.exceptions import (
     CanonicalHeadNotFound,
+    HeaderNotFound,
     ParentNotFound,
 )
 from eth.db.header import HeaderDB
@@ -305,3 +306,206 @@ def test_headerdb_header_exists(headerdb, genesis_header):
     # both `chain_a` & `chain_b` should now all exist
     assert all(headerdb.header_exists(h.hash) for h in chain_a)
     assert all(headerdb.header_exists(h.hash) for h in chain_b)
+
+
+def test_headerdb_header_cache_serves_persisted_headers(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=10)
+    headerdb.persist_header_chain(headers)
+
+    before = headerdb.get_header_cache_info()
+    for header in headers:
+        assert_headers_eq(headerdb.get_block_header_by_hash(header.hash), header)
+    after = headerdb.get_header_cache_info()
+
+    assert after.hits - before.hits == len(headers)
+    assert after.misses == before.misses
+    assert after.hit_rate > 0
+
+
+def test_headerdb_header_cache_fills_on_lookup(base_db, genesis_header):
+    HeaderDB(base_db).persist_header(genesis_header)
+
+    # a fresh HeaderDB starts with an empty cache over the same database
+    headerdb = HeaderDB(base_db)
+    headerdb.get_block_header_by_hash(genesis_header.hash)
+    headerdb.get_block_header_by_hash(genesis_header.hash)
+
+    cache_info = headerdb.get_header_cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+    assert cache_info.currsize == 1
+
+
+def test_headerdb_header_cache_ignores_failed_persist(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=3)
+    non_contiguous_headers = (headers[0], headers[2], headers[1],)
+
+    with pytest.raises(ValidationError):
+        headerdb.persist_header_chain(non_contiguous_headers)
+
+    assert headerdb.get_header_cache_info().currsize == 1
+    with pytest.raises(HeaderNotFound):
+        headerdb.get_block_header_by_hash(headers[0].hash)
+
+
+def walk_ancestor_hashes(headerdb, header, max_count):
+    hashes = []
+    while len(hashes) < max_count:
+        hashes.append(header.hash)
+        if header.block_number == 0:
+            break
+        header = headerdb.get_block_header_by_hash(header.parent_hash)
+    return tuple(hashes)
+
+
+def test_headerdb_recent_canonical_hashes(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=10)
+    headerdb.persist_header_chain(headers)
+
+    for header in (genesis_header,) + headers:
+        for max_count in (1, 5, 256):
+            expected = walk_ancestor_hashes(headerdb, header, max_count)
+            assert headerdb.get_recent_canonical_hashes(header.hash, max_count) == expected
+
+
+def test_headerdb_recent_canonical_hashes_follow_reorgs(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    chain_a = mk_header_chain(genesis_header, 7)
+    headerdb.persist_header_chain(chain_a)
+
+    # fork off at block #3 with a longer chain
+    chain_b = mk_header_chain(chain_a[2], 6)
+    headerdb.persist_header_chain(chain_b)
+    assert_is_canonical_chain(headerdb, chain_a[:3] + chain_b)
+
+    # blocks which are no longer canonical can't be served from memory
+    for header in chain_a[3:]:
+        assert headerdb.get_recent_canonical_hashes(header.hash, 256) == tuple()
+
+    for header in chain_a[:3] + chain_b:
+        expected = walk_ancestor_hashes(headerdb, header, 256)
+        assert headerdb.get_recent_canonical_hashes(header.hash, 256) == expected
+
+
+def test_headerdb_recent_canonical_hashes_bounded(base_db, genesis_header):
+    headerdb = HeaderDB(base_db, canonical_hash_ring_size=4)
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=10)
+    headerdb.persist_header_chain(headers)
+
+    # only the last four canonical hashes are held, so requests that reach
+    # further back must fall back to the database
+    assert headerdb.get_recent_canonical_hashes(headers[-1].hash, 4) == tuple(
+        header.hash for header in reversed(headers[-4:])
+    )
+    assert headerdb.get_recent_canonical_hashes(headers[-1].hash, 5) == tuple()
+    assert headerdb.get_recent_canonical_hashes(headers[0].hash, 1) == tuple()
+
+
+def test_headerdb_persist_header_chain_extending_head_skips_ancestor_search(
+        headerdb,
+        genesis_header,
+        monkeypatch):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=100)
+
+    def fail_find_new_ancestors(db, header):
+        raise AssertionError("Should not search for ancestors when extending the head")
+
+    monkeypatch.setattr(headerdb, '_find_new_ancestors', fail_find_new_ancestors)
+
+    new_canonical_headers, old_canonical_headers = headerdb.persist_header_chain(headers)
+
+    assert new_canonical_headers == headers
+    assert old_canonical_headers == tuple()
+    assert_is_canonical_chain(headerdb, headers)
+
+
+def test_headerdb_persist_header_chain_replaces_leftover_canonical_entries(
+        headerdb,
+        genesis_header):
+    headerdb.persist_header(genesis_header)
+    chain_a = mk_header_chain(genesis_header, 5)
+    headerdb.persist_header_chain(chain_a)
+
+    # a heavier, but shorter, fork becomes canonical
+    heavy_header = BlockHeader.from_parent(
+        parent=chain_a[1],
+        timestamp=chain_a[1].timestamp + 1,
+        gas_limit=chain_a[1].gas_limit,
+        difficulty=chain_a[1].difficulty * 10,
+    )
+    new_canonical_headers, _ = headerdb.persist_header(heavy_header)
+    assert new_canonical_headers == (heavy_header,)
+    assert_is_canonical_chain(headerdb, chain_a[:2] + (heavy_header,))
+
+    # extending the new head replaces the leftover entries of `chain_a`
+    chain_b = mk_header_chain(heavy_header, 3)
+    new_canonical_headers, old_canonical_headers = headerdb.persist_header_chain(chain_b)
+
+    assert new_canonical_headers == chain_b
+    assert old_canonical_headers == chain_a[3:]
+    assert_is_canonical_chain(headerdb, chain_a[:2] + (heavy_header,) + chain_b)
+
+
+@pytest.mark.parametrize('ancestor_index', (True, False))
+def test_headerdb_get_ancestor_hash(base_db, genesis_header, ancestor_index):
+    headerdb = HeaderDB(base_db, ancestor_index=ancestor_index)
+    headerdb.persist_header(genesis_header)
+
+    # persist the headers both one by one and in batches
+    chain_a = mk_header_chain(genesis_header, 150)
+    for header in chain_a[:20]:
+        headerdb.persist_header(header)
+    headerdb.persist_header_chain(chain_a[20:100])
+    headerdb.persist_header_chain(chain_a[100:])
+
+    # a lighter fork is never canonical
+    chain_b = mk_header_chain(chain_a[60], 70)
+    headerdb.persist_header_chain(chain_b)
+
+    all_a = (genesis_header,) + chain_a
+    all_b = all_a[:62] + chain_b
+    for tip in (all_a[-1], all_a[77], all_b[-1], all_b[100]):
+        for ancestor in (all_a if tip in all_a else all_b)[:tip.block_number + 1]:
+            assert headerdb.get_ancestor_hash(tip.hash, ancestor.block_number) == ancestor.hash
+
+    with pytest.raises(ValidationError):
+        headerdb.get_ancestor_hash(chain_a[5].hash, chain_a[6].block_number)
+
+
+def test_headerdb_get_ancestor_hash_takes_logarithmic_steps(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, 1000)
+    headerdb.persist_header_chain(headers)
+
+    steps = []
+    get_skip_hash = headerdb._get_skip_hash
+
+    def counting_get_skip_hash(db, block_hash):
+        steps.append(block_hash)
+        return get_skip_hash(db, block_hash)
+
+    headerdb._get_skip_hash = counting_get_skip_hash
+    for ancestor in (genesis_header,) + headers[:-1]:
+        del steps[:]
+        assert headerdb.get_ancestor_hash(headers[-1].hash, ancestor.block_number) == ancestor.hash
+        assert len(steps) <= 40
+
+
+@pytest.mark.parametrize('ancestor_index', (True, False))
+def test_headerdb_deep_reorg(base_db, genesis_header, ancestor_index):
+    headerdb = HeaderDB(base_db, ancestor_index=ancestor_index)
+    headerdb.persist_header(genesis_header)
+    chain_a = mk_header_chain(genesis_header, 300)
+    headerdb.persist_header_chain(chain_a)
+
+    chain_b = mk_header_chain(chain_a[40], 300)
+    new_canonical_headers, old_canonical_headers = headerdb.persist_header_chain(chain_b)
+
+    assert new_canonical_headers == chain_b
+    assert old_canonical_headers == chain_a[41:]
+    assert_is_canonical_chain(headerdb, chain_a[:41] + chain_b)
@@ -0,0 +1,49 @@
+from hypothesis import (
+    given,
+    settings,
+    strategies as st,
+)
+import pytest
+import rlp
+from trie import HexaryTrie
+
+from eth.constants import (
+    BLANK_ROOT_HASH,
+)
+from eth.db.trie import (
+    make_ordered_trie_root_and_nodes,
+)
+
+
+def make_hexary_trie_root_and_nodes(items):
+    kv_store = {}
+    trie = HexaryTrie(kv_store, BLANK_ROOT_HASH)
+    with trie.squash_changes() as memory_trie:
+        for index, item in enumerate(items):
+            memory_trie[rlp.encode(index, sedes=rlp.sedes.big_endian_int)] = item
+    return trie.root_hash, kv_store
+
+
+@pytest.mark.parametrize('count', (0, 1, 2, 16, 17, 127, 128, 129, 255, 256, 257, 1000))
+@pytest.mark.parametrize('item_size', (1, 20, 100))
+def test_ordered_trie_matches_hexary_trie(count, item_size):
+    items = tuple(
+        index.to_bytes(4, 'big')[-item_size:].rjust(item_size, b'\x01')
+        for index in range(count)
+    )
+    assert make_ordered_trie_root_and_nodes(items) == make_hexary_trie_root_and_nodes(items)
+
+
+@given(st.lists(st.binary(min_size=1, max_size=80), max_size=300))
+@settings(max_examples=50, deadline=None)
+def test_ordered_trie_matches_hexary_trie_with_any_items(items):
+    assert make_ordered_trie_root_and_nodes(items) == make_hexary_trie_root_and_nodes(items)
+
+
+def test_ordered_trie_nodes_are_readable_from_the_root():
+    items = tuple(bytes([index % 256]) * 40 for index in range(300))
+    root_hash, nodes = make_ordered_trie_root_and_nodes(items)
+
+    trie = HexaryTrie(nodes, root_hash)
+    for index, item in enumerate(items):
+        assert trie[rlp.encode(index, sedes=rlp.sedes.big_endian_int)] == item